@@ -0,0 +1,5 @@
+import sys
+
+from expressions.cli import main
+
+sys.exit(main())
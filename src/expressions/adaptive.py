@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from time import perf_counter_ns
+from typing import Any
+
+from expressions.context import Context
+from expressions.expr.expr_base import Expression, HomogeneousListMixin
+from expressions.expr.logical import And, Or
+from expressions.expr.side_effects import is_side_effect_free, is_side_effect_free_class
+
+
+class AdaptiveLogicalMixin:
+    """Mixin for logical expressions that reorder their operands based on their selectivity.
+
+    Every evaluation records, for each evaluated operand, its cost (evaluation time) and whether it
+    decided the result of the expression (short-circuiting the evaluation). Every
+    `reorder_interval` evaluations the operands are sorted by the ratio between their mean cost and
+    their probability of deciding the result, so cheap and decisive operands are evaluated first.
+    Operands never evaluated keep their position, as they may rely on the operands before them
+    (like `has_y and y > 1` relies on `has_y` to evaluate `y` only when it's present).
+
+    Reordering operands can change whether an operand raises and which exception is raised, so if
+    any operand raises the expression goes back to the original order, stops adapting, and is
+    evaluated again in the original order, returning or raising as the original expression does.
+
+    Once the learned order is good enough, `freeze()` stops recording statistics and reordering.
+    """
+
+    # value of an operand that decides the result of the expression
+    decisive_value: bool
+    _sub_expressions: tuple[Expression, ...]
+
+    def __init__(self, *sub_expressions: Expression, reorder_interval: int = 1000) -> None:
+        """Constructor for adaptive logical expressions.
+
+        Args:
+            *sub_expressions: Operands of the expression.
+            reorder_interval: Number of evaluations between reorderings.
+        """
+        super().__init__(*sub_expressions)  # type: ignore
+        self.reorder_interval = reorder_interval
+        self.frozen = False
+        self._order = tuple(range(len(sub_expressions)))
+        self._evaluations = 0
+        self._operand_evaluations = [0] * len(sub_expressions)
+        self._operand_decisions = [0] * len(sub_expressions)
+        self._operand_costs = [0] * len(sub_expressions)
+
+    def evaluation_order(self) -> tuple[Expression, ...]:
+        """Return operands in the order they are currently evaluated."""
+        return tuple(self._sub_expressions[i] for i in self._order)
+
+    def freeze(self) -> None:
+        """Stop recording statistics and reordering operands, keeping the current order."""
+        self.frozen = True
+
+    def evaluate(self, context: Context) -> bool:
+        """Evaluate expression lazily in context, recording statistics of its operands."""
+        try:
+            if self.frozen:
+                return self._evaluate_ordered(context)
+            result = self._evaluate_recording(context)
+        except Exception:
+            # go back to the author order, so the same values are returned and exceptions raised
+            original_order = tuple(range(len(self._sub_expressions)))
+            reordered = self._order != original_order
+            self._order = original_order
+            self.frozen = True
+            if not reordered:
+                raise
+            return self._evaluate_ordered(context)
+        self._evaluations += 1
+        if self._evaluations % self.reorder_interval == 0:
+            self._reorder()
+        return result
+
+    def _evaluate_ordered(self, context: Context) -> bool:
+        for i in self._order:
+            if bool(self._sub_expressions[i].evaluate(context)) is self.decisive_value:
+                return self.decisive_value
+        return not self.decisive_value
+
+    def _evaluate_recording(self, context: Context) -> bool:
+        for i in self._order:
+            start = perf_counter_ns()
+            value = self._sub_expressions[i].evaluate(context)
+            self._operand_costs[i] += perf_counter_ns() - start
+            self._operand_evaluations[i] += 1
+            if bool(value) is self.decisive_value:
+                self._operand_decisions[i] += 1
+                return self.decisive_value
+        return not self.decisive_value
+
+    def _reorder(self) -> None:
+        """Sort operands by mean cost per decision, keeping operands never evaluated in place."""
+
+        def rank(i: int) -> float:
+            if not self._operand_decisions[i]:
+                # operands that never decided go last, keeping their relative order
+                return float("inf")
+            return self._operand_costs[i] / self._operand_decisions[i]
+
+        evaluated = [i for i in self._order if self._operand_evaluations[i]]
+        ranked = iter(sorted(evaluated, key=rank))
+        self._order = tuple(
+            next(ranked) if self._operand_evaluations[i] else i for i in self._order
+        )
+
+
+class AdaptiveAnd(AdaptiveLogicalMixin, And):
+    """Logical And Expression that reorders its operands based on their selectivity."""
+
+    decisive_value = False
+
+
+class AdaptiveOr(AdaptiveLogicalMixin, Or):
+    """Logical Or Expression that reorders its operands based on their selectivity."""
+
+    decisive_value = True
+
+
+_ADAPTIVE_CLASSES: dict[type[Expression], type[AdaptiveLogicalMixin]] = {
+    And: AdaptiveAnd,
+    Or: AdaptiveOr,
+}
+
+
+def make_adaptive(expr: Expression, reorder_interval: int = 1000) -> Expression:
+    """Return expression where side-effect free `And` and `Or` reorder their operands.
+
+    Args:
+        expr: Expression to make adaptive.
+        reorder_interval: Number of evaluations between reorderings of every `And` and `Or`.
+
+    Returns:
+        Equivalent expression with adaptive `And` and `Or` expressions.
+    """
+    if not isinstance(expr, HomogeneousListMixin) or not is_side_effect_free_class(expr):
+        return expr
+    sub_expressions = [make_adaptive(sub, reorder_interval) for sub in expr.sub_expressions()]
+    adaptive_class = _ADAPTIVE_CLASSES.get(type(expr))
+    if adaptive_class is not None and all(is_side_effect_free(sub) for sub in sub_expressions):
+        return adaptive_class(*sub_expressions, reorder_interval=reorder_interval)  # type: ignore
+    return expr.__class__(*sub_expressions)  # type: ignore
+
+
+def freeze(expr: Expression) -> None:
+    """Freeze all adaptive `And` and `Or` in the expression, keeping their learned order.
+
+    Args:
+        expr: Expression to freeze.
+    """
+    if isinstance(expr, AdaptiveLogicalMixin):
+        expr.freeze()
+    for sub_expr in expr.sub_expressions():
+        freeze(sub_expr)
+
+
+def learned_expression(expr: Expression) -> Expression:
+    """Return expression where adaptive `And` and `Or` are replaced by plain ones.
+
+    The operands of the plain expressions are in the order learned by the adaptive ones, so the
+    returned expression can be serialised and reused without learning the order again.
+
+    Args:
+        expr: Expression with adaptive expressions.
+
+    Returns:
+        Expression without adaptive expressions.
+    """
+    if not isinstance(expr, HomogeneousListMixin):
+        return expr
+    sub_expressions: Any = expr.sub_expressions()
+    if isinstance(expr, AdaptiveLogicalMixin):
+        sub_expressions = expr.evaluation_order()
+    plain_sub_expressions = [learned_expression(sub_expr) for sub_expr in sub_expressions]
+    if isinstance(expr, AdaptiveAnd):
+        return And(*plain_sub_expressions)
+    if isinstance(expr, AdaptiveOr):
+        return Or(*plain_sub_expressions)
+    return expr.__class__(*plain_sub_expressions)  # type: ignore
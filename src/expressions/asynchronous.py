@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from collections.abc import Hashable, Mapping
+from typing import Any
+
+from expressions.context import Context
+from expressions.exceptions import ContextValuePendingError
+from expressions.expr.arithmetic import Arithmetic
+from expressions.expr.comparison import Comparison
+from expressions.expr.expr_base import Expression
+from expressions.expr.logical import And, Not, Or
+from expressions.expr.variable import Variable
+from expressions.parallel import EvaluationResult
+
+# expressions evaluating all their operands
+_EAGER_CLASSES = (Arithmetic, Comparison, Not)
+
+
+async def evaluate_async(
+    expressions: Expression | Mapping[Hashable, Expression],
+    context: Context,
+) -> Any:
+    """Evaluate expressions in a context with asynchronous providers.
+
+    Expressions are evaluated in rounds. In every round, the expressions not evaluated yet are
+    evaluated until they read a variable whose asynchronous provider hasn't been awaited. Then the
+    providers of all those variables are awaited concurrently, once per variable even if many
+    expressions read it, and the expressions are evaluated again. The providers of the variables
+    that the waiting expressions always read are awaited in the same round, so an expression like
+    `a + b > c` waits for a single round. Providers of variables that may not be read, like
+    operands short-circuited by `And` and `Or`, are only awaited once the expression reads them.
+
+    Expressions are evaluated again from the beginning after every round, so they must be free of
+    side effects.
+
+    Args:
+        expressions: Expression, or mapping from key to expression.
+        context: Evaluation context.
+
+    Returns:
+        Value of the expression or, if a mapping of expressions is given, a dictionary from key to
+        `EvaluationResult`, with the value or the error of every expression.
+
+    Raises:
+        Any exception raised evaluating the expression, if a single expression is given.
+    """
+    if isinstance(expressions, Expression):
+        result = (await _evaluate_all({None: expressions}, context))[None]
+        if result.error is not None:
+            raise result.error
+        return result.value
+    return await _evaluate_all(dict(expressions), context)
+
+
+async def _evaluate_all(
+    expressions: dict[Hashable, Expression],
+    context: Context,
+) -> dict[Hashable, EvaluationResult]:
+    results: dict[Hashable, EvaluationResult] = {}
+    pending = dict(expressions)
+    eager_names: dict[Hashable, set[str]] = {}
+    while pending:
+        names: dict[str, ContextValuePendingError] = {}
+        eager: set[str] = set()
+        for key, expr in list(pending.items()):
+            try:
+                results[key] = EvaluationResult(expr.evaluate(context), None)
+            except ContextValuePendingError as exc:
+                names.setdefault(exc.name, exc)
+                if key not in eager_names:
+                    eager_names[key] = _eager_names(expr)
+                eager.update(eager_names[key])
+                continue
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                results[key] = EvaluationResult(None, exc)
+            del pending[key]
+        if names and not context.pending(names):
+            # the variable can't be fetched, like if its provider was replaced meanwhile
+            raise next(iter(names.values()))
+        await context.fetch([*names, *eager])
+    return {key: results[key] for key in expressions}
+
+
+def _eager_names(expr: Expression) -> set[str]:
+    """Return names of the variables read by the expression whenever it's evaluated.
+
+    Only the first operand of `And` and `Or` is always evaluated, and the operands of expressions
+    unknown to the package may not be evaluated at all.
+    """
+    names = set()
+    pending = [expr]
+    while pending:
+        current = pending.pop()
+        if type(current) is Variable:
+            names.add(current.name)
+        elif type(current) in (And, Or):
+            pending.extend(current.sub_expressions()[:1])
+        elif isinstance(current, _EAGER_CLASSES) and current.__class__.__module__.startswith(
+            "expressions.expr.",
+        ):
+            pending.extend(current.sub_expressions())
+    return names
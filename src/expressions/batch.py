@@ -0,0 +1,225 @@
+# This module requires numpy, which is installed with the `batch` extra.
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+import pytz  # type: ignore
+
+from expressions.context import NoDefault
+from expressions.exceptions import ExpressionEvaluationError, VariableTypeError
+from expressions.expr.arithmetic import Add, Div, Mod, Mul, Sub
+from expressions.expr.comparison import (
+    Equal,
+    GreaterThan,
+    GreaterThanOrEqual,
+    LessThan,
+    LessThanOrEqual,
+    NotEqual,
+)
+from expressions.expr.expr_base import Expression
+from expressions.expr.literals import Boolean, Datetime, Null, Number, String, Timedelta
+from expressions.expr.logical import And, Not, Or
+from expressions.expr.variable import Variable
+
+Columns = Mapping[str, np.ndarray] | np.ndarray
+
+# masked array functions for binary expressions. Division and modulo by zero are masked.
+_BINARY_FUNCTIONS: dict[type[Expression], Callable] = {
+    Sub: np.ma.subtract,
+    Div: np.ma.divide,
+    Mod: np.ma.mod,
+    Equal: np.ma.equal,
+    NotEqual: np.ma.not_equal,
+    LessThan: np.ma.less,
+    LessThanOrEqual: np.ma.less_equal,
+    GreaterThan: np.ma.greater,
+    GreaterThanOrEqual: np.ma.greater_equal,
+}
+
+# numpy dtype kinds accepted for every variable return type
+_DTYPE_KINDS: dict[type, str] = {
+    bool: "b",
+    Decimal: "iuf",
+    int: "iu",
+    float: "f",
+    str: "USO",
+    datetime: "M",
+    timedelta: "m",
+}
+
+
+def _to_numpy_scalar(value: Any) -> Any:
+    """Convert a python value into its numpy counterpart."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        # numpy datetimes are naive, aware datetimes are converted to UTC
+        if value.tzinfo is not None:
+            value = value.astimezone(pytz.utc).replace(tzinfo=None)
+        return np.datetime64(value)
+    if isinstance(value, timedelta):
+        return np.timedelta64(value)
+    return value
+
+
+class BatchEvaluator:
+    """Evaluator of expressions over columns of values.
+
+    Every variable is bound to a column, a numpy array with the values of the variable for every
+    row, and expressions are evaluated as whole-array operations. The result is a masked array with
+    the value of the expression for every row.
+
+    Rows that can't be evaluated are masked, instead of raising an exception:
+
+    * Rows dividing, or taking modulo, by zero.
+    * Rows where a variable without default is missing, either because the variable has no column,
+      or because its value is masked in the column.
+
+    Masks follow the short-circuit semantics of `And` and `Or`: a row is masked only if evaluating
+    the expression for that row alone would have raised.
+
+    Numbers are evaluated as numpy numbers (float64 for decimal literals) instead of decimals.
+    """
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self._columns: dict[str, np.ndarray] = {}
+        self._size = 0
+        self._evaluators: dict[type[Expression], Callable[[Any], np.ma.MaskedArray]] = {
+            Null: self._eval_literal,
+            Boolean: self._eval_literal,
+            Number: self._eval_literal,
+            String: self._eval_literal,
+            Datetime: self._eval_literal,
+            Timedelta: self._eval_literal,
+            Variable: self._eval_variable,
+            Add: self._eval_add,
+            Mul: self._eval_mul,
+            Not: self._eval_not,
+            And: self._eval_and,
+            Or: self._eval_or,
+        }
+
+    def evaluate(self, expr: Expression, columns: Columns) -> np.ma.MaskedArray:
+        """Evaluate expression for every row of the given columns.
+
+        Args:
+            expr: Expression to evaluate.
+            columns: Mapping from variable names to arrays of values, or numpy structured array
+                with a field per variable. All columns must have the same length.
+
+        Returns:
+            Masked array with the value of the expression for every row.
+
+        Raises:
+            ExpressionEvaluationError if columns have different lengths, or the expression can't be
+            evaluated in batch.
+            VariableTypeError if a column doesn't have the dtype required by its variable.
+        """
+        if isinstance(columns, np.ndarray):
+            columns = {name: columns[name] for name in columns.dtype.names or ()}
+        sizes = {len(column) for column in columns.values()}
+        if len(sizes) > 1:
+            raise ExpressionEvaluationError("columns have different lengths")
+        self._columns = dict(columns)
+        self._size = sizes.pop() if sizes else 0
+        return self._eval(expr)
+
+    def _eval(self, expr: Expression) -> np.ma.MaskedArray:
+        # dispatch on the exact class, so subclasses overriding `evaluate()` are not evaluated
+        # as their parents
+        evaluator = self._evaluators.get(type(expr))
+        if evaluator is not None:
+            return evaluator(expr)
+        if type(expr) in _BINARY_FUNCTIONS:
+            left, right = (self._eval(sub_expr) for sub_expr in expr.sub_expressions())
+            return _BINARY_FUNCTIONS[type(expr)](left, right)
+        raise ExpressionEvaluationError(
+            f"expression {expr.__class__.__name__} cannot be evaluated in batch",
+        )
+
+    def _full(self, value: Any) -> np.ma.MaskedArray:
+        return np.ma.masked_array(np.full(self._size, _to_numpy_scalar(value)))
+
+    def _eval_literal(self, expr: Any) -> np.ma.MaskedArray:
+        return self._full(expr.value)
+
+    def _eval_variable(self, expr: Variable) -> np.ma.MaskedArray:
+        if expr.name not in self._columns:
+            if expr.default is not NoDefault:
+                return self._full(expr.default)
+            # the variable is missing in every row
+            return np.ma.masked_all(self._size)
+
+        column: Any = np.ma.asarray(self._columns[expr.name])
+        kinds = _DTYPE_KINDS.get(expr.return_type)
+        if expr.return_type is Decimal and column.dtype.kind == "O":
+            column = column.astype(np.float64)
+        if kinds is not None and column.dtype.kind not in kinds:
+            raise VariableTypeError(
+                f"Variable '{expr.name}' has incorrect type, "
+                f"expected: {expr.return_type}, gotten: {column.dtype}",
+            )
+        if expr.default is not NoDefault and column.mask is not np.ma.nomask:
+            column = column.filled(_to_numpy_scalar(expr.default))
+        return np.ma.asarray(column)
+
+    def _eval_add(self, expr: Add) -> np.ma.MaskedArray:
+        result = self._full(0)
+        for sub_expr in expr.sub_expressions():
+            result = result + self._eval(sub_expr)
+        return result
+
+    def _eval_mul(self, expr: Mul) -> np.ma.MaskedArray:
+        result = self._full(1.0)
+        for sub_expr in expr.sub_expressions():
+            result = result * self._eval(sub_expr)
+        return result
+
+    def _eval_not(self, expr: Not) -> np.ma.MaskedArray:
+        return np.ma.logical_not(self._eval(expr.sub_expressions()[0]))
+
+    def _eval_and(self, expr: And) -> np.ma.MaskedArray:
+        return self._eval_short_circuit(expr, decisive_value=False)
+
+    def _eval_or(self, expr: Or) -> np.ma.MaskedArray:
+        return self._eval_short_circuit(expr, decisive_value=True)
+
+    def _eval_short_circuit(self, expr: Expression, decisive_value: bool) -> np.ma.MaskedArray:
+        """Evaluate And (or Or) row by row in order, stopping in the first False (or True) value.
+
+        Rows are decided by the first operand evaluating to the decisive value. Masked values in
+        operands after that are ignored, like `And` and `Or` don't evaluate them.
+        """
+        values = np.full(self._size, not decisive_value)
+        mask = np.zeros(self._size, dtype=bool)
+        decided = np.zeros(self._size, dtype=bool)
+        for sub_expr in expr.sub_expressions():
+            operand = self._eval(sub_expr)
+            operand_mask = np.ma.getmaskarray(operand)
+            operand_values = np.ma.filled(operand, not decisive_value).astype(bool)
+            pending = ~decided & ~mask
+            mask |= pending & operand_mask
+            newly_decided = pending & ~operand_mask & (operand_values == decisive_value)
+            values[newly_decided] = decisive_value
+            decided |= newly_decided
+        return np.ma.masked_array(values, mask=mask)
+
+
+def evaluate_batch(expr: Expression, columns: Columns) -> np.ma.MaskedArray:
+    """Evaluate expression for every row of the given columns.
+
+    Args:
+        expr: Expression to evaluate.
+        columns: Mapping from variable names to arrays of values, or numpy structured array with a
+            field per variable. All columns must have the same length.
+
+    Returns:
+        Masked array with the value of the expression for every row. Rows dividing by zero or with
+        missing variables are masked.
+    """
+    return BatchEvaluator().evaluate(expr, columns)
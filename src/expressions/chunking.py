@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+def chunks(items: Iterable[Any], chunksize: int) -> Iterator[list[Any]]:
+    """Return iterator over lists of consecutive items, of at most `chunksize` items.
+
+    Args:
+        items: Items.
+        chunksize: Maximum number of items of every list.
+
+    Yields:
+        Lists of consecutive items.
+    """
+    iterator = iter(items)
+    while chunk := list(islice(iterator, chunksize)):
+        yield chunk
+
+
+def map_chunks(
+    function: Callable[[list[Any]], Any],
+    chunked: Iterable[list[Any]],
+    workers: int | None = None,
+    initializer: Callable[..., None] | None = None,
+    initargs: tuple = (),
+) -> Iterator[Any]:
+    """Return iterator over the results of a function applied to chunks in a pool of processes.
+
+    Results are returned in the order of the chunks. Chunks are read as results are consumed, so at
+    most two chunks per worker are pending at any time.
+
+    Args:
+        function: Function applied to every chunk, in the worker processes.
+        chunked: Chunks of items, like the ones returned by `chunks()`.
+        workers: Number of worker processes. By default, the number of CPUs.
+        initializer: Optional function called in every worker process when it starts.
+        initargs: Arguments of the initializer.
+
+    Yields:
+        Result of the function for every chunk.
+    """
+    # pylint: disable=import-outside-toplevel
+    from concurrent.futures import ProcessPoolExecutor  # slow to import, and only needed here
+
+    workers = workers or os.cpu_count() or 1
+    iterator = iter(chunked)
+    with ProcessPoolExecutor(workers, initializer=initializer, initargs=initargs) as executor:
+        pending: deque[Future] = deque()
+        try:
+            while True:
+                while len(pending) < 2 * workers:
+                    chunk = next(iterator, None)
+                    if chunk is None:
+                        break
+                    pending.append(executor.submit(function, chunk))
+                if not pending:
+                    return
+                yield pending.popleft().result()
+        finally:
+            # results are not consumed anymore
+            for future in pending:
+                future.cancel()
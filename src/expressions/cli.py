@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import islice
+from pathlib import Path
+from time import perf_counter
+from typing import IO, Any, NamedTuple
+
+from expressions.context import Context
+from expressions.exceptions import ExpressionError, ParseError
+from expressions.expr.expr_base import Expression
+from expressions.expr.variable import Variable
+from expressions.parallel import EvaluationResult, evaluate_many
+
+# size of the buffers of the input and output files
+_BUFFER_SIZE = 1 << 20
+
+# (record as read, mapping from variable name to value) pairs, or (record as read, error) pairs for
+# records that can't be read
+Records = Iterator[tuple[Any, dict[str, Any] | Exception]]
+
+
+def _parse_bool(value: str) -> bool:
+    if value.lower() in ("true", "1"):
+        return True
+    if value.lower() in ("false", "0"):
+        return False
+    raise ValueError(f"invalid boolean {value!r}")
+
+
+# converters from text fields into values of every variable return type
+_TEXT_CONVERTERS: dict[type, Callable[[str], Any]] = {
+    Decimal: Decimal,
+    int: int,
+    float: float,
+    bool: _parse_bool,
+    datetime: datetime.fromisoformat,
+    timedelta: lambda value: timedelta(seconds=float(value)),
+}
+
+
+def _variable_types(expr: Expression) -> dict[str, type]:
+    """Return return type of every variable of the expression, by name."""
+    types: dict[str, type] = {}
+    pending = [expr]
+    while pending:
+        sub_expr = pending.pop()
+        if isinstance(sub_expr, Variable):
+            types.setdefault(sub_expr.name, sub_expr.return_type)
+        pending.extend(sub_expr.sub_expressions())
+    return types
+
+
+def _convert(value: Any, return_type: type) -> Any:
+    """Convert a value read from a record into the return type of its variable.
+
+    Text is converted into any type, and numbers into decimals or floats. Other values, and values
+    that can't be converted, are returned unchanged, so the expression raises `VariableTypeError`
+    when evaluated.
+    """
+    if type(value) is return_type:
+        return value
+    converter = _TEXT_CONVERTERS.get(return_type)
+    if converter is None:
+        return value
+    is_number = type(value) in (int, Decimal) and return_type in (Decimal, float)
+    if not isinstance(value, str) and not is_number:
+        return value
+    try:
+        return converter(value)
+    except (ArithmeticError, ValueError):
+        return value
+
+
+def _read_ndjson(lines: IO[str], types: dict[str, type]) -> Records:
+    decoder = json.JSONDecoder(parse_float=Decimal)
+    for line in lines:
+        if not line.strip():
+            continue
+        if not line.endswith("\n"):
+            line += "\n"
+        try:
+            record = decoder.decode(line)
+        except ValueError as exc:
+            yield line, ParseError(f"invalid JSON record: {exc}")
+            continue
+        if not isinstance(record, dict):
+            yield line, ParseError(f"record is not a JSON object: {line.strip()}")
+            continue
+        yield line, {
+            name: _convert(value, types[name]) if name in types else value
+            for name, value in record.items()
+        }
+
+
+def _read_csv(lines: IO[str], types: dict[str, type]) -> Records:
+    reader = csv.reader(lines)
+    header = next(reader, [])
+    yield header, {}
+    for row in reader:
+        # empty fields are missing values, so variables use their defaults
+        yield row, {
+            name: _convert(value, types[name]) if name in types else value
+            for name, value in zip(header, row, strict=False)
+            if value != ""
+        }
+
+
+def _evaluate(expr: Expression, records: Records, workers: int, chunksize: int) -> Iterator:
+    """Return iterator over pairs of record and `EvaluationResult`, in order."""
+    if workers > 1:
+        yield from _evaluate_parallel(expr, records, workers, chunksize)
+        return
+
+    function = expr.compile()
+    context = Context()
+    for record, mapping in records:
+        if isinstance(mapping, Exception):
+            yield record, EvaluationResult(None, mapping)
+            continue
+        context.reset(mapping)
+        try:
+            yield record, EvaluationResult(function(context), None)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            yield record, EvaluationResult(None, exc)
+
+
+def _evaluate_parallel(
+    expr: Expression,
+    records: Records,
+    workers: int,
+    chunksize: int,
+) -> Iterator:
+    """Return iterator over pairs of record and `EvaluationResult`, evaluated by workers."""
+    pending: deque[tuple[Any, dict[str, Any] | Exception]] = deque()
+
+    def mappings() -> Iterator[dict[str, Any]]:
+        for record, mapping in records:
+            pending.append((record, mapping))
+            if not isinstance(mapping, Exception):
+                yield mapping
+
+    def read_errors() -> Iterator[tuple[Any, EvaluationResult]]:
+        # records that can't be read, pending before the next evaluated one
+        while pending and isinstance(error := pending[0][1], Exception):
+            yield pending.popleft()[0], EvaluationResult(None, error)
+
+    for result in evaluate_many(expr, mappings(), workers, chunksize):
+        yield from read_errors()
+        yield pending.popleft()[0], result
+    yield from read_errors()
+
+
+def _error_message(exc: Exception) -> str:
+    """Return message of the exception, kept by expression errors in their `message`."""
+    message = exc.message if isinstance(exc, ExpressionError) else str(exc)
+    return message or type(exc).__name__
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        # like JSONExpressionEncoder, decimals are numbers only if no precision is lost
+        if not value.is_finite():
+            return str(value)
+        if value == value.to_integral_value():
+            return int(value)
+        number = float(value)
+        return number if str(number) == str(value) else str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    raise TypeError(f"{type(value)} is not JSON serialisable")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m expressions",
+        description=(
+            "Evaluate an expression on every record of a NDJSON or CSV stream, writing the value "
+            "of the expression for every record, or the matching records."
+        ),
+    )
+    parser.add_argument(
+        "expression",
+        help="expression serialised as JSON, or @path of a file containing it",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="input file, stdin by default")
+    parser.add_argument(
+        "--format",
+        choices=["ndjson", "csv"],
+        help="format of the input, by default guessed from the file extension, or ndjson",
+    )
+    parser.add_argument(
+        "--filter",
+        action="store_true",
+        help="write the records matching the expression, instead of the values",
+    )
+    parser.add_argument("-o", "--output", default="-", help="output file, stdout by default")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes, 1 by default",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=1000,
+        help="number of records read, evaluated and written at once",
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="don't write the summary")
+    return parser
+
+
+def _open(stack: ExitStack, path: str, mode: str, stream: IO[str]) -> IO[str]:
+    """Return file opened with a big buffer, or the given stream if path is `-`."""
+    if path == "-":
+        return stream
+    return stack.enter_context(
+        open(path, mode, buffering=_BUFFER_SIZE, encoding="utf-8", newline=""),  # noqa: SIM115
+    )
+
+
+class _Summary(NamedTuple):
+    """Number of records read, written and raising errors."""
+
+    records: int
+    written: int
+    errors: int
+
+
+def _parse_expression(source: str) -> Expression:
+    """Parse expression serialised as JSON, or read from the file in `@path`."""
+    # pylint: disable=import-outside-toplevel
+    from expressions.parser.json_parser import JsonParser
+
+    if source.startswith("@"):
+        source = Path(source[1:]).read_text(encoding="utf-8")
+    return JsonParser().parse(source)
+
+
+def _run(
+    expr: Expression,
+    args: argparse.Namespace,
+    input_file: IO[str],
+    output: IO[str],
+) -> _Summary:
+    """Evaluate expression on every record of the input, writing results in chunks."""
+    types = _variable_types(expr)
+    write_rows = None
+    if args.format == "csv" or (args.format is None and args.input.endswith(".csv")):
+        records = _read_csv(input_file, types)
+        header, _ = next(records)
+        if args.filter:
+            writer = csv.writer(output, lineterminator="\n")
+            writer.writerow(header)
+            write_rows = writer.writerows
+    else:
+        records = _read_ndjson(input_file, types)
+
+    count = written = errors = 0
+    results = _evaluate(expr, records, max(args.workers, 1), args.chunksize)
+    while chunk := list(islice(results, args.chunksize)):
+        lines: list[Any] = []
+        for record, result in chunk:
+            if result.error is not None:
+                errors += 1
+                if not args.filter:
+                    # one line per record, so values can be paired with their records
+                    error = {"error": _error_message(result.error)}
+                    lines.append(json.dumps(error) + "\n")
+            elif not args.filter:
+                lines.append(json.dumps(result.value, default=_to_json) + "\n")
+            elif result.value:
+                lines.append(record)
+        count += len(chunk)
+        written += len(lines)
+        if write_rows is not None:
+            write_rows(lines)
+        else:
+            output.write("".join(lines))
+    output.flush()
+    return _Summary(count, written, errors)
+
+
+def main(
+    argv: Sequence[str] | None = None,
+    stdin: IO[str] | None = None,
+    stdout: IO[str] | None = None,
+    stderr: IO[str] | None = None,
+) -> int:
+    """Run the command line evaluator.
+
+    Records are read, evaluated and written in chunks, so memory use doesn't depend on the size of
+    the input. Records that can't be read or evaluated, like malformed NDJSON lines or lines that
+    aren't JSON objects, are counted as errors. An `{"error": message}` object is written for them
+    instead of the value, so there is a line for every record, and `--filter` skips them. A summary
+    with the number of records and errors, and the throughput, is written to stderr.
+
+    Args:
+        argv: Command line arguments, without the program name. By default, `sys.argv`.
+        stdin: Standard input. By default, `sys.stdin`.
+        stdout: Standard output. By default, `sys.stdout`.
+        stderr: Standard error. By default, `sys.stderr`.
+
+    Returns:
+        Exit status: 0 on success, 2 if the expression can't be parsed.
+    """
+    args = _build_parser().parse_args(argv)
+    stderr = stderr or sys.stderr
+    try:
+        expr = _parse_expression(args.expression)
+    except (OSError, LookupError, ValueError, RuntimeError, ExpressionError) as exc:
+        stderr.write(f"error: can't parse expression: {_error_message(exc)}\n")
+        return 2
+
+    start = perf_counter()
+    with ExitStack() as stack:
+        summary = _run(
+            expr,
+            args,
+            _open(stack, args.input, "r", stdin or sys.stdin),
+            _open(stack, args.output, "w", stdout or sys.stdout),
+        )
+    if not args.quiet:
+        elapsed = perf_counter() - start
+        rate = summary.records / elapsed if elapsed else 0.0
+        stderr.write(
+            f"{summary.records} records, {summary.written} written, {summary.errors} errors "
+            f"in {elapsed:.3f}s ({rate:.0f} records/s)\n",
+        )
+    return 0
@@ -0,0 +1,13 @@
+# flake8: noqa=F401
+from .binding import (
+    BoundExpression,
+    SlotCompiler,
+    assign_slots,
+    bind,
+    names_by_slot,
+    resolve_slot,
+    slot_names,
+)
+from .bytecode import Assembler, Program, assemble
+from .python_compiler import CompiledExpression, PythonCompiler, compile_expression
+from .vm import OpCode, execute
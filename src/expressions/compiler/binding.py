@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Any
+
+from expressions.compiler.python_compiler import PythonCompiler
+from expressions.context import Context, NoDefault
+from expressions.exceptions import ExpressionValidationError
+from expressions.expr.expr_base import Expression
+from expressions.expr.variable import Variable, resolve_variable
+
+Row = Sequence[Any]
+
+# variables delegate to resolve_slot() when missing or of the wrong type, so bound expressions
+# raise exactly the same exceptions as the interpreted ones
+_SLOT_HELPER = """\
+    def {helper}(row):
+        try:
+            value = row[{index}]
+        except IndexError:
+            return _resolve_slot(row, {index}, {name!r}, {return_type}, {default})
+        if isinstance(value, {return_type}):
+            return value
+        return _resolve_slot(row, {index}, {name!r}, {return_type}, {default})
+"""
+
+# builds the context for expressions unknown to the compiler, in the functions generated here and
+# by the rule set compilers of rows
+CONTEXT_HELPER = """\
+    def _to_context(row):
+        return _Context(**dict(zip({slots}, row)))
+"""
+
+
+def slot_names(expressions: Iterable[Expression]) -> tuple[str, ...]:
+    """Return names of the variables of the expressions, in order of first appearance.
+
+    Args:
+        expressions: Expressions.
+
+    Returns:
+        Tuple with the distinct names of the variables.
+    """
+    names: dict[str, None] = {}
+    pending = list(expressions)
+    pending.reverse()
+    while pending:
+        expr = pending.pop()
+        if isinstance(expr, Variable):
+            names.setdefault(expr.name)
+        pending.extend(reversed(expr.sub_expressions()))
+    return tuple(names)
+
+
+def resolve_slot(
+    row: Row,
+    index: int,
+    name: str,
+    return_type: type,
+    default: Any = NoDefault,
+) -> Any:
+    """Return the value of a variable bound to a slot of a row.
+
+    Rows shorter than the slot are missing the variable, and its default is used.
+
+    Args:
+        row: Sequence of values.
+        index: Index of the slot of the variable.
+        name: Name of the variable.
+        return_type: Expected type of the variable value.
+        default: Optional value to return if the variable is missing.
+
+    Returns:
+        Value of the variable.
+
+    Raises:
+        VariableNotFoundError if the variable is missing and there's no default.
+        VariableTypeError if the variable value is not of the expected type.
+    """
+    try:
+        value = row[index]
+    except IndexError:
+        return resolve_variable(Context(), name, return_type, default)
+    if isinstance(value, return_type):
+        return value
+    return resolve_variable(Context(**{name: value}), name, return_type, default)
+
+
+def assign_slots(
+    expressions: Iterable[Expression],
+    slots: Sequence[str] | None = None,
+) -> dict[str, int]:
+    """Return mapping from variable name to slot index.
+
+    Args:
+        expressions: Expressions whose variables are bound to slots.
+        slots: Names of the values in a row. By default, variables are bound in order of first
+            appearance.
+
+    Returns:
+        Mapping from the name of every variable in the expressions to its slot index.
+
+    Raises:
+        ExpressionValidationError if a variable isn't in the given slots.
+    """
+    names = slot_names(expressions)
+    if slots is None:
+        return {name: index for index, name in enumerate(names)}
+    indexes = {name: index for index, name in enumerate(slots)}
+    errors = [{"variable": name, "error": "no slot"} for name in names if name not in indexes]
+    if errors:
+        raise ExpressionValidationError("expression binding error", errors)
+    return indexes
+
+
+def names_by_slot(slots: Mapping[str, int]) -> tuple[str, ...]:
+    """Return names of the slots, in slot order.
+
+    Args:
+        slots: Mapping from variable name to slot index.
+
+    Returns:
+        Tuple with the name of every slot, empty for slots not bound to any variable.
+    """
+    names = [""] * (max(slots.values(), default=-1) + 1)
+    for name, index in slots.items():
+        names[index] = name
+    return tuple(names)
+
+
+class SlotCompiler(PythonCompiler):
+    """Compiler from expressions into python functions evaluating rows of values.
+
+    Every variable is bound to a slot, and the generated function receives a row (a list, tuple,
+    array or any sequence) with the value of every variable in its slot, instead of a context.
+    Expressions unknown to the compiler are evaluated in a context built from the row.
+    """
+
+    namespace = {
+        **PythonCompiler.namespace,
+        "_Context": Context,
+        "_resolve_slot": resolve_slot,
+    }
+    context_source = "_to_context(row)"
+
+    def __init__(self, slots: dict[str, int] | None = None) -> None:
+        """Slot compiler constructor.
+
+        Args:
+            slots: Mapping from variable name to slot index.
+        """
+        super().__init__()
+        self.slots = slots or {}
+
+    def source(self, expr: Expression) -> str:
+        """Return the python source code of the function that evaluates the given expression."""
+        self._reset()
+        self._helpers.append(CONTEXT_HELPER.format(slots=self._constant(self.slot_names())))
+        body = self._gen(expr)
+        return self._function_source("row", [f"return {body}"])
+
+    def slot_names(self) -> tuple[str, ...]:
+        """Return names of the slots, in slot order."""
+        return names_by_slot(self.slots)
+
+    def _gen_variable(self, expr: Variable) -> str:
+        key = (expr.name, expr.return_type, id(expr.default))
+        if key not in self._variables:
+            helper = f"_v{len(self._variables)}"
+            self._variables[key] = helper
+            self._helpers.append(
+                _SLOT_HELPER.format(
+                    helper=helper,
+                    index=self.slots[expr.name],
+                    name=expr.name,
+                    default=self._constant(expr.default),
+                    return_type=self._constant(expr.return_type),
+                ),
+            )
+        return f"{self._variables[key]}(row)"
+
+
+class BoundExpression:
+    """Expression bound to slots, evaluated on rows of values instead of contexts."""
+
+    def __init__(self, expr: Expression, slots: Sequence[str] | None = None) -> None:
+        """Bound expression constructor.
+
+        Args:
+            expr: Expression to bind.
+            slots: Names of the values in a row. By default, variables are bound in order of first
+                appearance.
+
+        Raises:
+            ExpressionValidationError if a variable isn't in the given slots.
+        """
+        self.expr = expr
+        compiler = SlotCompiler(assign_slots([expr], slots))
+        self.slots = compiler.slot_names()
+        self._evaluate: Callable[[Row], Any] = compiler.compile(expr)  # type: ignore
+
+    def evaluate(self, row: Row) -> Any:
+        """Evaluate expression on a row.
+
+        Args:
+            row: Sequence with the value of every variable in its slot.
+
+        Returns:
+            Result of evaluating the expression.
+
+        Raises:
+            ExpressionEvaluationError.
+        """
+        return self._evaluate(row)
+
+    def __call__(self, row: Row) -> Any:
+        """Evaluate expression on a row."""
+        return self._evaluate(row)
+
+    def __repr__(self) -> str:
+        """Return string representation of this instance."""
+        return f"{self.__class__.__name__}({self.expr!r}, slots={self.slots!r})"
+
+
+def bind(expr: Expression, slots: Sequence[str] | None = None) -> BoundExpression:
+    """Bind the variables of an expression to slots of rows of values.
+
+    Args:
+        expr: Expression to bind.
+        slots: Names of the values in a row. By default, variables are bound in order of first
+            appearance, available in the `slots` attribute of the bound expression.
+
+    Returns:
+        Expression evaluated on rows of values.
+    """
+    return BoundExpression(expr, slots)
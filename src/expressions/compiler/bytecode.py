@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable
+from typing import Any
+
+from expressions.compiler.vm import OpCode, execute
+from expressions.context import Context
+from expressions.expr.arithmetic import Add, Div, Mod, Mul, Sub
+from expressions.expr.comparison import (
+    Equal,
+    GreaterThan,
+    GreaterThanOrEqual,
+    LessThan,
+    LessThanOrEqual,
+    NotEqual,
+)
+from expressions.expr.expr_base import Expression
+from expressions.expr.literals import Boolean, Datetime, Null, Number, String, Timedelta
+from expressions.expr.logical import And, Not, Or
+from expressions.expr.variable import Variable
+
+_BINARY_OPCODES: dict[type[Expression], OpCode] = {
+    Sub: OpCode.SUB,
+    Div: OpCode.DIV,
+    Mod: OpCode.MOD,
+    Equal: OpCode.EQ,
+    NotEqual: OpCode.NE,
+    LessThan: OpCode.LT,
+    LessThanOrEqual: OpCode.LE,
+    GreaterThan: OpCode.GT,
+    GreaterThanOrEqual: OpCode.GE,
+}
+
+
+class Program:
+    """Expression lowered into a flat postfix program.
+
+    A program is made of two parallel arrays, with the opcode and the operand of every instruction,
+    and a pool of constants. Operands are indexes into the constant pool, counts of values, or jump
+    offsets, depending on the opcode.
+
+    Programs are much more compact than the expression they represent, and can be evaluated by
+    `expressions.compiler.vm.execute()` without rebuilding the expression.
+    """
+
+    __slots__ = ("opcodes", "operands", "constants")
+
+    def __init__(self, opcodes: array, operands: array, constants: tuple[Any, ...]) -> None:
+        """Program constructor.
+
+        Args:
+            opcodes: Array of opcodes, with typecode "B".
+            operands: Array of operands, with typecode "I".
+            constants: Constant pool.
+        """
+        self.opcodes = opcodes
+        self.operands = operands
+        self.constants = constants
+
+    def evaluate(self, context: Context) -> Any:
+        """Evaluate program in context.
+
+        Args:
+            context: Evaluation context.
+
+        Returns:
+            Result of evaluating the program in the given context.
+
+        Raises:
+            ExpressionEvaluationError.
+        """
+        return execute(self, context)
+
+    def __len__(self) -> int:
+        """Return number of instructions of this program."""
+        return len(self.opcodes)
+
+    def __eq__(self, other: object) -> bool:
+        """Return true if programs are equal."""
+        if not isinstance(other, Program):
+            return False
+        return (
+            self.opcodes == other.opcodes
+            and self.operands == other.operands
+            and self.constants == other.constants
+        )
+
+    def __reduce__(self) -> tuple:
+        """Return compact pickling state, with the raw bytes of the arrays."""
+        return _load_program, (self.opcodes.tobytes(), self.operands.tobytes(), self.constants)
+
+    def __repr__(self) -> str:
+        """Return string representation of this instance."""
+        instructions = ", ".join(
+            f"{OpCode(opcode).name} {operand}"
+            for opcode, operand in zip(self.opcodes, self.operands, strict=True)
+        )
+        return f"{self.__class__.__name__}({instructions})"
+
+
+def _load_program(opcodes: bytes, operands: bytes, constants: tuple[Any, ...]) -> Program:
+    """Return program unpickled from the raw bytes of its arrays."""
+    opcodes_array = array("B")
+    opcodes_array.frombytes(opcodes)
+    operands_array = array("I")
+    operands_array.frombytes(operands)
+    return Program(opcodes_array, operands_array, constants)
+
+
+class Assembler:
+    """Assembler from expressions into programs.
+
+    Expressions unknown to the assembler are kept in the constant pool and evaluated calling their
+    `evaluate()` method.
+    """
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self._opcodes = array("B")
+        self._operands = array("I")
+        self._constants: list[Any] = []
+        self._constant_indexes: dict[tuple[type, str], int] = {}
+        self._emitters: dict[type[Expression], Callable[[Any], None]] = {
+            Null: self._emit_literal,
+            Boolean: self._emit_literal,
+            Number: self._emit_literal,
+            String: self._emit_literal,
+            Datetime: self._emit_literal,
+            Timedelta: self._emit_literal,
+            Variable: self._emit_variable,
+            Add: self._emit_add,
+            Mul: self._emit_mul,
+            Not: self._emit_not,
+            And: self._emit_and,
+            Or: self._emit_or,
+        }
+
+    def assemble(self, expr: Expression) -> Program:
+        """Lower an expression into a program.
+
+        Args:
+            expr: Expression to assemble.
+
+        Returns:
+            Program equivalent to the expression.
+        """
+        self._opcodes = array("B")
+        self._operands = array("I")
+        self._constants = []
+        self._constant_indexes = {}
+        self._emit(expr)
+        return Program(self._opcodes, self._operands, tuple(self._constants))
+
+    def _emit(self, expr: Expression) -> None:
+        # dispatch on the exact class, so subclasses overriding `evaluate()` are honoured
+        emitter = self._emitters.get(type(expr))
+        if emitter is not None:
+            emitter(expr)
+        elif type(expr) in _BINARY_OPCODES and len(expr.sub_expressions()) >= 2:
+            # like their evaluate(), binary expressions only use their first two operands
+            for sub_expr in expr.sub_expressions()[:2]:
+                self._emit(sub_expr)
+            self._instruction(_BINARY_OPCODES[type(expr)])
+        else:
+            self._instruction(OpCode.EVAL, self._constant(expr, shared=False))
+
+    def _instruction(self, opcode: OpCode, operand: int = 0) -> int:
+        """Append an instruction to the program, returning its position."""
+        self._opcodes.append(opcode)
+        self._operands.append(operand)
+        return len(self._opcodes) - 1
+
+    def _constant(self, value: Any, shared: bool = True) -> int:
+        """Return the index of the given value in the constant pool, adding it if required."""
+        # constants are shared by type and representation, since equal values can have different
+        # representations, like Decimal("1") and Decimal("1.0")
+        key = (type(value), repr(value))
+        if shared and key in self._constant_indexes:
+            return self._constant_indexes[key]
+        self._constants.append(value)
+        if shared:
+            self._constant_indexes[key] = len(self._constants) - 1
+        return len(self._constants) - 1
+
+    def _emit_literal(self, expr: Any) -> None:
+        self._instruction(OpCode.CONST, self._constant(expr.value))
+
+    def _emit_variable(self, expr: Variable) -> None:
+        self._instruction(
+            OpCode.VAR,
+            self._constant((expr.name, expr.return_type, expr.default)),
+        )
+
+    def _emit_n_ary(self, expr: Expression, opcode: OpCode) -> None:
+        sub_expressions = expr.sub_expressions()
+        for sub_expr in sub_expressions:
+            self._emit(sub_expr)
+        self._instruction(opcode, len(sub_expressions))
+
+    def _emit_add(self, expr: Add) -> None:
+        self._emit_n_ary(expr, OpCode.ADD)
+
+    def _emit_mul(self, expr: Mul) -> None:
+        self._emit_n_ary(expr, OpCode.MUL)
+
+    def _emit_not(self, expr: Not) -> None:
+        self._emit(expr.sub_expressions()[0])
+        self._instruction(OpCode.NOT)
+
+    def _emit_and(self, expr: And) -> None:
+        self._emit_short_circuit(expr, OpCode.JUMP_IF_FALSE_OR_POP, empty_value=True)
+
+    def _emit_or(self, expr: Or) -> None:
+        self._emit_short_circuit(expr, OpCode.JUMP_IF_TRUE_OR_POP, empty_value=False)
+
+    def _emit_short_circuit(self, expr: Expression, jump: OpCode, empty_value: bool) -> None:
+        sub_expressions = expr.sub_expressions()
+        if not sub_expressions:
+            self._instruction(OpCode.CONST, self._constant(empty_value))
+            return
+        jumps = []
+        for sub_expr in sub_expressions[:-1]:
+            self._emit(sub_expr)
+            jumps.append(self._instruction(jump))
+        self._emit(sub_expressions[-1])
+        # all jumps land on the final TO_BOOL instruction
+        target = self._instruction(OpCode.TO_BOOL)
+        for position in jumps:
+            self._operands[position] = target - position - 1
+
+
+def assemble(expr: Expression) -> Program:
+    """Lower an expression into a program.
+
+    Args:
+        expr: Expression to assemble.
+
+    Returns:
+        Program equivalent to the expression.
+    """
+    return Assembler().assemble(expr)
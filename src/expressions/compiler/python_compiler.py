@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from decimal import Decimal
+from typing import Any
+
+from expressions.context import Context
+from expressions.exceptions import ContextVariableNotFoundError, ExpressionEvaluationError
+from expressions.expr.arithmetic import Add, Div, Mod, Mul, Sub
+from expressions.expr.comparison import (
+    Equal,
+    GreaterThan,
+    GreaterThanOrEqual,
+    LessThan,
+    LessThanOrEqual,
+    NotEqual,
+)
+from expressions.expr.expr_base import Expression
+from expressions.expr.literals import Boolean, Datetime, Null, Number, String, Timedelta
+from expressions.expr.logical import And, Not, Or
+from expressions.expr.variable import Variable, resolve_variable
+from expressions.numeric import DECIMAL, NumericBackend, numeric_backend
+
+CompiledExpression = Callable[[Context], Any]
+
+# python operators for binary expressions
+_BINARY_OPERATORS: dict[type[Expression], str] = {
+    Sub: "-",
+    Mod: "%",
+    Equal: "==",
+    NotEqual: "!=",
+    LessThan: "<",
+    LessThanOrEqual: "<=",
+    GreaterThan: ">",
+    GreaterThanOrEqual: ">=",
+}
+
+# literal values of these types are written into the generated source using their repr
+_INLINE_TYPES = (type(None), bool, int, str)
+
+
+def _backend_error(backend: NumericBackend, context: Context) -> ExpressionEvaluationError:
+    """Return error of a function compiled for a numeric backend evaluated with another one."""
+    return ExpressionEvaluationError(
+        f"expression compiled for the {backend.name} numeric backend can't be evaluated in a "
+        f"context with the {numeric_backend(context).name} numeric backend",
+    )
+
+
+# global names available to the generated source
+_GLOBALS: dict[str, Any] = {
+    "_ONE": Decimal(1),
+    "_ContextVariableNotFoundError": ContextVariableNotFoundError,
+    "_ExpressionEvaluationError": ExpressionEvaluationError,
+    "_resolve_variable": resolve_variable,
+    "_numeric_backend": numeric_backend,
+    "_backend_error": _backend_error,
+}
+
+_DIV_HELPER = """\
+    def _div(left, right):
+        if right == 0:
+            raise _ExpressionEvaluationError("division by zero")
+        return left {operator} right
+"""
+
+# variables delegate to Variable.evaluate() when not found or of the wrong type, so compiled
+# expressions raise exactly the same exceptions as the interpreted ones
+_VARIABLE_HELPER = """\
+    def {helper}(context):
+        try:
+            value = context.get({name!r}, {default})
+        except _ContextVariableNotFoundError:
+            return {variable}.evaluate(context)
+        if isinstance(value, {return_type}):
+            return value
+        return {variable}.evaluate(context)
+"""
+
+# numeric variables are converted into numbers of the numeric backend, when they aren't already
+_NUMERIC_VARIABLE_HELPER = """\
+    def {helper}(context):
+        try:
+            value = context.get({name!r}, {default})
+        except _ContextVariableNotFoundError:
+            value = None
+        if type(value) is {number_type}:
+            return value
+        return _resolve_variable(context, {name!r}, {return_type}, {default}, {backend})
+"""
+
+
+class PythonCompiler:
+    """Compiler from expressions into python functions.
+
+    The whole expression tree is translated into the source code of a single python function,
+    which is then compiled by the python interpreter. The generated function receives an evaluation
+    context and returns the same value, or raises the same exceptions, that `Expression.evaluate()`
+    would.
+
+    * Literals are inlined.
+    * `And` and `Or` are translated into python `and` and `or`, so they keep short-circuiting.
+    * Expressions unknown to the compiler are evaluated calling their `evaluate()` method.
+    * Numbers are evaluated with the numeric backend given to the compiler, exact decimals by
+      default. The generated function raises `ExpressionEvaluationError` if the context has another
+      numeric backend, so all the sub-expressions use the same one.
+    * Chains of nested `Add`, `Mul`, `And` and `Or` are flattened into a single python expression.
+    * Sub-expressions nested deeper than `max_depth` are evaluated calling their `evaluate()`
+      method, to stay within the nesting limits of the python parser.
+
+    Instances of this class are not thread-safe, but they can be reused to compile many expressions.
+    """
+
+    # global names available to the generated source
+    namespace: dict[str, Any] = _GLOBALS
+    # source of the context passed to expressions unknown to the compiler
+    context_source = "context"
+    # maximum nesting of the generated python expressions
+    max_depth = 50
+
+    def __init__(self, numeric_backend: NumericBackend = DECIMAL) -> None:
+        """Python compiler constructor.
+
+        Args:
+            numeric_backend: Numeric backend of the compiled expressions.
+        """
+        self.numeric_backend = numeric_backend
+        self._constants: dict[int, tuple[str, Any]] = {}
+        self._helpers: list[str] = []
+        self._variables: dict[tuple, str] = {}
+        self._depth = 0
+        self._generators: dict[type[Expression], Callable[[Any], str]] = {
+            Null: self._gen_literal,
+            Boolean: self._gen_literal,
+            Number: self._gen_number,
+            String: self._gen_literal,
+            Datetime: self._gen_literal,
+            Timedelta: self._gen_literal,
+            Variable: self._gen_variable,
+            Add: self._gen_add,
+            Mul: self._gen_mul,
+            Div: self._gen_div,
+            Not: self._gen_not,
+            And: self._gen_and,
+            Or: self._gen_or,
+        }
+
+    def compile(self, expr: Expression) -> CompiledExpression:
+        """Compile an expression into a python function.
+
+        Args:
+            expr: Expression to compile.
+
+        Returns:
+            Function that evaluates the expression in the given context. The generated source code
+            is available in its `source` attribute.
+        """
+        return self._build_function(self.source(expr), expr.__class__.__name__)
+
+    def source(self, expr: Expression) -> str:
+        """Return the python source code of the function that evaluates the given expression.
+
+        The source defines a function `_build` that receives the constants used by the expression
+        and returns the evaluation function.
+
+        Args:
+            expr: Expression to compile.
+
+        Returns:
+            Python source code.
+        """
+        self._reset()
+        body = self._gen(expr)
+        backend = self._constant(self.numeric_backend)
+        return self._function_source(
+            "context",
+            [
+                f"if _numeric_backend(context) is not {backend}:",
+                f"    raise _backend_error({backend}, context)",
+                f"return {body}",
+            ],
+        )
+
+    def _reset(self) -> None:
+        """Forget constants, helpers and variables of previously compiled expressions."""
+        self._constants = {}
+        self._helpers = []
+        self._variables = {}
+        self._depth = 0
+
+    def _function_source(self, params: str, statements: list[str]) -> str:
+        """Return source of the `_build` function, for a function with the given body."""
+        constants = ", ".join(name for name, _ in self._constants.values())
+        return (
+            f"def _build({constants}):\n"
+            + "".join(self._helpers)
+            + f"    def _evaluate({params}):\n"
+            + "".join(f"        {statement}\n" for statement in statements)
+            + "    return _evaluate\n"
+        )
+
+    def _build_function(self, source: str, name: str) -> Callable:
+        """Compile the given source and return the function built by it."""
+        namespace = dict(self.namespace)
+        code = compile(source, f"<compiled {name}>", "exec")
+        exec(code, namespace)  # noqa: S102  # pylint: disable=exec-used
+        constants = [value for _, value in self._constants.values()]
+        function = namespace["_build"](*constants)
+        function.source = source
+        return function
+
+    def _gen(self, expr: Expression) -> str:
+        """Return python source for the given expression."""
+        if self._depth >= self.max_depth and expr.sub_expressions():
+            return self._gen_evaluate(expr)
+        self._depth += 1
+        try:
+            # dispatch on the exact class, so subclasses overriding `evaluate()` are honoured
+            generator = self._generators.get(type(expr))
+            if generator is not None:
+                return generator(expr)
+            if type(expr) in _BINARY_OPERATORS:
+                return self._gen_binary(expr)
+            return self._gen_evaluate(expr)
+        finally:
+            self._depth -= 1
+
+    def _gen_evaluate(self, expr: Expression) -> str:
+        return f"{self._constant(expr)}.evaluate({self.context_source})"
+
+    def _constant(self, value: Any) -> str:
+        """Return the name of the constant holding the given value."""
+        if id(value) not in self._constants:
+            self._constants[id(value)] = (f"_k{len(self._constants)}", value)
+        return self._constants[id(value)][0]
+
+    def _gen_literal(self, expr: Any) -> str:
+        if type(expr.value) in _INLINE_TYPES:
+            return repr(expr.value)
+        return self._constant(expr.value)
+
+    def _gen_number(self, expr: Number) -> str:
+        if self.numeric_backend is DECIMAL:
+            return self._gen_literal(expr)
+        return self._constant(self.numeric_backend.convert(expr.value))
+
+    def _gen_variable(self, expr: Variable) -> str:
+        key = (expr.name, expr.return_type, id(expr.default))
+        if key not in self._variables:
+            helper = f"_v{len(self._variables)}"
+            self._variables[key] = helper
+            if expr.return_type is Decimal and self.numeric_backend is not DECIMAL:
+                self._helpers.append(
+                    _NUMERIC_VARIABLE_HELPER.format(
+                        helper=helper,
+                        name=expr.name,
+                        default=self._constant(expr.default),
+                        return_type=self._constant(expr.return_type),
+                        backend=self._constant(self.numeric_backend),
+                        number_type=self._constant(self.numeric_backend.number_type),
+                    ),
+                )
+                return f"{helper}(context)"
+            self._helpers.append(
+                _VARIABLE_HELPER.format(
+                    helper=helper,
+                    name=expr.name,
+                    default=self._constant(expr.default),
+                    variable=self._constant(expr),
+                    return_type=self._constant(expr.return_type),
+                ),
+            )
+        return f"{self._variables[key]}(context)"
+
+    def _gen_operands(self, operands: Iterable[Expression], operator: str) -> str:
+        # generated sub-expressions are either atoms or parenthesised, so they need no parentheses
+        return f" {operator} ".join(self._gen(sub) for sub in operands)
+
+    def _flatten(self, expr: Expression, left_only: bool = False) -> list[Expression]:
+        """Return operands of the expression, merging operands of nested expressions of its class.
+
+        When `left_only` is true only first operands are merged, so python operators keep adding or
+        multiplying in the same order, and with the same rounding, than the expression.
+        """
+        operands: list[Expression] = []
+        pending: list[tuple[Expression, bool]] = [(expr, True)]
+        while pending:
+            current, mergeable = pending.pop()
+            sub_expressions = current.sub_expressions()
+            if not (mergeable and type(current) is type(expr) and sub_expressions):
+                operands.append(current)
+                continue
+            pending.extend((sub, not left_only) for sub in reversed(sub_expressions[1:]))
+            pending.append((sub_expressions[0], True))
+        return operands
+
+    def _gen_binary(self, expr: Expression) -> str:
+        # like their evaluate(), binary expressions only use their first two operands
+        operands = expr.sub_expressions()[:2]
+        if len(operands) < 2:
+            return self._gen_evaluate(expr)
+        operator = _BINARY_OPERATORS[type(expr)]
+        return f"({self._gen_operands(operands, operator)})"
+
+    def _gen_add(self, expr: Add) -> str:
+        # sum() starts adding from zero
+        if not expr.sub_expressions():
+            return "0"
+        return f"(0 + {self._gen_operands(self._flatten(expr, left_only=True), '+')})"
+
+    def _gen_mul(self, expr: Mul) -> str:
+        # Mul starts multiplying from the backend one, Decimal(1) by default
+        one = (
+            "_ONE" if self.numeric_backend is DECIMAL else self._constant(self.numeric_backend.one)
+        )
+        if not expr.sub_expressions():
+            return one
+        return f"({one} * {self._gen_operands(self._flatten(expr, left_only=True), '*')})"
+
+    def _gen_div(self, expr: Div) -> str:
+        operands = expr.sub_expressions()[:2]
+        if len(operands) < 2:
+            return self._gen_evaluate(expr)
+        div_helper = _DIV_HELPER.format(operator=self.numeric_backend.division_operator)
+        if div_helper not in self._helpers:
+            self._helpers.append(div_helper)
+        left, right = operands
+        return f"_div({self._gen(left)}, {self._gen(right)})"
+
+    def _gen_not(self, expr: Not) -> str:
+        return f"(not {self._gen(expr.sub_expressions()[0])})"
+
+    def _gen_and(self, expr: And) -> str:
+        if not expr.sub_expressions():
+            return "True"
+        return f"(True if {self._gen_operands(self._flatten(expr), 'and')} else False)"
+
+    def _gen_or(self, expr: Or) -> str:
+        if not expr.sub_expressions():
+            return "False"
+        return f"(True if {self._gen_operands(self._flatten(expr), 'or')} else False)"
+
+
+def compile_expression(
+    expr: Expression,
+    numeric_backend: NumericBackend = DECIMAL,
+) -> CompiledExpression:
+    """Compile an expression into a python function.
+
+    Args:
+        expr: Expression to compile.
+        numeric_backend: Numeric backend of the compiled expression, exact decimals by default.
+
+    Returns:
+        Function that evaluates the expression in the context given as its only argument. The
+        function raises `ExpressionEvaluationError` if the context has another numeric backend.
+
+    Raises:
+        ExpressionEvaluationError if a number literal can't be represented by the numeric backend.
+    """
+    return PythonCompiler(numeric_backend).compile(expr)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from enum import IntEnum
+from functools import reduce
+from operator import eq, ge, gt, le, lt, mod, mul, ne, sub
+from typing import TYPE_CHECKING, Any
+
+from expressions.context import Context
+from expressions.exceptions import ExpressionEvaluationError
+from expressions.expr.variable import resolve_variable
+from expressions.numeric import DECIMAL, numeric_backend
+
+if TYPE_CHECKING:
+    from expressions.compiler.bytecode import Program
+
+
+class OpCode(IntEnum):
+    """Opcodes of the expression bytecode.
+
+    Every instruction has a single operand. Instructions that don't need it ignore it.
+    """
+
+    # push constants[operand]
+    CONST = 0
+    # push the value of the variable described by constants[operand]: (name, return_type, default)
+    VAR = 1
+    # push the result of evaluating the expression constants[operand]
+    EVAL = 2
+    # pop `operand` values and push their sum
+    ADD = 3
+    # pop `operand` values and push their product
+    MUL = 4
+    # pop two values and push the result of the binary operation
+    SUB = 5
+    DIV = 6
+    MOD = 7
+    EQ = 8
+    NE = 9
+    LT = 10
+    LE = 11
+    GT = 12
+    GE = 13
+    # replace top of the stack by its negation
+    NOT = 14
+    # replace top of the stack by its truth value
+    TO_BOOL = 15
+    # if top of the stack is false jump `operand` instructions forward, in other case pop it
+    JUMP_IF_FALSE_OR_POP = 16
+    # if top of the stack is true jump `operand` instructions forward, in other case pop it
+    JUMP_IF_TRUE_OR_POP = 17
+
+
+# opcodes as plain integers, since comparing them is faster than comparing enum members
+_CONST = int(OpCode.CONST)
+_VAR = int(OpCode.VAR)
+_EVAL = int(OpCode.EVAL)
+_ADD = int(OpCode.ADD)
+_MUL = int(OpCode.MUL)
+_DIV = int(OpCode.DIV)
+_NOT = int(OpCode.NOT)
+_TO_BOOL = int(OpCode.TO_BOOL)
+_JUMP_IF_FALSE_OR_POP = int(OpCode.JUMP_IF_FALSE_OR_POP)
+_JUMP_IF_TRUE_OR_POP = int(OpCode.JUMP_IF_TRUE_OR_POP)
+
+_BINARY_FUNCTIONS = {
+    int(OpCode.SUB): sub,
+    int(OpCode.MOD): mod,
+    int(OpCode.EQ): eq,
+    int(OpCode.NE): ne,
+    int(OpCode.LT): lt,
+    int(OpCode.LE): le,
+    int(OpCode.GT): gt,
+    int(OpCode.GE): ge,
+}
+
+
+def execute(program: Program, context: Context) -> Any:  # noqa: C901
+    """Execute a program in context.
+
+    The program is run by a stack machine: every instruction pops its arguments from the stack and
+    pushes its result, which at the end of the program is the only value in the stack. Numbers are
+    evaluated with the numeric backend of the context.
+
+    Args:
+        program: Program to execute.
+        context: Evaluation context.
+
+    Returns:
+        Result of executing the program, the same value the expression it was assembled from would
+        evaluate to.
+
+    Raises:
+        ExpressionEvaluationError.
+    """
+    # pylint: disable=too-many-branches
+    opcodes = program.opcodes
+    operands = program.operands
+    constants = program.constants
+    backend = numeric_backend(context)
+    # number literals are decimals, converted when the context has another backend
+    convert = backend.convert if backend is not DECIMAL else None
+    stack: list[Any] = []
+    push = stack.append
+    pop = stack.pop
+    counter = 0
+    end = len(opcodes)
+    while counter < end:
+        opcode = opcodes[counter]
+        operand = operands[counter]
+        counter += 1
+        if opcode == _CONST:
+            value = constants[operand]
+            push(convert(value) if convert is not None and type(value) is Decimal else value)
+        elif opcode == _VAR:
+            push(resolve_variable(context, *constants[operand]))
+        elif opcode in _BINARY_FUNCTIONS:
+            right = pop()
+            stack[-1] = _BINARY_FUNCTIONS[opcode](stack[-1], right)
+        elif opcode == _DIV:
+            right = pop()
+            if right == 0:
+                raise ExpressionEvaluationError("division by zero")
+            stack[-1] = backend.divide(stack[-1], right)
+        elif opcode == _JUMP_IF_FALSE_OR_POP:
+            if stack[-1]:
+                pop()
+            else:
+                counter += operand
+        elif opcode == _JUMP_IF_TRUE_OR_POP:
+            if stack[-1]:
+                counter += operand
+            else:
+                pop()
+        elif opcode == _TO_BOOL:
+            stack[-1] = bool(stack[-1])
+        elif opcode == _NOT:
+            stack[-1] = not stack[-1]
+        elif opcode == _ADD:
+            values = stack[len(stack) - operand :]
+            del stack[len(stack) - operand :]
+            push(sum(values))
+        elif opcode == _MUL:
+            values = stack[len(stack) - operand :]
+            del stack[len(stack) - operand :]
+            push(reduce(mul, values, backend.one))
+        elif opcode == _EVAL:
+            push(constants[operand].evaluate(context))
+        else:
+            raise ExpressionEvaluationError(f"unknown opcode {opcode}")
+    return stack[-1]
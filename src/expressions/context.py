@@ -1,11 +1,32 @@
 from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
 from typing import Any
 
-from expressions.exceptions import ContextPopError, ContextVariableNotFoundError
+from expressions.exceptions import (
+    ContextPopError,
+    ContextValuePendingError,
+    ContextVariableNotFoundError,
+)
+from expressions.numeric import DECIMAL, NumericBackend
+
+
+class _NoDefaultType:
+    """Type of the NoDefault marker.
+
+    Instances are pickled as a reference to the `NoDefault` marker, so the marker keeps its identity
+    when expressions are pickled.
+    """
+
+    def __reduce__(self) -> str:
+        return "NoDefault"
+
+    def __repr__(self) -> str:
+        return "NoDefault"
+
 
 # Marker to indicate no default has been specified (we can't use None, since that's a possible
 # valid default).
-NoDefault = object()
+NoDefault = _NoDefaultType()
 
 
 class Context:
@@ -13,6 +34,23 @@ class Context:
 
     An evaluation context is a mapping from names to values. It allows the creation of a stack
     of sub-mappings that can be stacked.
+
+    The context keeps a resolved view with the visible value of every variable, updated when
+    variables are set and sub-mappings are pushed or popped, so reading a variable takes constant
+    time at any depth of the stack. With a single mapping, the view is the mapping itself.
+
+    Numbers are evaluated with the numeric backend of the context, exact decimals by default. Set
+    `numeric_backend` to another backend, like `expressions.numeric.FLOAT`, to evaluate numbers as
+    floats or integers.
+
+    Listeners added to the context are called with the name of every variable whose value may have
+    changed, when it's set or when a sub-mapping containing it is pushed or popped.
+
+    Variables that are expensive to obtain can be given by providers, functions called only when the
+    variable is read and not found in any mapping. Their values are memoized for the life of the
+    context. Providers can be coroutine functions too: reading their variables raises
+    `ContextValuePendingError` until they are awaited with `fetch()`, which
+    `expressions.asynchronous.evaluate_async()` does for every variable read in an evaluation.
     """
 
     def __init__(self, **mapping: Any):
@@ -21,8 +59,17 @@ class Context:
         Args:
             **mapping: Initial context mapping.
         """
+        # keyword arguments are always a new dictionary, so mappings don't need to be copied
         self._mappings: deque[dict[str, Any]] = deque()
-        self._mappings.appendleft(mapping.copy())
+        self._mappings.appendleft(mapping)
+        self._resolved: dict[str, Any] = mapping
+        self._listeners: list[Callable[[str], None]] = []
+        self._providers: dict[str, Callable[[], Any]] = {}
+        self._provided: dict[str, Any] = {}
+        # names of the variables with asynchronous providers
+        self._async_providers: set[str] = set()
+        self._provider_errors: dict[str, Exception] = {}
+        self.numeric_backend: NumericBackend = DECIMAL
 
     def get(self, name: str, default: Any = NoDefault) -> Any:
         """Return value of the given variable name in the first available mapping in the context.
@@ -37,14 +84,14 @@ class Context:
         Raises:
             ContextVariableNotFound, if variable not in mapping, and no default specified.
         """
-        for mapping in self._mappings:
-            if name in mapping:
-                return mapping[name]
-
-        if default != NoDefault:
-            return default
-
-        raise ContextVariableNotFoundError(name)
+        try:
+            return self._resolved[name]
+        except KeyError:
+            if name in self._providers:
+                return self._provide(name)
+            if default is not NoDefault:
+                return default
+            raise ContextVariableNotFoundError(name) from None
 
     def set(self, name: str, value: Any) -> None:  # noqa:
         """Set value of variable in the topmost mapping in the context.
@@ -54,6 +101,10 @@ class Context:
             value: Value of the variable.
         """
         self._mappings[0][name] = value
+        if len(self._mappings) > 1:
+            self._resolved[name] = value
+        for listener in self._listeners:
+            listener(name)
 
     def push_subcontext(self, **mapping: Any) -> None:
         """Push a new mapping in the context stack.
@@ -61,7 +112,15 @@ class Context:
         Args:
             **mapping: Mapping to add at the top of the context stack.
         """
-        self._mappings.appendleft(mapping.copy())
+        if not self._mappings:
+            self._resolved = mapping
+        elif len(self._mappings) == 1:
+            # stop sharing the view with the bottom mapping
+            self._resolved = {**self._resolved, **mapping}
+        else:
+            self._resolved.update(mapping)
+        self._mappings.appendleft(mapping)
+        self._notify(mapping)
 
     def pop_subcontext(self) -> dict[str, Any]:
         """Pop the topmost mapping in the context stack.
@@ -73,6 +132,161 @@ class Context:
             ContextPopException if there's no mapping to pop.
         """
         try:
-            return self._mappings.popleft()
+            mapping = self._mappings.popleft()
         except IndexError as exc:
             raise ContextPopError("No context to pop") from exc
+        if len(self._mappings) <= 1:
+            self._resolved = self._mappings[0] if self._mappings else {}
+        else:
+            for name in mapping:
+                self._resolve(name)
+        self._notify(mapping)
+        return mapping
+
+    def reset(self, mapping: dict[str, Any]) -> None:
+        """Replace all the mappings of the context by the given one, and forget provided values.
+
+        The mapping isn't copied, so the context can be reused to evaluate many records without
+        building a new context for every one. Setting variables modifies the given mapping.
+
+        Args:
+            mapping: New mapping of the context.
+        """
+        if self._listeners:
+            names = {*self._resolved, *self._provided, *self._provider_errors, *mapping}
+        self._mappings.clear()
+        self._mappings.append(mapping)
+        self._resolved = mapping
+        if self._provided or self._provider_errors:
+            self._provided = {}
+            self._provider_errors = {}
+        if self._listeners:
+            self._notify(names)
+
+    def flatten(self) -> dict[str, Any]:
+        """Return mapping with the visible value of every variable in the context.
+
+        Providers of variables not found in any mapping are called if they weren't yet, so the
+        mapping includes the values of all the providers.
+
+        Returns:
+            New dictionary from variable name to value.
+
+        Raises:
+            Any exception raised by a provider.
+            ContextValuePendingError if an asynchronous provider hasn't been awaited with `fetch()`.
+        """
+        for name in self._providers:
+            if name not in self._resolved:
+                self._provide(name)
+        return {**self._provided, **self._resolved}
+
+    def add_provider(
+        self,
+        name: str,
+        provider: Callable[[], Any] | Callable[[], Awaitable[Any]],
+    ) -> None:
+        """Add provider of the value of a variable not found in any mapping.
+
+        Args:
+            name: Name of the variable.
+            provider: Function, or coroutine function, without arguments returning the value.
+        """
+        # pylint: disable=import-outside-toplevel
+        from inspect import iscoroutinefunction  # imported here, as it's slow to import
+
+        self._providers[name] = provider
+        if iscoroutinefunction(provider):
+            self._async_providers.add(name)
+        else:
+            self._async_providers.discard(name)
+        self._provided.pop(name, None)
+        self._provider_errors.pop(name, None)
+
+    def pending(self, names: Iterable[str]) -> list[str]:
+        """Return names of variables given by asynchronous providers not awaited yet.
+
+        Args:
+            names: Names of the variables to check.
+
+        Returns:
+            Sorted names of the variables pending to be fetched.
+        """
+        return sorted(
+            {
+                name
+                for name in names
+                if name not in self._resolved
+                and name not in self._provided
+                and name not in self._provider_errors
+                and name in self._async_providers
+            },
+        )
+
+    async def fetch(self, names: Iterable[str]) -> None:
+        """Await the asynchronous providers of the given variables concurrently.
+
+        Values are memoized, so every provider is awaited once in the life of the context. Errors
+        raised by providers are memoized too, and raised when the variable is read.
+
+        Args:
+            names: Names of the variables to fetch.
+        """
+        # pylint: disable=import-outside-toplevel
+        import asyncio  # imported here, as it's slow to import and only needed with providers
+
+        pending = self.pending(names)
+        values = await asyncio.gather(
+            *(self._providers[name]() for name in pending),
+            return_exceptions=True,
+        )
+        for name, value in zip(pending, values, strict=True):
+            if isinstance(value, Exception):
+                self._provider_errors[name] = value
+            elif isinstance(value, BaseException):
+                raise value
+            else:
+                self._provided[name] = value
+        self._notify(pending)
+
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        """Add listener called with the name of every variable whose value may have changed.
+
+        Args:
+            listener: Function receiving the name of the variable.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str], None]) -> None:
+        """Remove listener from the context.
+
+        Args:
+            listener: Listener previously added to the context.
+        """
+        self._listeners.remove(listener)
+
+    def _resolve(self, name: str) -> None:
+        """Update the resolved value of a variable from the stack of mappings."""
+        for stacked_mapping in self._mappings:
+            if name in stacked_mapping:
+                self._resolved[name] = stacked_mapping[name]
+                return
+        self._resolved.pop(name, None)
+
+    def _provide(self, name: str) -> Any:
+        """Return value of a variable given by a provider, calling the provider once."""
+        try:
+            return self._provided[name]
+        except KeyError:
+            pass
+        if name in self._provider_errors:
+            raise self._provider_errors[name]
+        if name in self._async_providers:
+            raise ContextValuePendingError(name)
+        value = self._provided[name] = self._providers[name]()
+        return value
+
+    def _notify(self, names: Iterable[str]) -> None:
+        for listener in self._listeners:
+            for name in names:
+                listener(name)
@@ -10,6 +10,10 @@ class ExpressionError(Exception):
         super().__init__()
         self.message = message
 
+    def __reduce__(self) -> tuple:
+        """Return arguments to pickle this exception, rebuilt with its constructor arguments."""
+        return self.__class__, (self.message,), self.__dict__
+
 
 class ExpressionValidationError(ExpressionError):
     """Expression Validation Error.
@@ -27,6 +31,10 @@ class ExpressionValidationError(ExpressionError):
         super().__init__(message)
         self.errors = errors
 
+    def __reduce__(self) -> tuple:
+        """Return arguments to pickle this exception, rebuilt with its constructor arguments."""
+        return self.__class__, (self.message, self.errors), self.__dict__
+
 
 class ExpressionEvaluationError(ExpressionError):
     """Expression Evaluation Error.
@@ -55,5 +63,30 @@ class ContextPopError(ContextError):
     """Attempt to pop mapping from context with no mappings."""
 
 
+class ContextValuePendingError(ContextError):
+    """Error raised when reading a variable whose asynchronous provider hasn't been awaited.
+
+    It's not an evaluation error, so it's not caught by expressions or rule sets, and it reaches
+    `expressions.asynchronous.evaluate_async()`, which awaits the provider and evaluates again.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Context value pending error constructor.
+
+        Args:
+            name: Name of the variable.
+        """
+        super().__init__(f"variable {name!s} is provided asynchronously")
+        self.name = name
+
+    def __reduce__(self) -> tuple:
+        """Return arguments to pickle this exception, rebuilt with its constructor arguments."""
+        return self.__class__, (self.name,), self.__dict__
+
+
 class ParseError(ExpressionError):
     """Parse Error."""
+
+
+class SerialiserLookupError(ParseError, LookupError):
+    """Error raised when there's no serialiser or deserialiser registered for an expression."""
@@ -18,6 +18,7 @@ from .expr_types import (
     StringExpression,
     TimedeltaExpression,
 )
+from .interning import ExpressionInterner, intern_expression
 from .literals import Boolean, Datetime, Null, Number, String, Timedelta
 from .logical import And, Not, Or
 from .variable import Variable
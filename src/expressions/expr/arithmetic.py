@@ -6,17 +6,22 @@ from expressions.context import Context
 from expressions.exceptions import ExpressionEvaluationError
 from expressions.expr.expr_base import ExpressionArity, HomogeneousListMixin
 from expressions.expr.expr_types import NumericExpression
+from expressions.numeric import numeric_backend
 
 
 class Arithmetic(HomogeneousListMixin[NumericExpression], NumericExpression):
     """Base class for arithmetic expressions."""
 
+    __slots__ = ("_sub_expressions",)
+
     _items_type = NumericExpression
 
 
 class Add(Arithmetic):
     """Addition expression."""
 
+    __slots__ = ()
+
     arity = ExpressionArity.AT_LEAST_TWO
 
     def evaluate(self, context: Context) -> Decimal:
@@ -27,6 +32,8 @@ class Add(Arithmetic):
 class Sub(Arithmetic):
     """Subtraction expression."""
 
+    __slots__ = ()
+
     arity = ExpressionArity.BINARY
 
     def evaluate(self, context: Context) -> Decimal:
@@ -39,16 +46,21 @@ class Sub(Arithmetic):
 class Mul(Arithmetic):
     """Multiplication expression."""
 
+    __slots__ = ()
+
     arity = ExpressionArity.AT_LEAST_TWO
 
     def evaluate(self, context: Context) -> Decimal:
         """Evaluate multiplication in context."""
-        return reduce(mul, (expr.evaluate(context) for expr in self._sub_expressions), Decimal(1))
+        one = numeric_backend(context).one
+        return reduce(mul, (expr.evaluate(context) for expr in self._sub_expressions), one)
 
 
 class Div(Arithmetic):
     """Division expression."""
 
+    __slots__ = ()
+
     arity = ExpressionArity.BINARY
 
     def evaluate(self, context: Context) -> Decimal:
@@ -57,12 +69,14 @@ class Div(Arithmetic):
         right = self._sub_expressions[1].evaluate(context)
         if right == 0:
             raise ExpressionEvaluationError("division by zero")
-        return left / right
+        return numeric_backend(context).divide(left, right)  # type: ignore
 
 
 class Mod(Arithmetic):
     """Module expression."""
 
+    __slots__ = ()
+
     arity = ExpressionArity.BINARY
 
     def evaluate(self, context: Context) -> Decimal:
@@ -24,16 +24,19 @@ Comparable = (
 class Comparison(HomogeneousListMixin[Comparable], BooleanExpression):
     """Base class for comparison expressions."""
 
+    __slots__ = ("_sub_expressions",)
+
     arity: ExpressionArity = ExpressionArity.BINARY
 
     def _assert_valid_sub_expressions(self, sub_exprs: Sequence[Any]) -> None:
         """Raise exception if literal value is of the wrong type."""
         if len(sub_exprs) <= 1:
             return
-        expected_type = type(sub_exprs[0])
+        # all sub-expressions must evaluate to the same type
+        expected_type = getattr(sub_exprs[0], "return_type", None)
         errors: list[dict] = []
         for i, sub_expr in enumerate(sub_exprs):
-            if not isinstance(sub_expr, expected_type):
+            if getattr(sub_expr, "return_type", None) != expected_type:
                 errors.append({"argument_index": i, "argument_type": str(type(sub_expr))})
         if errors:
             raise ExpressionValidationError("expression validation error", errors)
@@ -42,6 +45,8 @@ class Comparison(HomogeneousListMixin[Comparable], BooleanExpression):
 class Equal(Comparison):
     """Equal comparison expression."""
 
+    __slots__ = ()
+
     def evaluate(self, context: Context) -> bool:
         """Evaluate not expression in context."""
         left = self._sub_expressions[0].evaluate(context)
@@ -52,6 +57,8 @@ class Equal(Comparison):
 class NotEqual(Comparison):
     """Not equal comparison expression."""
 
+    __slots__ = ()
+
     def evaluate(self, context: Context) -> bool:
         """Evaluate not equal expression in context."""
         left = self._sub_expressions[0].evaluate(context)
@@ -62,6 +69,8 @@ class NotEqual(Comparison):
 class LessThan(Comparison):
     """Less than comparison expression."""
 
+    __slots__ = ()
+
     def evaluate(self, context: Context) -> bool:
         """Evaluate less than expression in context."""
         left = self._sub_expressions[0].evaluate(context)
@@ -72,6 +81,8 @@ class LessThan(Comparison):
 class LessThanOrEqual(Comparison):
     """Less than or equal comparison expression."""
 
+    __slots__ = ()
+
     def evaluate(self, context: Context) -> bool:
         """Evaluate less or equal expression in context."""
         left = self._sub_expressions[0].evaluate(context)
@@ -82,6 +93,8 @@ class LessThanOrEqual(Comparison):
 class GreaterThan(Comparison):
     """Greater than comparison expression."""
 
+    __slots__ = ()
+
     def evaluate(self, context: Context) -> bool:
         """Evaluate greater than expression in context."""
         left = self._sub_expressions[0].evaluate(context)
@@ -92,6 +105,8 @@ class GreaterThan(Comparison):
 class GreaterThanOrEqual(Comparison):
     """Greater than or equal comparison expression."""
 
+    __slots__ = ()
+
     def evaluate(self, context: Context) -> bool:
         """Evaluate greater or equal than expression in context."""
         left = self._sub_expressions[0].evaluate(context)
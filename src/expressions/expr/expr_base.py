@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import abc
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from enum import IntEnum
 from typing import Any, Generic, TypeVar, cast
 
 from expressions.context import Context
 from expressions.exceptions import ExpressionValidationError
+from expressions.numeric import DECIMAL, NumericBackend
 
 T = TypeVar("T")
 
@@ -50,6 +51,8 @@ class Expression(abc.ABC, Generic[T]):
     This class is generic on the type of the value the expression evaluates to.
     """
 
+    __slots__ = ("__weakref__",)
+
     return_type: type  # type(T)
     is_literal: bool = False
     arity: ExpressionArity
@@ -92,6 +95,25 @@ class Expression(abc.ABC, Generic[T]):
     def __eq__(self, other: object) -> bool:
         """Return true if expressions are equal."""
 
+    def compile(self, numeric_backend: NumericBackend = DECIMAL) -> Callable[[Context], T]:
+        """Compile expression into a python function.
+
+        The compiled function evaluates the expression in the context given as its only argument,
+        avoiding the cost of calling `evaluate()` on every node of the expression.
+
+        Args:
+            numeric_backend: Numeric backend of the compiled expression, exact decimals by default.
+                The compiled function raises `ExpressionEvaluationError` if evaluated in a context
+                with another numeric backend.
+
+        Returns:
+            Function equivalent to this expression `evaluate()` method.
+        """
+        # pylint: disable=import-outside-toplevel
+        from expressions.compiler.python_compiler import compile_expression
+
+        return compile_expression(self, numeric_backend)
+
 
 class HomogeneousListMixin(Generic[T]):
     """Mixin for expressions that contains a list of sub-expressions of the same type.
@@ -99,6 +121,8 @@ class HomogeneousListMixin(Generic[T]):
     Examples of these types of expressions are the basic arithmetic operations, and comparisons.
     """
 
+    __slots__ = ()
+
     arity: ExpressionArity = ExpressionArity.N_ARY
     _items_type: type[Expression]
     _sub_expressions: tuple[Expression, ...]
@@ -112,17 +136,36 @@ class HomogeneousListMixin(Generic[T]):
         """Raise exception if literal value is of the wrong type."""
         errors: list[dict] = []
         for i, sub_expr in enumerate(sub_exprs):
-            if not isinstance(sub_expr, self._items_type):
+            if not self._is_valid_item(sub_expr):
                 errors.append({"argument_index": i, "argument_type": str(type(sub_expr))})
         if errors:
             raise ExpressionValidationError("expression validation error", errors)
 
+    def _is_valid_item(self, sub_expr: Any) -> bool:
+        """Return True if the sub-expression evaluates to the type of the items of this expression.
+
+        Sub-expressions whose return type is only known per instance, like variables, are valid if
+        their return type is a subclass of the return type of the items type.
+        """
+        if isinstance(sub_expr, self._items_type):
+            return True
+        return_type = getattr(sub_expr, "return_type", None)
+        return (
+            isinstance(sub_expr, Expression)
+            and isinstance(return_type, type)
+            and issubclass(return_type, self._items_type.return_type)
+        )
+
     def sub_expressions(self) -> tuple[Expression, ...]:
         """Return list of direct sub-expressions of this expression."""
         return self._sub_expressions
 
     def __eq__(self, other: object) -> bool:
         """Return true if expressions are equal."""
+        # interned expressions are equal if they are the same instance
+        if self is other:
+            return True
+
         # they must be of the same type
         if self.__class__ != other.__class__:
             return False
@@ -139,6 +182,15 @@ class HomogeneousListMixin(Generic[T]):
             for (self_sub, other_sub) in zip(self_subs, other_subs, strict=True)
         )
 
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        """Return arguments to pickle this expression, rebuilt from its sub-expressions.
+
+        Expressions of subclasses with additional state are pickled with their whole state.
+        """
+        if hasattr(self, "__dict__"):
+            return super().__reduce_ex__(protocol)
+        return self.__class__, self._sub_expressions
+
     def __repr__(self) -> str:
         """Return string representation of this instance."""
         subs_repr = ", ".join([repr(sub) for sub in self.sub_expressions()])
@@ -152,6 +204,8 @@ class MappeableMixin:
     Values in the map don't need to be expressions.
     """
 
+    __slots__ = ()
+
     # This property can be use to introspect on how to create instances of this expression
     params_type_map: dict[str, type]
     # tuple with the name of the parameters that are sub-expressions
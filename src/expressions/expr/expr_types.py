@@ -9,28 +9,38 @@ from expressions.expr.expr_base import Expression
 class BooleanExpression(Expression[bool]):
     """Base class for all boolean expressions."""
 
+    __slots__ = ()
+
     return_type = bool
 
 
 class NumericExpression(Expression[Decimal]):
     """Base class for all numeric expressions."""
 
+    __slots__ = ()
+
     return_type = Decimal
 
 
 class StringExpression(Expression[str]):
     """Base class for all string expressions."""
 
+    __slots__ = ()
+
     return_type = str
 
 
 class DatetimeExpression(Expression[datetime]):
     """Base class for all datetime expressions."""
 
+    __slots__ = ()
+
     return_type = datetime
 
 
 class TimedeltaExpression(Expression[timedelta]):
     """Base class for all boolean expressions."""
 
+    __slots__ = ()
+
     return_type = timedelta
@@ -0,0 +1,99 @@
+from collections.abc import Hashable
+from typing import Any
+from weakref import WeakValueDictionary
+
+from expressions.expr.expr_base import Expression, HomogeneousListMixin
+from expressions.expr.literals import LiteralMixin
+from expressions.expr.variable import Variable
+
+
+def _value_key(value: Any) -> Hashable:
+    """Return key identifying a value.
+
+    Equal values can have different representations, like Decimal("1") and Decimal("1.0"), so they
+    are identified by their type and representation.
+    """
+    return (type(value), repr(value))
+
+
+class ExpressionInterner:
+    """Registry of shared expression instances.
+
+    Interning an expression returns a canonical instance structurally equal to it, so equal
+    sub-expressions are represented by the same instance and memory is shared between them.
+
+    The registry holds weak references to the interned expressions, so expressions no longer used
+    are released. Interned expressions are shared, so they must not be modified.
+
+    Expressions unknown to the interner (not literals, variables, or expressions with homogeneous
+    lists of sub-expressions) are returned unchanged.
+    """
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self._instances: WeakValueDictionary[Hashable, Expression] = WeakValueDictionary()
+
+    def intern(self, expr: Expression) -> Expression:
+        """Return the canonical instance of the given expression.
+
+        Args:
+            expr: Expression to intern.
+
+        Returns:
+            Expression structurally equal to the given one, shared with all other equal expressions
+            interned in this registry.
+        """
+        if isinstance(expr, LiteralMixin):
+            key: Hashable = (expr.__class__, _value_key(expr.value))
+        elif isinstance(expr, Variable):
+            key = (expr.__class__, expr.name, expr.return_type, _value_key(expr.default))
+        elif isinstance(expr, HomogeneousListMixin):
+            sub_expressions = tuple(self.intern(sub_expr) for sub_expr in expr.sub_expressions())
+            # sub-expressions are canonical, so they are identified by their identity
+            key = (expr.__class__, *(id(sub_expr) for sub_expr in sub_expressions))
+            if key not in self._instances and any(
+                interned is not original
+                for interned, original in zip(sub_expressions, expr.sub_expressions(), strict=True)
+            ):
+                expr = expr.__class__(*sub_expressions)  # type: ignore
+        else:
+            return expr
+        return self._instances.setdefault(key, expr)
+
+    def create(self, klass: type[Expression], *args: Any, **kwargs: Any) -> Expression:
+        """Create an expression and return its canonical instance.
+
+        Args:
+            klass: Expression class.
+            *args: Arguments for the expression constructor.
+            **kwargs: Keyword arguments for the expression constructor.
+
+        Returns:
+            Canonical instance of the created expression.
+        """
+        return self.intern(klass(*args, **kwargs))
+
+    def clear(self) -> None:
+        """Remove all interned expressions from the registry."""
+        self._instances.clear()
+
+    def __len__(self) -> int:
+        """Return number of interned expressions."""
+        return len(self._instances)
+
+
+# default registry of shared expression instances
+default_interner = ExpressionInterner()
+
+
+def intern_expression(expr: Expression) -> Expression:
+    """Return the canonical instance of the given expression in the default registry.
+
+    Args:
+        expr: Expression to intern.
+
+    Returns:
+        Expression structurally equal to the given one, shared with all other equal expressions
+        interned in the default registry.
+    """
+    return default_interner.intern(expr)
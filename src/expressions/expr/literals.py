@@ -12,6 +12,7 @@ from expressions.expr.expr_types import (
     StringExpression,
     TimedeltaExpression,
 )
+from expressions.numeric import DECIMAL, numeric_backend
 
 
 class LiteralMixin(Generic[T]):
@@ -21,6 +22,8 @@ class LiteralMixin(Generic[T]):
     since don't contain any sub-expression, making them terminal expressions.
     """
 
+    __slots__ = ()
+
     return_type: Any
     is_literal: bool = True
     arity: ExpressionArity = ExpressionArity.NULLARY
@@ -28,7 +31,7 @@ class LiteralMixin(Generic[T]):
     def __init__(self, value: T) -> None:
         """Literal constructor."""
         self._assert_valid_literal(value)
-        self.value = value
+        self.value = value  # type: ignore
 
     def _assert_valid_literal(self, value: Any) -> None:
         """Raise exception if literal value is of the wrong type."""
@@ -48,6 +51,10 @@ class LiteralMixin(Generic[T]):
 
     def __eq__(self, other: object) -> bool:
         """Return true if expressions are equal."""
+        # interned expressions are equal if they are the same instance
+        if self is other:
+            return True
+
         # they must be of the same type
         if self.__class__ != other.__class__:
             return False
@@ -55,6 +62,15 @@ class LiteralMixin(Generic[T]):
         # and must have the same value
         return self.value == cast(LiteralMixin, other).value
 
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        """Return arguments to pickle this expression, rebuilt from its value.
+
+        Expressions of subclasses with additional state are pickled with their whole state.
+        """
+        if hasattr(self, "__dict__"):
+            return super().__reduce_ex__(protocol)  # type: ignore
+        return self.__class__, (self.value,)
+
     def __repr__(self) -> str:
         """Return string representation of this instance."""
         return f"{self.__class__.__name__}({self.value!s})"
@@ -63,6 +79,8 @@ class LiteralMixin(Generic[T]):
 class Null(LiteralMixin[None], Expression[None]):
     """Null literal expression."""
 
+    __slots__ = ("value",)
+
     return_type = type(None)
 
     def __init__(self, _=None) -> None:
@@ -73,10 +91,14 @@ class Null(LiteralMixin[None], Expression[None]):
 class Boolean(LiteralMixin[bool], BooleanExpression):
     """Boolean literal expression."""
 
+    __slots__ = ("value",)
+
 
 class Number(LiteralMixin[Decimal], NumericExpression):
     """Numeric literal expression."""
 
+    __slots__ = ("value",)
+
     def __init__(self, value: bool | int | float | str | Decimal) -> None:
         """Literal constructor."""
         if not isinstance(value, int | float | str | Decimal):
@@ -95,14 +117,25 @@ class Number(LiteralMixin[Decimal], NumericExpression):
             ) from exc
         super().__init__(Decimal(dec_value))
 
+    def evaluate(self, context: Context) -> Decimal:
+        """Evaluate expression in context, as a number of the numeric backend of the context."""
+        backend = numeric_backend(context)
+        if backend is DECIMAL:
+            return self.value
+        return backend.convert(self.value)  # type: ignore
+
 
 class String(LiteralMixin[str], StringExpression):
     """String literal expression."""
 
+    __slots__ = ("value",)
+
 
 class Datetime(LiteralMixin[datetime], DatetimeExpression):
     """Datetime literal expression."""
 
+    __slots__ = ("value",)
+
     def __repr__(self) -> str:
         """Return string representation of this instance."""
         return f"{self.__class__.__name__}({self.value.isoformat()})"
@@ -110,3 +143,5 @@ class Datetime(LiteralMixin[datetime], DatetimeExpression):
 
 class Timedelta(LiteralMixin[timedelta], TimedeltaExpression):
     """Timedelta literal expression."""
+
+    __slots__ = ("value",)
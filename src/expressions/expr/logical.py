@@ -6,12 +6,16 @@ from expressions.expr.expr_types import BooleanExpression
 class Logical(HomogeneousListMixin[BooleanExpression], BooleanExpression):
     """Base class for comparison expressions."""
 
+    __slots__ = ("_sub_expressions",)
+
     _items_type = BooleanExpression
 
 
 class Not(Logical):
     """Logical Not Expression."""
 
+    __slots__ = ()
+
     arity = ExpressionArity.UNARY
 
     def evaluate(self, context: Context) -> bool:
@@ -22,6 +26,8 @@ class Not(Logical):
 class And(Logical):
     """Logical And Expression."""
 
+    __slots__ = ()
+
     arity = ExpressionArity.N_ARY
 
     def evaluate(self, context: Context) -> bool:
@@ -35,6 +41,8 @@ class And(Logical):
 class Or(Logical):
     """Logical Or Expression."""
 
+    __slots__ = ()
+
     arity = ExpressionArity.N_ARY
 
     def evaluate(self, context: Context) -> bool:
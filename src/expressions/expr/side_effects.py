@@ -0,0 +1,33 @@
+from expressions.expr.expr_base import Expression
+
+# only expressions defined in this package are known to be free of side effects
+_PURE_MODULE_PREFIX = "expressions."
+
+
+def is_side_effect_free_class(expr: Expression) -> bool:
+    """Return True if the expression class is known to be free of side effects.
+
+    Expressions free of side effects can be evaluated in any order, fewer times, or not at all,
+    without changing the result of the expressions containing them.
+
+    Args:
+        expr: Expression.
+
+    Returns:
+        True if the class of the expression is defined in this package.
+    """
+    return expr.__class__.__module__.startswith(_PURE_MODULE_PREFIX)
+
+
+def is_side_effect_free(expr: Expression) -> bool:
+    """Return True if the expression and all its sub-expressions are free of side effects.
+
+    Args:
+        expr: Expression.
+
+    Returns:
+        True if the classes of the expression and its sub-expressions are free of side effects.
+    """
+    if not is_side_effect_free_class(expr):
+        return False
+    return all(is_side_effect_free(sub_expr) for sub_expr in expr.sub_expressions())
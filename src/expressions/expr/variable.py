@@ -1,3 +1,4 @@
+from decimal import Decimal
 from typing import Any, TypeVar, cast
 
 from expressions.context import Context, NoDefault
@@ -7,13 +8,66 @@ from expressions.exceptions import (
     VariableTypeError,
 )
 from expressions.expr.expr_base import Expression, ExpressionArity, MappeableMixin
+from expressions.numeric import DECIMAL, NumericBackend
+from expressions.numeric import numeric_backend as get_numeric_backend
 
 T = TypeVar("T")
 
 
+def resolve_variable(
+    context: Context,
+    name: str,
+    return_type: type,
+    default: Any = NoDefault,
+    numeric_backend: NumericBackend | None = None,
+) -> Any:
+    """Return the value of a variable in the given context.
+
+    Values of numeric variables (of type `Decimal`) are converted into numbers of the numeric
+    backend.
+
+    Args:
+        context: Evaluation context.
+        name: Name of the variable.
+        return_type: Expected type of the variable value.
+        default: Optional value to return if the variable is not in the context.
+        numeric_backend: Numeric backend. By default, the numeric backend of the context.
+
+    Returns:
+        Value of the variable.
+
+    Raises:
+        VariableNotFoundError if the variable is not in context and there's no default.
+        VariableTypeError if the variable value is not of the expected type.
+    """
+    try:
+        value = context.get(name, default)
+    except ContextVariableNotFoundError as exc:
+        raise VariableNotFoundError(f"variable {name!s} not found") from exc
+
+    if return_type is Decimal:
+        backend = numeric_backend or get_numeric_backend(context)
+        if backend is not DECIMAL:
+            if not backend.accepts(value):
+                raise VariableTypeError(
+                    f"Variable '{name}' has incorrect type, "
+                    f"expected: {backend.number_type}, gotten: {type(value)}",
+                )
+            return backend.convert(value)
+
+    if not isinstance(value, return_type):
+        raise VariableTypeError(
+            f"Variable '{name}' has incorrect type, "
+            f"expected: {return_type}, gotten: {type(value)}",
+        )
+    return value
+
+
 class Variable(Expression[T], MappeableMixin):
     """Variable expression."""
 
+    __slots__ = ("name", "return_type", "default")
+
     arity = ExpressionArity.NULLARY
     params_type_map: dict[str, type] = {
         "name": str,
@@ -33,17 +87,7 @@ class Variable(Expression[T], MappeableMixin):
 
     def evaluate(self, context: Context) -> T:
         """Evalaute this expressionn in the given context, returning a value."""
-        try:
-            value = context.get(self.name, self.default)
-        except ContextVariableNotFoundError as exc:
-            raise VariableNotFoundError(f"variable {self.name!s} not found") from exc
-
-        if not isinstance(value, self.return_type):
-            raise VariableTypeError(
-                f"Variable '{self.name}' has incorrect type, "
-                f"expected: {self.return_type}, gotten: {type(value)}",
-            )
-        return value  # type: ignore
+        return resolve_variable(context, self.name, self.return_type, self.default)
 
     def sub_expressions(self) -> tuple[Expression, ...]:
         """Return sub-expressions of this expression."""
@@ -58,6 +102,10 @@ class Variable(Expression[T], MappeableMixin):
 
     def __eq__(self, other: object) -> bool:
         """Return true if expressions are equal."""
+        # interned expressions are equal if they are the same instance
+        if self is other:
+            return True
+
         # they must be of the same type
         if self.__class__ != other.__class__:
             return False
@@ -69,6 +117,17 @@ class Variable(Expression[T], MappeableMixin):
             and self.default == other_var.default
         )
 
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        """Return arguments to pickle this expression, rebuilt from its parameters.
+
+        Expressions of subclasses with additional state are pickled with their whole state.
+        """
+        if hasattr(self, "__dict__"):
+            return super().__reduce_ex__(protocol)
+        if self.default is NoDefault:
+            return self.__class__, (self.name, self.return_type)
+        return self.__class__, (self.name, self.return_type, self.default)
+
     def __repr__(self) -> str:
         """String representation for this instance."""
         opt_default = f", default={self.default}" if self.default != NoDefault else ""
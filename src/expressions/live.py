@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable, Mapping
+from typing import Any
+
+from expressions.context import Context
+from expressions.exceptions import ExpressionEvaluationError
+from expressions.expr.expr_base import Expression, ExpressionArity, HomogeneousListMixin
+from expressions.expr.side_effects import is_side_effect_free_class
+from expressions.expr.variable import Variable
+from expressions.memoization import variable_names
+
+
+class LiveNode(Expression):
+    """Expression that keeps the value of its sub-expression until it's invalidated.
+
+    Live nodes form a dependency graph: invalidating a node invalidates the nodes whose values were
+    computed from it (its parents), up to the root. Volatile nodes, whose dependencies are unknown,
+    are evaluated every time.
+    """
+
+    arity = ExpressionArity.UNARY
+
+    def __init__(self, expr: Expression, volatile: bool = False) -> None:
+        """Live node constructor.
+
+        Args:
+            expr: Expression whose value is kept.
+            volatile: True if the value must not be kept.
+        """
+        self.expr = expr
+        self.return_type = expr.return_type
+        self.volatile = volatile
+        self.parents: list[LiveNode] = []
+        self.valid = False
+        self.value: Any = None
+
+    def sub_expressions(self) -> tuple[Expression, ...]:
+        """Return sub-expressions of this expression."""
+        return (self.expr,)
+
+    def evaluate(self, context: Context) -> Any:
+        """Return kept value, or evaluate sub-expression in context if there's none."""
+        if self.valid:
+            return self.value
+        value = self.expr.evaluate(context)
+        if not self.volatile:
+            self.value = value
+            self.valid = True
+        return value
+
+    def invalidate(self) -> None:
+        """Discard kept value of this node and its parents."""
+        # parents of invalid nodes are invalid too, or their value didn't depend on this node
+        if self.valid:
+            self.valid = False
+            self.value = None
+            for parent in self.parents:
+                parent.invalidate()
+
+    def __eq__(self, other: object) -> bool:
+        """Return true if expressions are equal."""
+        if self is other:
+            return True
+        return isinstance(other, LiveNode) and self.expr == other.expr
+
+    def __repr__(self) -> str:
+        """Return string representation of this instance."""
+        return f"{self.__class__.__name__}({self.expr!r})"
+
+
+class LiveEvaluator:
+    """Incremental evaluator of expressions over a changing context.
+
+    Every node of the expressions is replaced by a `LiveNode` keeping its value, and nodes reading
+    variables are registered as listeners of the context. When a variable changes, through
+    `Context.set()` or pushing or popping sub-mappings, only the nodes that depend on it are
+    evaluated again, and every other node keeps its value.
+
+    Expressions defined outside this library may read the context directly, so their nodes, and
+    the nodes depending on them, are evaluated every time. Shared sub-expressions, like the ones
+    created by the interner, are evaluated once for all the expressions containing them.
+    """
+
+    def __init__(
+        self,
+        context: Context,
+        expressions: Mapping[Hashable, Expression] | Iterable[tuple[Hashable, Expression]] = (),
+    ) -> None:
+        """Live evaluator constructor.
+
+        Args:
+            context: Context where expressions are evaluated.
+            expressions: Mapping from key to expression, or iterable of (key, expression) pairs.
+        """
+        self.context = context
+        self._roots: dict[Hashable, LiveNode] = {}
+        # original expressions are kept alive, so the ids of their nodes are not reused
+        self._originals: dict[Hashable, Expression] = {}
+        self._nodes: dict[int, LiveNode] = {}
+        self._readers: dict[str, list[LiveNode]] = {}
+        for key, expr in dict(expressions).items():
+            self.add(key, expr)
+        context.add_listener(self._variable_changed)
+
+    def add(self, key: Hashable, expr: Expression) -> None:
+        """Add expression to evaluate.
+
+        Args:
+            key: Key identifying the expression.
+            expr: Expression.
+        """
+        self._originals[key] = expr
+        self._roots[key] = self._node(expr)
+
+    def evaluate(self, key: Hashable) -> Any:
+        """Return current value of the expression with the given key.
+
+        Args:
+            key: Key of the expression.
+
+        Returns:
+            Value of the expression in the context.
+
+        Raises:
+            ExpressionEvaluationError if the expression can't be evaluated.
+        """
+        return self._roots[key].evaluate(self.context)
+
+    def evaluate_all(
+        self,
+        errors: dict[Hashable, ExpressionEvaluationError] | None = None,
+    ) -> dict[Hashable, Any]:
+        """Return current values of all the expressions.
+
+        Args:
+            errors: Optional dictionary where errors raised by expressions are stored by key.
+
+        Returns:
+            Mapping from key to value, for all expressions that don't raise
+            `ExpressionEvaluationError`.
+        """
+        values = {}
+        for key, root in self._roots.items():
+            try:
+                values[key] = root.evaluate(self.context)
+            except ExpressionEvaluationError as exc:
+                if errors is not None:
+                    errors[key] = exc
+        return values
+
+    def close(self) -> None:
+        """Stop listening to changes in the context."""
+        self.context.remove_listener(self._variable_changed)
+
+    def _variable_changed(self, name: str) -> None:
+        for node in self._readers.get(name, ()):
+            node.invalidate()
+
+    def _node(self, expr: Expression) -> LiveNode:
+        """Return live node for the expression, sharing nodes of the same sub-expressions."""
+        node = self._nodes.get(id(expr))
+        if node is not None:
+            return node
+
+        if isinstance(expr, HomogeneousListMixin) and is_side_effect_free_class(expr):
+            sub_nodes = [self._node(sub_expr) for sub_expr in expr.sub_expressions()]
+            node = LiveNode(
+                expr.__class__(*sub_nodes),  # type: ignore
+                volatile=any(sub_node.volatile for sub_node in sub_nodes),
+            )
+            for sub_node in sub_nodes:
+                sub_node.parents.append(node)
+        elif isinstance(expr, Variable) or is_side_effect_free_class(expr):
+            # expressions reading the context only through variables
+            node = LiveNode(expr)
+            for name in variable_names(expr):
+                self._readers.setdefault(name, []).append(node)
+        else:
+            node = LiveNode(expr, volatile=True)
+        self._nodes[id(expr)] = node
+        return node
+
+    def __len__(self) -> int:
+        """Return number of expressions."""
+        return len(self._roots)
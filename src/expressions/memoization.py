@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Hashable
+from itertools import count
+from typing import Any
+
+from expressions.context import Context
+from expressions.expr.expr_base import Expression, ExpressionArity, HomogeneousListMixin
+from expressions.expr.side_effects import is_side_effect_free, is_side_effect_free_class
+from expressions.expr.variable import Variable
+from expressions.numeric import numeric_backend
+
+# marker for variables missing in the context
+_MISSING = object()
+
+# tokens identifying memoized expressions in a shared cache
+_tokens = count()
+
+
+def variable_names(expr: Expression) -> frozenset[str]:
+    """Return names of the variables read by the expression.
+
+    Args:
+        expr: Expression.
+
+    Returns:
+        Names of all variables in the expression and its sub-expressions.
+    """
+    if isinstance(expr, Variable):
+        return frozenset((expr.name,))
+    names: frozenset[str] = frozenset()
+    for sub_expr in expr.sub_expressions():
+        names |= variable_names(sub_expr)
+    return names
+
+
+class ResultCache:
+    """Bounded LRU cache of expression results.
+
+    When the cache is full, adding a new result removes the least recently used one. The cache
+    counts the lookups that found a result (hits) and the ones that didn't (misses).
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """Result cache constructor.
+
+        Args:
+            maxsize: Maximum number of results kept in the cache.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        """Return result cached with the given key, or `_MISSING` if there's none."""
+        try:
+            result = self._results[key]
+        except KeyError:
+            self.misses += 1
+            return _MISSING
+        self._results.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: Hashable, result: Any) -> None:
+        """Cache result with the given key, removing the least recently used one if full."""
+        self._results[key] = result
+        self._results.move_to_end(key)
+        if len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all results and reset counters."""
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return number of cached results."""
+        return len(self._results)
+
+    def __repr__(self) -> str:
+        """Return string representation of this instance."""
+        return (
+            f"{self.__class__.__name__}(hits={self.hits}, misses={self.misses}, "
+            f"size={len(self)}, maxsize={self.maxsize})"
+        )
+
+
+class Memoized(Expression):
+    """Expression that caches the results of its sub-expression.
+
+    Results are cached by the values, and types, of the variables the sub-expression reads, and by
+    the numeric backend of the context, so the sub-expression is only evaluated again when any of
+    them changes. Evaluations raising an
+    exception, or where any variable has a value that isn't hashable, are not cached.
+
+    The sub-expression must be free of side effects and read the context only through variables.
+    """
+
+    arity = ExpressionArity.UNARY
+
+    def __init__(self, expr: Expression, cache: ResultCache | None = None) -> None:
+        """Memoized expression constructor.
+
+        Args:
+            expr: Expression whose results are cached.
+            cache: Cache where results are stored, which can be shared by many expressions. By
+                default, a new cache is created.
+        """
+        self.expr = expr
+        self.cache = cache if cache is not None else ResultCache()
+        self.names = tuple(sorted(variable_names(expr)))
+        self.return_type = expr.return_type
+        self._token = next(_tokens)
+
+    def sub_expressions(self) -> tuple[Expression, ...]:
+        """Return sub-expressions of this expression."""
+        return (self.expr,)
+
+    def evaluate(self, context: Context) -> Any:
+        """Evaluate expression in context, returning the cached result if available."""
+        values = []
+        for name in self.names:
+            value = context.get(name, _MISSING)
+            values.append((type(value), value))
+        key = (self._token, numeric_backend(context), tuple(values))
+        try:
+            result = self.cache.get(key)
+        except TypeError:
+            # unhashable values
+            return self.expr.evaluate(context)
+        if result is _MISSING:
+            result = self.expr.evaluate(context)
+            self.cache.put(key, result)
+        return result
+
+    def __eq__(self, other: object) -> bool:
+        """Return true if expressions are equal."""
+        if self is other:
+            return True
+        return isinstance(other, Memoized) and self.expr == other.expr
+
+    def __repr__(self) -> str:
+        """Return string representation of this instance."""
+        return f"{self.__class__.__name__}({self.expr!r})"
+
+
+def memoize(
+    expr: Expression,
+    cache: ResultCache | None = None,
+    max_variables: int = 2,
+) -> Expression:
+    """Return expression where the largest subtrees reading few variables are memoized.
+
+    Subtrees reading at most `max_variables` distinct variables, and free of side effects, are
+    wrapped in `Memoized` expressions sharing the same cache. Variables and literals are not
+    memoized, since they are cheaper to evaluate than to look up.
+
+    Args:
+        expr: Expression to memoize.
+        cache: Cache shared by all memoized subtrees. By default, a new cache is created.
+        max_variables: Maximum number of variables read by memoized subtrees.
+
+    Returns:
+        Equivalent expression with memoized subtrees.
+    """
+    if cache is None:
+        cache = ResultCache()
+    if not expr.sub_expressions() or isinstance(expr, Memoized):
+        return expr
+    if len(variable_names(expr)) <= max_variables and is_side_effect_free(expr):
+        return Memoized(expr, cache)
+    if not isinstance(expr, HomogeneousListMixin) or not is_side_effect_free_class(expr):
+        return expr
+    sub_expressions = [memoize(sub, cache, max_variables) for sub in expr.sub_expressions()]
+    return expr.__class__(*sub_expressions)  # type: ignore
+
+
+def unmemoized(expr: Expression) -> Expression:
+    """Return expression where `Memoized` expressions are replaced by their sub-expressions.
+
+    Args:
+        expr: Expression with memoized subtrees.
+
+    Returns:
+        Expression without memoized subtrees.
+    """
+    if isinstance(expr, Memoized):
+        return unmemoized(expr.expr)
+    if not isinstance(expr, HomogeneousListMixin):
+        return expr
+    return expr.__class__(*(unmemoized(sub) for sub in expr.sub_expressions()))  # type: ignore
@@ -0,0 +1,65 @@
+import sys
+from typing import Any, NamedTuple
+
+from expressions.context import NoDefault
+from expressions.expr.expr_base import Expression
+
+# objects shared by all expressions, which are not counted as used by any of them
+_SHARED = (None, True, False, NoDefault)
+
+
+class MemoryUsage(NamedTuple):
+    """Memory used by an expression."""
+
+    # size in bytes of the expression, its sub-expressions and all their values
+    size: int
+    # number of expression nodes
+    nodes: int
+
+
+def _attribute_values(obj: Any) -> list[Any]:
+    """Return values of the attributes of an object, from its slots and its `__dict__`."""
+    values = []
+    for klass in type(obj).__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        for slot in (slots,) if isinstance(slots, str) else slots:
+            if slot not in ("__dict__", "__weakref__") and hasattr(obj, slot):
+                values.append(getattr(obj, slot))
+    obj_dict = getattr(obj, "__dict__", None)
+    if obj_dict is not None:
+        values.append(obj_dict)
+    return values
+
+
+def memory_usage(expr: Expression) -> MemoryUsage:
+    """Return memory used by the expression.
+
+    The size includes the expression, its sub-expressions and their values, counting only once
+    objects shared between them. Classes, and singletons like `None` or `NoDefault`, are not
+    counted.
+
+    Args:
+        expr: Expression.
+
+    Returns:
+        Size in bytes and number of nodes of the expression.
+    """
+    size = 0
+    nodes = 0
+    seen: set[int] = set()
+    pending: list[Any] = [expr]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, type) or any(obj is shared for shared in _SHARED):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, Expression):
+            nodes += 1
+            pending.extend(_attribute_values(obj))
+        elif isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, tuple | list | set | frozenset):
+            pending.extend(obj)
+    return MemoryUsage(size, nodes)
@@ -0,0 +1,117 @@
+from collections.abc import Callable
+from decimal import Decimal
+from operator import floordiv, truediv
+from typing import Any
+
+from expressions.exceptions import ExpressionEvaluationError
+
+
+class NumericBackend:
+    """Numeric backend, the type of numbers used to evaluate numeric expressions.
+
+    The backend converts the values of number literals and numeric variables into its number
+    type, and provides the arithmetic operations that differ between number types.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        number_type: type,
+        accepted_types: tuple[type, ...],
+        one: Any,
+        divide: Callable[[Any, Any], Any],
+        division_operator: str,
+    ) -> None:
+        """Numeric backend constructor.
+
+        Args:
+            name: Name of the backend.
+            number_type: Type of the numbers of the backend.
+            accepted_types: Types of the values of numeric variables that can be converted.
+            one: Number one, the identity of multiplication.
+            divide: Division function.
+            division_operator: Python operator of the division.
+        """
+        self.name = name
+        self.number_type = number_type
+        self.accepted_types = accepted_types
+        self.one = one
+        self.divide = divide
+        self.division_operator = division_operator
+
+    def accepts(self, value: Any) -> bool:
+        """Return True if the value can be used as a number of this backend."""
+        return isinstance(value, self.accepted_types) and not isinstance(value, bool)
+
+    def convert(self, value: Any) -> Any:
+        """Convert a number into the number type of this backend.
+
+        Args:
+            value: Number accepted by the backend.
+
+        Returns:
+            Converted number.
+
+        Raises:
+            ExpressionEvaluationError if the number can't be represented by the backend.
+        """
+        if type(value) is self.number_type:
+            return value
+        converted = self.number_type(value)
+        if converted != value:
+            raise ExpressionEvaluationError(f"{value} is not a valid {self.name} number")
+        return converted
+
+    def __reduce__(self) -> Any:
+        """Return arguments to pickle this backend, as a reference to a registered backend."""
+        if NUMERIC_BACKENDS.get(self.name) is self:
+            return get_backend, (self.name,)
+        return super().__reduce__()
+
+    def __repr__(self) -> str:
+        """Return string representation of this instance."""
+        return f"{self.__class__.__name__}({self.name!r})"
+
+
+class _FloatBackend(NumericBackend):
+    """Numeric backend of IEEE floats, where conversions round to the nearest float."""
+
+    def convert(self, value: Any) -> Any:
+        """Convert a number into a float."""
+        return float(value)
+
+
+# exact decimal numbers, the default backend
+DECIMAL = NumericBackend("decimal", Decimal, (Decimal,), Decimal(1), truediv, "/")
+# IEEE floats
+FLOAT = _FloatBackend("float", float, (Decimal, float, int), 1.0, truediv, "/")
+# integers, where division is the floor division
+INT = NumericBackend("int", int, (Decimal, float, int), 1, floordiv, "//")
+
+NUMERIC_BACKENDS: dict[str, NumericBackend] = {
+    backend.name: backend for backend in (DECIMAL, FLOAT, INT)
+}
+
+
+def get_backend(name: str) -> NumericBackend:
+    """Return registered numeric backend with the given name.
+
+    Args:
+        name: Name of the backend: "decimal", "float" or "int".
+
+    Returns:
+        Numeric backend.
+    """
+    return NUMERIC_BACKENDS[name]
+
+
+def numeric_backend(context: Any) -> NumericBackend:
+    """Return numeric backend of the context, or the decimal backend if it has none.
+
+    Args:
+        context: Evaluation context. Expressions without variables can be evaluated in any object.
+
+    Returns:
+        Numeric backend.
+    """
+    return getattr(context, "numeric_backend", DECIMAL)
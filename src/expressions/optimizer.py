@@ -0,0 +1,225 @@
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+from expressions.context import Context
+from expressions.exceptions import ExpressionError
+from expressions.expr.arithmetic import Add, Div, Mod, Mul, Sub
+from expressions.expr.comparison import (
+    Equal,
+    GreaterThan,
+    GreaterThanOrEqual,
+    LessThan,
+    LessThanOrEqual,
+    NotEqual,
+)
+from expressions.expr.expr_base import Expression
+from expressions.expr.literals import Boolean, Datetime, Null, Number, String, Timedelta
+from expressions.expr.logical import And, Not, Or
+from expressions.numeric import DECIMAL, NumericBackend
+
+# literal expression classes for every literal value type
+_LITERAL_CLASSES: dict[type, type[Expression]] = {
+    type(None): Null,
+    bool: Boolean,
+    Decimal: Number,
+    int: Number,
+    float: Number,
+    str: String,
+    datetime: Datetime,
+    timedelta: Timedelta,
+}
+
+# expressions whose sub-expressions are optimized and that can be folded
+_FOLDABLE_CLASSES: tuple[type[Expression], ...] = (
+    Add,
+    Sub,
+    Mul,
+    Div,
+    Mod,
+    Equal,
+    NotEqual,
+    LessThan,
+    LessThanOrEqual,
+    GreaterThan,
+    GreaterThanOrEqual,
+    Not,
+    And,
+    Or,
+)
+
+
+def _is_literal_value(expr: Expression, value: Any) -> bool:
+    """Return True if expression is a literal with the given value."""
+    return bool(expr.is_literal and getattr(expr, "value", None) == value)
+
+
+class Optimizer:
+    """Expression optimizer.
+
+    The optimizer returns a smaller expression that evaluates to the same values, and raises the
+    same exceptions, than the original one. It rewrites expressions bottom-up:
+
+    * Sub-expressions with only literal sub-expressions are folded into literals, unless evaluating
+      them raises, like dividing by a literal zero.
+    * Nested `And` and `Or` are flattened. Nested `Add` and `Mul` are flattened when they are the
+      first operand, since decimal arithmetic is only associative up to rounding.
+    * Identity elements are removed: `True` from `And`, `False` from `Or`, zero from `Add` and
+      `Sub`, and one from `Mul` and `Div`.
+    * Operands after an absorbing element of `And` (`False`) or `Or` (`True`) are removed, since
+      they are never evaluated.
+    * Double negations are removed.
+
+    Expressions unknown to the optimizer are returned unchanged.
+
+    Literals are folded with the numeric backend of the optimizer, so optimized expressions evaluate
+    to the same values in contexts with that backend only. With the decimal backend, folding and
+    removing identity elements are exact for numbers within the precision of the decimal context,
+    while numbers with more digits are no longer rounded by the removed operations.
+    """
+
+    def __init__(self, numeric_backend: NumericBackend = DECIMAL) -> None:
+        """Constructor.
+
+        Args:
+            numeric_backend: Numeric backend of the contexts the optimized expressions are evaluated
+                in.
+        """
+        self.numeric_backend = numeric_backend
+        self._simplifiers: dict[type[Expression], Callable[[Any], Expression]] = {
+            Add: self._simplify_add,
+            Sub: self._simplify_sub,
+            Mul: self._simplify_mul,
+            Div: self._simplify_div,
+            Not: self._simplify_not,
+            And: self._simplify_and,
+            Or: self._simplify_or,
+        }
+
+    def optimize(self, expr: Expression) -> Expression:
+        """Return optimized version of the given expression.
+
+        Args:
+            expr: Expression to optimize.
+
+        Returns:
+            Optimized expression.
+        """
+        # dispatch on the exact class, so subclasses overriding `evaluate()` are kept unchanged
+        if type(expr) not in _FOLDABLE_CLASSES:
+            return expr
+        sub_expressions = tuple(self.optimize(sub_expr) for sub_expr in expr.sub_expressions())
+        if all(sub_expr.is_literal for sub_expr in sub_expressions):
+            folded = self._fold(type(expr)(*sub_expressions))  # type: ignore
+            if folded is not None:
+                return folded
+        simplifier = self._simplifiers.get(type(expr))
+        if simplifier is not None:
+            return simplifier(sub_expressions)
+        return type(expr)(*sub_expressions)  # type: ignore
+
+    def _fold(self, expr: Expression) -> Expression | None:
+        """Return literal with the value of the expression, or None if it can't be folded."""
+        context = Context()
+        context.numeric_backend = self.numeric_backend
+        try:
+            value = expr.evaluate(context)
+        except (ExpressionError, ArithmeticError):
+            # keep the expression, so it raises when evaluated
+            return None
+        literal_class = _LITERAL_CLASSES.get(type(value))
+        if literal_class is None:
+            return None
+        return literal_class(value)  # type: ignore
+
+    @staticmethod
+    def _flatten(
+        klass: type[Expression],
+        sub_expressions: tuple[Expression, ...],
+        first_only: bool = False,
+    ) -> list[Expression]:
+        """Replace sub-expressions of the given class by their sub-expressions."""
+        flattened: list[Expression] = []
+        for i, sub_expr in enumerate(sub_expressions):
+            if type(sub_expr) is klass and (i == 0 or not first_only):
+                flattened.extend(sub_expr.sub_expressions())
+            else:
+                flattened.append(sub_expr)
+        return flattened
+
+    def _simplify_arithmetic(
+        self,
+        klass: type[Expression],
+        sub_expressions: tuple[Expression, ...],
+        identity: int,
+    ) -> Expression:
+        operands = self._flatten(klass, sub_expressions, first_only=True)
+        operands = [sub_expr for sub_expr in operands if not _is_literal_value(sub_expr, identity)]
+        if not operands:
+            return Number(identity)
+        if len(operands) == 1:
+            return operands[0]
+        return klass(*operands)  # type: ignore
+
+    def _simplify_add(self, sub_expressions: tuple[Expression, ...]) -> Expression:
+        return self._simplify_arithmetic(Add, sub_expressions, identity=0)
+
+    def _simplify_mul(self, sub_expressions: tuple[Expression, ...]) -> Expression:
+        return self._simplify_arithmetic(Mul, sub_expressions, identity=1)
+
+    @staticmethod
+    def _simplify_sub(sub_expressions: tuple[Expression, ...]) -> Expression:
+        left, right = sub_expressions
+        return left if _is_literal_value(right, 0) else Sub(left, right)  # type: ignore
+
+    @staticmethod
+    def _simplify_div(sub_expressions: tuple[Expression, ...]) -> Expression:
+        left, right = sub_expressions
+        return left if _is_literal_value(right, 1) else Div(left, right)  # type: ignore
+
+    @staticmethod
+    def _simplify_not(sub_expressions: tuple[Expression, ...]) -> Expression:
+        (operand,) = sub_expressions
+        if type(operand) is Not:
+            return operand.sub_expressions()[0]
+        return Not(operand)  # type: ignore
+
+    def _simplify_logical(
+        self,
+        klass: type[Expression],
+        sub_expressions: tuple[Expression, ...],
+        identity: bool,
+    ) -> Expression:
+        operands: list[Expression] = []
+        for sub_expr in self._flatten(klass, sub_expressions):
+            if _is_literal_value(sub_expr, identity):
+                continue
+            operands.append(sub_expr)
+            if _is_literal_value(sub_expr, not identity):
+                # the absorbing element decides the result, next operands are never evaluated
+                break
+        if not operands:
+            return Boolean(identity)
+        if len(operands) == 1:
+            return operands[0]
+        return klass(*operands)  # type: ignore
+
+    def _simplify_and(self, sub_expressions: tuple[Expression, ...]) -> Expression:
+        return self._simplify_logical(And, sub_expressions, identity=True)
+
+    def _simplify_or(self, sub_expressions: tuple[Expression, ...]) -> Expression:
+        return self._simplify_logical(Or, sub_expressions, identity=False)
+
+
+def optimize(expr: Expression, numeric_backend: NumericBackend = DECIMAL) -> Expression:
+    """Return optimized version of the given expression.
+
+    Args:
+        expr: Expression to optimize.
+        numeric_backend: Numeric backend of the contexts the optimized expression is evaluated in.
+
+    Returns:
+        Expression smaller or equal than the given one, that evaluates to the same values.
+    """
+    return Optimizer(numeric_backend).optimize(expr)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import pickle
+from collections.abc import Hashable, Iterable, Iterator, Mapping
+from typing import Any, NamedTuple
+
+from expressions.chunking import chunks, map_chunks
+from expressions.context import Context
+from expressions.expr.expr_base import Expression
+from expressions.numeric import DECIMAL, NumericBackend
+
+# (variables, numeric backend, error flattening it) of a context, as sent to the workers
+_ContextPayload = tuple[dict[str, Any], NumericBackend, Exception | None]
+
+# expressions of the worker process, set once by the pool initializer
+_worker_expressions: dict[Hashable, Expression] = {}
+# compiled expressions of the worker process, by numeric backend
+_worker_functions: dict[NumericBackend, dict[Hashable, Any]] = {}
+
+
+class EvaluationResult(NamedTuple):
+    """Result of evaluating an expression in a context."""
+
+    # value of the expression, or None if it raised
+    value: Any
+    # exception raised evaluating the expression, or None if it didn't raise
+    error: Exception | None
+
+
+def _init_worker(payload: bytes) -> None:
+    """Unpickle and compile the expressions once per worker process."""
+    _worker_expressions.clear()
+    _worker_expressions.update(pickle.loads(payload))  # noqa: S301
+    _worker_functions.clear()
+
+
+def _functions(backend: NumericBackend) -> dict[Hashable, Any]:
+    """Return the expressions of the worker compiled for the numeric backend."""
+    functions = _worker_functions.get(backend)
+    if functions is None:
+        functions = {key: _compile(expr, backend) for key, expr in _worker_expressions.items()}
+        _worker_functions[backend] = functions
+    return functions
+
+
+def _compile(expr: Expression, backend: NumericBackend) -> Any:
+    try:
+        return expr.compile(backend)
+    except Exception:  # pylint: disable=broad-exception-caught
+        # expressions that can't be compiled are evaluated, reporting their errors for every context
+        return expr.evaluate
+
+
+def _evaluate(function: Any, context: Context) -> EvaluationResult:
+    try:
+        return EvaluationResult(function(context), None)
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        return EvaluationResult(None, exc)
+
+
+def _evaluate_chunk(chunk: list[_ContextPayload]) -> list[dict[Hashable, EvaluationResult]]:
+    """Evaluate the expressions of the worker in every context of the chunk."""
+    results = []
+    for variables, backend, error in chunk:
+        if error is not None:
+            results.append({key: EvaluationResult(None, error) for key in _worker_expressions})
+            continue
+        context = Context(**variables)
+        context.numeric_backend = backend
+        results.append(
+            {key: _evaluate(function, context) for key, function in _functions(backend).items()},
+        )
+    return results
+
+
+def _payload(context: Context | Mapping[str, Any]) -> _ContextPayload:
+    if isinstance(context, Context):
+        try:
+            return context.flatten(), context.numeric_backend, None
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            return {}, context.numeric_backend, exc
+    return dict(context), DECIMAL, None
+
+
+def evaluate_many(
+    expressions: Expression | Mapping[Hashable, Expression],
+    contexts: Iterable[Context | Mapping[str, Any]],
+    workers: int | None = None,
+    chunksize: int = 1000,
+) -> Iterator[Any]:
+    """Evaluate expressions in many contexts, using a pool of processes.
+
+    Expressions are pickled once, and sent once to every worker process, where they are compiled.
+    Contexts are sent in chunks, as mappings with the visible value of every variable, including
+    the values of their providers, and results are returned in the order of the contexts. Contexts
+    are read as results are consumed, so at most two chunks per worker are pending at any time.
+
+    Errors are captured per context and expression, so an expression raising in a context doesn't
+    stop the evaluation of the others. If a provider of a context raises, or is asynchronous and
+    hasn't been awaited, its error is the result of every expression in that context.
+
+    Args:
+        expressions: Expression, or mapping from key to expression.
+        contexts: Contexts, or mappings from variable name to value.
+        workers: Number of worker processes. By default, the number of CPUs.
+        chunksize: Number of contexts sent to a worker at once.
+
+    Yields:
+        For every context, an `EvaluationResult` with the value or the error of the expression,
+        or, if a mapping of expressions is given, a dictionary from key to `EvaluationResult`.
+    """
+    single = isinstance(expressions, Expression)
+    expressions_map = {None: expressions} if single else dict(expressions)  # type: ignore
+    payload = pickle.dumps(expressions_map, protocol=pickle.HIGHEST_PROTOCOL)
+    payloads = chunks((_payload(context) for context in contexts), chunksize)
+    for results in map_chunks(_evaluate_chunk, payloads, workers, _init_worker, (payload,)):
+        for result in results:
+            yield result[None] if single else result
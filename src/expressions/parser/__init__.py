@@ -1,4 +1,7 @@
 # flake8: noqa=F401
-from .json_parser import JsonParser
+from .binary_parser import BinaryParser
+from .cache import CacheStats, ParseCache
+from .json_parser import ExpressionDecoder, JsonParser
 from .parser import Parser
 from .primitive_parser import PrimitiveParser
+from .streams import BINARY, LENGTH_PREFIXED, NDJSON, dump_many, load_many
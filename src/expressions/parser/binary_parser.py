@@ -0,0 +1,555 @@
+import struct
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+
+from expressions.exceptions import ParseError
+from expressions.expr.expr_base import Expression
+from expressions.expr.interning import ExpressionInterner
+from expressions.parser.json_parser import JSONExpressionEncoder, dict_to_type
+from expressions.parser.parser import Parser
+from expressions.parser.primitive_parser import PrimitiveParser
+from expressions.serialiser.dict_serialiser import (
+    HomogeneousListDictDeserialiser,
+    HomogeneousListDictSerialiser,
+    LiteralDictDeserialiser,
+    LiteralDictSerialiser,
+    MappeableDeserialiser,
+    MappeableSerialiser,
+    registry,
+)
+
+# first bytes of every serialised expression: magic byte and version of the format
+_HEADER = b"X\x01"
+
+# tags of the values
+_NONE = 0x00
+_FALSE = 0x01
+_TRUE = 0x02
+_INT = 0x03
+_FLOAT = 0x04
+_DECIMAL = 0x05
+_DECIMAL_TEXT = 0x06
+_STR = 0x07
+_DATETIME = 0x08
+_DATETIME_OFFSET = 0x09
+_TIMEDELTA = 0x0A
+_TYPE = 0x0B
+_LIST = 0x0C
+_DICT = 0x0D
+# expression without opcode: its name, and its serialisation for `PrimitiveParser`
+_NAMED = 0x0E
+
+# Expressions are written in postfix order: sub-expressions are written before the opcode of the
+# expression containing them, followed by their number, so they are built bottom-up in a stack.
+# Names of the expressions with an opcode, the opcode being `_OPCODE_BASE` plus their index.
+# Opcodes are part of the format, so names can be appended but never removed nor reordered.
+_OPCODE_BASE = 0x40
+_OPCODE_NAMES = (
+    "not",
+    "and",
+    "or",
+    "equal",
+    "not-equal",
+    "less-than",
+    "less-than-or-equal",
+    "greater-than",
+    "greater-than-or-equal",
+    "add",
+    "sub",
+    "mul",
+    "div",
+    "mod",
+    "var",
+)
+_OPCODES = {name: _OPCODE_BASE + index for index, name in enumerate(_OPCODE_NAMES)}
+# expressions with opcodes followed by the number of their parameters and the parameters, in this
+# order, instead of by the number of sub-expressions
+_PARAMETERS = {"var": ("name", "return_type", "default")}
+# minimum and maximum number of parameters, by opcode
+_PARAMETER_COUNTS = {_OPCODES["var"]: (2, 3)}
+
+_FLOAT_STRUCT = struct.Struct("<d")
+# naive datetimes are serialised from this one, and aware ones from it in their local time
+_EPOCH = datetime.min  # noqa: DTZ901
+_MICROSECONDS_PER_DAY = 86_400_000_000
+# types without arguments, by name, once decoded
+_TYPES: dict[str, type] = {}
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """Write non-negative integer in 7 bits per byte, the high bit set in all but the last byte."""
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """Return integer written by `_write_varint()` at a position, and the position after it."""
+    byte = data[pos]
+    pos += 1
+    result = byte & 0x7F
+    shift = 7
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        shift += 7
+    return result, pos
+
+
+def _zigzag(value: int) -> int:
+    """Map signed integer into non-negative integer, small if the integer is close to zero."""
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _microseconds(delta: timedelta) -> int:
+    return delta.days * _MICROSECONDS_PER_DAY + delta.seconds * 1_000_000 + delta.microseconds
+
+
+class _Encoder:
+    """Encoder of an expression, collecting the strings into a table."""
+
+    __slots__ = ("out", "strings")
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self.out = bytearray()
+        self.strings: dict[str, int] = {}
+
+    def to_bytes(self) -> bytes:
+        """Return header, string table, and encoded expression.
+
+        The string table has the number of strings, the length of every string, and all the strings
+        encoded at once, so they are decoded at once.
+        """
+        table = bytearray(_HEADER)
+        _write_varint(table, len(self.strings))
+        for string in self.strings:
+            _write_varint(table, len(string))
+        encoded = "".join(self.strings).encode("utf-8")
+        _write_varint(table, len(encoded))
+        return bytes(table + encoded + self.out)
+
+    def string(self, value: str) -> None:
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        _write_varint(self.out, index)
+
+    def expression(self, expr: Expression) -> None:
+        serialiser: Any = registry.serialiser(expr.__class__)
+        serialiser_class = serialiser.__class__
+        if serialiser is LiteralDictSerialiser:
+            self.value(expr.value)  # type: ignore
+            return
+        name = getattr(serialiser, "expr_name", None)
+        if (
+            serialiser_class is HomogeneousListDictSerialiser
+            and name in _OPCODES
+            and name not in _PARAMETERS
+        ):
+            sub_expressions = expr.sub_expressions()
+            for sub_expression in sub_expressions:
+                self.expression(sub_expression)
+            self.out.append(_OPCODES[name])
+            _write_varint(self.out, len(sub_expressions))
+            return
+        if serialiser_class is MappeableSerialiser and name in _PARAMETERS:
+            values = expr.to_dict()  # type: ignore
+            if tuple(values) == _PARAMETERS[name][: len(values)]:
+                self.out.append(_OPCODES[name])
+                _write_varint(self.out, len(values))
+                for value in values.values():
+                    self.value(value)
+                return
+
+        data = serialiser.serialise(expr)
+        if not isinstance(data, dict):
+            self.value(data)
+            return
+        ((name, value),) = data.items()
+        self.out.append(_NAMED)
+        self.string(name)
+        self.value(value)
+
+    def value(self, value: Any) -> None:  # noqa: C901  # pylint: disable=too-many-branches
+        out = self.out
+        value_class = value.__class__
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif value_class is Decimal:
+            sign, digits, exponent = value.as_tuple()
+            if not value.is_finite():
+                out.append(_DECIMAL_TEXT)
+                self.string(str(value))
+                return
+            out.append(_DECIMAL)
+            # sign in the lowest bit of the coefficient, to keep the sign of zero
+            _write_varint(out, int("".join(map(str, digits))) << 1 | sign)
+            _write_varint(out, _zigzag(exponent))  # type: ignore
+        elif value_class is str:
+            out.append(_STR)
+            self.string(value)
+        elif value_class is int:
+            out.append(_INT)
+            _write_varint(out, _zigzag(value))
+        elif value_class is float:
+            out.append(_FLOAT)
+            out += _FLOAT_STRUCT.pack(value)
+        elif value_class is datetime:
+            offset = value.utcoffset()
+            if offset is None:
+                out.append(_DATETIME)
+            else:
+                out.append(_DATETIME_OFFSET)
+                _write_varint(out, _zigzag(_microseconds(offset)))
+            _write_varint(out, _microseconds(value.replace(tzinfo=None) - _EPOCH))
+        elif value_class is timedelta:
+            out.append(_TIMEDELTA)
+            _write_varint(out, _zigzag(_microseconds(value)))
+        elif isinstance(value, type):
+            self.type(JSONExpressionEncoder.encode_type(value))
+        elif value_class is list:
+            out.append(_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                self.value(item)
+        elif value_class is dict:
+            out.append(_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                self.string(key)
+                self.value(item)
+        else:
+            raise TypeError(f"{value_class} is not serialisable")
+
+    def type(self, encoded: dict) -> None:
+        """Encode type, given as encoded for JSON."""
+        self.out.append(_TYPE)
+        self.string(encoded["__value__"])
+        args = encoded.get("__args__")
+        # 0 if the type has no arguments, or the number of arguments plus one
+        _write_varint(self.out, 0 if args is None else len(args) + 1)
+        for arg in args or ():
+            self.type(arg)
+
+
+def _read_strings(data: bytes) -> tuple[list[str], int]:
+    """Return string table of serialised expression, and the position after it."""
+    if data[: len(_HEADER)] != _HEADER:
+        raise ParseError("not a binary serialised expression, or unsupported version")
+    count, pos = _read_varint(data, len(_HEADER))
+    lengths = []
+    for _ in range(count):
+        length, pos = _read_varint(data, pos)
+        lengths.append(length)
+    size, pos = _read_varint(data, pos)
+    if pos + size > len(data):
+        raise ParseError("truncated string table")
+    text = data[pos : pos + size].decode("utf-8")
+    strings = []
+    start = 0
+    for length in lengths:
+        strings.append(text[start : start + length])
+        start += length
+    if start != len(text):
+        raise ParseError("invalid string table")
+    return strings, pos + size
+
+
+def _read_value(  # noqa: C901  # pylint: disable=too-many-return-statements,too-many-branches
+    data: bytes,
+    pos: int,
+    strings: list[str],
+) -> tuple[Any, int]:
+    """Return value written by `_Encoder.value()` at a position, and the position after it."""
+    tag = data[pos]
+    pos += 1
+    if tag == _DECIMAL:
+        coefficient, pos = _read_varint(data, pos)
+        exponent, pos = _read_varint(data, pos)
+        if not exponent and not coefficient & 1:
+            return Decimal(coefficient >> 1), pos
+        sign = "-" if coefficient & 1 else ""
+        return Decimal(f"{sign}{coefficient >> 1}E{_unzigzag(exponent)}"), pos
+    if tag == _STR:
+        index, pos = _read_varint(data, pos)
+        return strings[index], pos
+    if tag == _TYPE:
+        return _read_type(data, pos - 1, strings)
+    if tag == _NONE:
+        return None, pos
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _INT:
+        value, pos = _read_varint(data, pos)
+        return _unzigzag(value), pos
+    if tag == _FLOAT:
+        return _FLOAT_STRUCT.unpack_from(data, pos)[0], pos + _FLOAT_STRUCT.size
+    if tag == _DECIMAL_TEXT:
+        index, pos = _read_varint(data, pos)
+        return Decimal(strings[index]), pos
+    if tag == _DATETIME:
+        microseconds, pos = _read_varint(data, pos)
+        return _EPOCH + timedelta(microseconds=microseconds), pos
+    if tag == _DATETIME_OFFSET:
+        offset, pos = _read_varint(data, pos)
+        microseconds, pos = _read_varint(data, pos)
+        tzinfo = timezone(timedelta(microseconds=_unzigzag(offset)))
+        return (_EPOCH + timedelta(microseconds=microseconds)).replace(tzinfo=tzinfo), pos
+    if tag == _TIMEDELTA:
+        microseconds, pos = _read_varint(data, pos)
+        return timedelta(microseconds=_unzigzag(microseconds)), pos
+    if tag == _LIST:
+        count, pos = _read_varint(data, pos)
+        items = []
+        for _ in range(count):
+            item, pos = _read_value(data, pos, strings)
+            items.append(item)
+        return items, pos
+    if tag == _DICT:
+        count, pos = _read_varint(data, pos)
+        mapping = {}
+        for _ in range(count):
+            index, pos = _read_varint(data, pos)
+            mapping[strings[index]], pos = _read_value(data, pos, strings)
+        return mapping, pos
+    raise ParseError(f"unknown tag {tag:#04x} at byte {pos - 1}")
+
+
+def _read_type(data: bytes, pos: int, strings: list[str]) -> tuple[type, int]:
+    """Return type written by `_Encoder.type()` at a position, and the position after it."""
+    index, end = _read_varint(data, pos + 1)
+    if data[end] == 0:
+        name = strings[index]
+        klass = _TYPES.get(name)
+        if klass is None:
+            klass = _TYPES[name] = dict_to_type({"__value__": name})
+        return klass, end + 1
+    encoded, pos = _read_type_dict(data, pos, strings)
+    return dict_to_type(encoded), pos
+
+
+def _read_type_dict(data: bytes, pos: int, strings: list[str]) -> tuple[dict, int]:
+    """Return type as encoded for JSON, and the position after it."""
+    if data[pos] != _TYPE:
+        raise ParseError(f"expected type at byte {pos}")
+    index, pos = _read_varint(data, pos + 1)
+    encoded: dict[str, Any] = {"__value__": strings[index]}
+    count, pos = _read_varint(data, pos)
+    if count:
+        args = []
+        for _ in range(count - 1):
+            arg, pos = _read_type_dict(data, pos, strings)
+            args.append(arg)
+        encoded["__args__"] = args
+    return encoded, pos
+
+
+def _primitives_builder(name: str) -> Callable[[Any], Expression]:
+    """Return builder of the expressions with a name from their serialisation as primitives."""
+
+    def build(value: Any) -> Expression:
+        return registry.deserialiser(name).deserialise({name: value})  # type: ignore
+
+    return build
+
+
+def _list_builder(name: str, deserialiser: Any) -> Callable[..., Expression]:
+    """Return builder of the expressions with a name, called with their sub-expressions."""
+    if type(deserialiser) is HomogeneousListDictDeserialiser:
+        return deserialiser.expr_class  # type: ignore
+
+    build = _primitives_builder(name)
+    serialise = PrimitiveParser().serialise
+    return lambda *sub_expressions: build([serialise(expr) for expr in sub_expressions])
+
+
+def _parameters_builder(name: str, deserialiser: Any) -> Callable[..., Expression]:
+    """Return builder of the expressions with a name, called with their parameters in order."""
+    if type(deserialiser) is MappeableDeserialiser:
+        # parameters are in the order of the arguments of the expression class
+        return deserialiser.expr_class  # type: ignore
+
+    build = _primitives_builder(name)
+    names = _PARAMETERS[name]
+    return lambda *parameters: build(dict(zip(names, parameters, strict=False)))
+
+
+class BinaryParser(Parser[bytes]):
+    """Parser from and to a compact binary format.
+
+    Expressions are serialised into a header, a table with every distinct string once, and the
+    expression:
+
+    * Built-in expressions are serialised as their opcode, a single byte. Their sub-expressions are
+      serialised before it, and their number after it or, for variables, their parameters.
+    * Other expressions are serialised by name, followed by their serialisation for
+      `PrimitiveParser`.
+    * Literals are serialised as their value. Strings are serialised as their index in the string
+      table; decimals as their digits and exponent; datetimes and timedeltas as their number of
+      microseconds; and types by name.
+
+    All integers, like indexes, counts, and digits, are serialised in as few bytes as possible,
+    7 bits per byte. Expressions are parsed back exactly, equal to the expressions parsed by the
+    other parsers, and built bottom-up without recursion. Like in `PrimitiveParser`, expressions are
+    serialised and parsed with the serialisers and deserialisers of the registry, read again when
+    deserialisers are registered later.
+    """
+
+    def __init__(self, interner: ExpressionInterner | None = None) -> None:
+        """Constructor.
+
+        Args:
+            interner: Optional registry used to intern parsed expressions.
+        """
+        self._interner = interner
+        self._literal_classes: dict[str, type[Expression]] = {}
+        # builders of the expressions with opcodes, from their sub-expressions or parameters. Like
+        # in `ExpressionDecoder`, subclasses of the deserialisers may deserialise differently, so
+        # they are given the serialisation for `PrimitiveParser`.
+        self._list_builders: dict[int, Callable[..., Expression]] = {}
+        self._parameters_builders: dict[int, Callable[..., Expression]] = {}
+        self._version = -1
+
+    def _read_deserialisers(self) -> None:
+        """Build the tables of literal classes and expression builders from the registry."""
+        self._literal_classes = {}
+        self._list_builders = {}
+        self._parameters_builders = {}
+        deserialisers = registry.deserialisers()
+        self._version = registry.version
+        for name, deserialiser in deserialisers.items():
+            if type(deserialiser) is LiteralDictDeserialiser:
+                self._literal_classes[name] = deserialiser.expr_class  # type: ignore
+        for name, opcode in _OPCODES.items():
+            if name in _PARAMETERS:
+                self._parameters_builders[opcode] = _parameters_builder(
+                    name,
+                    deserialisers.get(name),
+                )
+            else:
+                self._list_builders[opcode] = _list_builder(name, deserialisers.get(name))
+
+    def serialise(self, expr: Expression) -> bytes:
+        """Serialise an expression into bytes.
+
+        Args:
+            expr: Expression to serialise.
+
+        Returns:
+            The expression serialised.
+        """
+        encoder = _Encoder()
+        encoder.expression(expr)
+        return encoder.to_bytes()
+
+    def parse(self, data: bytes) -> Expression:
+        """Parse bytes into an expression.
+
+        Args:
+            data: Serialised expression.
+
+        Returns:
+            Parsed expression.
+
+        Raises:
+            ParseException.
+        """
+        try:
+            expr = self._decode(data)
+        except (IndexError, struct.error) as exc:
+            raise ParseError("truncated binary serialised expression") from exc
+        except UnicodeDecodeError as exc:
+            raise ParseError(f"invalid string: {exc}") from exc
+        except ParseError:
+            raise
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # invalid values, like types, decimals, and offsets, or invalid expressions
+            raise ParseError(f"invalid binary serialised expression: {exc!r}") from exc
+        if self._interner is not None:
+            expr = self._interner.intern(expr)
+        return expr
+
+    def _decode(self, data: bytes) -> Expression:  # noqa: C901
+        """Build expression from its serialisation, with a stack of the built sub-expressions."""
+        if self._version != registry.version:
+            self._read_deserialisers()
+        strings, pos = _read_strings(data)
+        list_builders = self._list_builders
+        literal_classes = self._literal_classes
+        number_class = literal_classes.get("Decimal")
+        stack: list[Expression] = []
+        push = stack.append
+        end = len(data)
+        while pos < end:
+            tag = data[pos]
+            if tag >= _OPCODE_BASE:
+                # most counts fit in a byte
+                count = data[pos + 1]
+                if count < 0x80:
+                    pos += 2
+                else:
+                    count, pos = _read_varint(data, pos + 1)
+                build = list_builders.get(tag)
+                if build is not None:
+                    if count > len(stack):
+                        raise ParseError(f"missing sub-expressions at byte {pos}")
+                    start = len(stack) - count
+                    sub_expressions = stack[start:]
+                    del stack[start:]
+                    push(build(*sub_expressions))
+                    continue
+                build_parameters = self._parameters_builders.get(tag)
+                if build_parameters is None:
+                    raise ParseError(f"unknown opcode {tag:#04x} at byte {pos}")
+                minimum, maximum = _PARAMETER_COUNTS[tag]
+                if not minimum <= count <= maximum:
+                    raise ParseError(f"invalid number of parameters {count} at byte {pos}")
+                parameters = []
+                for _ in range(count):
+                    parameter, pos = _read_value(data, pos, strings)
+                    parameters.append(parameter)
+                push(build_parameters(*parameters))
+            elif tag == _NAMED:
+                index, pos = _read_varint(data, pos + 1)
+                value, pos = _read_value(data, pos, strings)
+                name = strings[index]
+                push(registry.deserialiser(name).deserialise({name: value}))  # type: ignore
+            elif tag == _DECIMAL and data[pos + 1] < 0x80 and data[pos + 2] < 0x80:
+                # most numbers are small, and many are integers
+                coefficient = data[pos + 1]
+                exponent = data[pos + 2]
+                pos += 3
+                if not exponent and not coefficient & 1:
+                    value = Decimal(coefficient >> 1)
+                else:
+                    sign = "-" if coefficient & 1 else ""
+                    value = Decimal(f"{sign}{coefficient >> 1}E{_unzigzag(exponent)}")
+                push(number_class(value) if number_class else self._literal(value))  # type: ignore
+            else:
+                value, pos = _read_value(data, pos, strings)
+                literal_class = literal_classes.get(value.__class__.__name__)
+                push(literal_class(value) if literal_class else self._literal(value))  # type: ignore
+
+        if len(stack) != 1:
+            raise ParseError(f"expected one expression, got {len(stack)}")
+        return stack[0]
+
+    def _literal(self, value: Any) -> Expression:
+        """Return literal expression of a value, built by its deserialiser."""
+        deserialiser = registry.deserialiser(value.__class__.__name__)
+        return deserialiser.deserialise(value)  # type: ignore
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from collections.abc import Callable
+from hashlib import blake2b
+from typing import Any, NamedTuple
+
+from expressions.expr.expr_base import Expression
+from expressions.memory import memory_usage
+from expressions.numeric import DECIMAL, NumericBackend
+from expressions.optimizer import optimize as optimize_expression
+from expressions.parser.json_parser import JsonParser
+from expressions.parser.parser import Parser
+
+
+class CacheStats(NamedTuple):
+    """Statistics of a parse cache."""
+
+    # lookups that found the parsed expression
+    hits: int
+    # lookups that parsed the expression
+    misses: int
+    # entries removed to keep the cache in its byte budget
+    evictions: int
+    # number of cached entries
+    entries: int
+    # estimated size in bytes of the cached entries
+    size: int
+
+
+class _Entry:
+    """Cached expression, with its compiled function once requested."""
+
+    __slots__ = ("expr", "function", "size")
+
+    def __init__(self, expr: Expression, size: int) -> None:
+        self.expr = expr
+        self.function: Callable | None = None
+        self.size = size
+
+
+def _function_size(function: Callable) -> int:
+    """Return estimated size in bytes of a compiled expression."""
+    code = function.__code__  # type: ignore
+    return sys.getsizeof(function) + sys.getsizeof(code) + sys.getsizeof(code.co_code)
+
+
+class ParseCache:
+    """Cache from serialised expressions to parsed, optimized, and compiled expressions.
+
+    Serialised expressions are identified by a digest of their text, so the text isn't kept in the
+    cache. The cache has two levels for every entry: the parsed expression, optimized if the cache
+    optimizes, and its compiled function, built only when it's requested.
+
+    The cache is bounded by an estimated size in bytes. When it's exceeded, the least recently used
+    entries are evicted. Expressions bigger than the whole budget are returned but not cached.
+    """
+
+    def __init__(
+        self,
+        parser: Parser[str] | None = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        optimize: bool = False,
+        numeric_backend: NumericBackend = DECIMAL,
+    ) -> None:
+        """Parse cache constructor.
+
+        Args:
+            parser: Parser of the serialised expressions. By default, a `JsonParser`.
+            max_bytes: Maximum estimated size in bytes of the cached entries.
+            optimize: Cache and return optimized expressions, instead of the parsed ones.
+            numeric_backend: Numeric backend of the optimized and compiled expressions.
+        """
+        self.parser = parser or JsonParser()
+        self.max_bytes = max_bytes
+        self.optimize = optimize
+        self.numeric_backend = numeric_backend
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._entries: OrderedDict[bytes, _Entry] = OrderedDict()
+
+    def parse(self, data: str) -> Expression:
+        """Return the expression of the serialised data, parsing it only if it's not cached.
+
+        Args:
+            data: Serialised expression.
+
+        Returns:
+            Parsed expression, optimized if the cache optimizes. Cached expressions are shared, so
+            they must not be modified.
+
+        Raises:
+            ParseError.
+        """
+        return self._entry(self._key(data), data).expr
+
+    def compile(self, data: str) -> Callable[[Any], Any]:
+        """Return the compiled expression of the serialised data, compiling it only once.
+
+        Args:
+            data: Serialised expression.
+
+        Returns:
+            Function evaluating the expression in the context given as its only argument.
+
+        Raises:
+            ParseError.
+        """
+        key = self._key(data)
+        entry = self._entry(key, data)
+        if entry.function is None:
+            entry.function = entry.expr.compile(self.numeric_backend)
+            function_size = _function_size(entry.function)
+            entry.size += function_size
+            if self._entries.get(key) is entry:
+                self.size += function_size
+                self._evict()
+        return entry.function
+
+    def stats(self) -> CacheStats:
+        """Return statistics of the cache."""
+        return CacheStats(self.hits, self.misses, self.evictions, len(self._entries), self.size)
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        """Return number of cached entries."""
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        """Return string representation of this instance."""
+        return (
+            f"{self.__class__.__name__}(hits={self.hits}, misses={self.misses}, "
+            f"evictions={self.evictions}, size={self.size}, max_bytes={self.max_bytes})"
+        )
+
+    def _key(self, data: str) -> bytes:
+        # optimized and compiled expressions depend on the numeric backend
+        person = self.numeric_backend.name.encode("utf-8")
+        return blake2b(data.encode("utf-8"), digest_size=16, person=person).digest()
+
+    def _entry(self, key: bytes, data: str) -> _Entry:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        expr = self.parser.parse(data)
+        if self.optimize:
+            expr = optimize_expression(expr, self.numeric_backend)
+        entry = _Entry(expr, memory_usage(expr).size)
+        if entry.size <= self.max_bytes:
+            self._entries[key] = entry
+            self.size += entry.size
+            self._evict()
+        return entry
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache is within its byte budget."""
+        while self.size > self.max_bytes:
+            _, entry = self._entries.popitem(last=False)
+            self.size -= entry.size
+            self.evictions += 1
@@ -1,11 +1,20 @@
 import json
+from collections.abc import Callable
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Any
 
 from expressions import Expression
+from expressions.exceptions import ParseError
+from expressions.expr.interning import ExpressionInterner
 from expressions.parser.parser import Parser
 from expressions.parser.primitive_parser import PrimitiveParser
+from expressions.serialiser.dict_serialiser import (
+    HomogeneousListDictDeserialiser,
+    LiteralDictDeserialiser,
+    MappeableDeserialiser,
+    registry,
+)
 
 JsonPrimitive = None | bool | int | float | Decimal | str | dict
 
@@ -23,9 +32,15 @@ class JsonParser(Parser[str]):
 
     """
 
-    def __init__(self):
-        """Constructor."""
-        self._dict_parser = PrimitiveParser()
+    def __init__(self, interner: ExpressionInterner | None = None) -> None:
+        """Constructor.
+
+        Args:
+            interner: Optional registry used to intern parsed expressions.
+        """
+        self._interner = interner
+        self._dict_parser = PrimitiveParser(interner)
+        self._decoder: ExpressionDecoder | None = None
 
     def serialise(self, expr: Expression) -> str:
         """Serialise an expression into a JSON string.
@@ -54,6 +69,31 @@ class JsonParser(Parser[str]):
         then the dictionary is converted in an instance of {classname}. Currently, only
         `bignumber`, `datetime` and `timedelta`  are recognised.
 
+        Args:
+            data: JSON string.
+
+        Returns:
+            Parsed expression.
+
+        Raises:
+            ParseException.
+        """
+        if self._decoder is None:
+            self._decoder = ExpressionDecoder()
+        try:
+            expr = self._decoder.decode(data)
+        except _UnknownDeserialiserError:
+            return self.parse_primitives(data)
+        if self._interner is not None:
+            expr = self._interner.intern(expr)
+        return expr
+
+    def parse_primitives(self, data: str) -> Expression:
+        """Parse JSON string into python primitives, and then the primitives into an expression.
+
+        This is slower than `parse()`, that builds the expression while the JSON string is decoded,
+        but supports any deserialiser registered for `PrimitiveParser`.
+
         Args:
             data: JSON string.
 
@@ -73,6 +113,130 @@ class JsonParser(Parser[str]):
         return expr
 
 
+class _UnknownDeserialiserError(Exception):
+    """Raised when the single pass decoder can't decode a string, parsed then in two passes."""
+
+
+def _contains_expression(value: Any) -> bool:
+    """Return whether a decoded value is, or contains, an expression."""
+    if isinstance(value, Expression):
+        return True
+    if isinstance(value, dict):
+        return any(_contains_expression(sub_value) for sub_value in value.values())
+    if isinstance(value, list):
+        return any(_contains_expression(sub_value) for sub_value in value)
+    return False
+
+
+class ExpressionDecoder:
+    """Decoder building expressions from a JSON string in a single pass.
+
+    Expressions are built by the JSON decoder as soon as every JSON object is decoded, instead of
+    decoding python primitives first and walking them again. Sub-expressions are built before the
+    expressions containing them, so expressions are built bottom-up.
+
+    The deserialisers registered for `PrimitiveParser` are read from the registry into a table from
+    expression name to expression builder, read again when deserialisers are registered later.
+
+    JSON objects with a single key named like an expression are decoded as expressions before it's
+    known whether they are in the position of an expression. When one ends up inside the parameters
+    of an expression, like the default value of a variable, the string is parsed with
+    `PrimitiveParser` instead, so it's kept as a dictionary.
+    """
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self._literal_classes: dict[str, type[Expression]] = {}
+        self._builders: dict[str, Callable[[Any], Expression]] = {}
+        self._version = -1
+        self._json_decoder = json.JSONDecoder(
+            parse_int=Decimal,
+            parse_float=Decimal,
+            object_hook=self._object_hook,
+        )
+
+    def _read_deserialisers(self) -> None:
+        """Build the tables of literal classes and expression builders from the registry."""
+        self._literal_classes = {}
+        self._builders = {}
+        deserialisers = registry.deserialisers()
+        self._version = registry.version
+        for name, deserialiser in deserialisers.items():
+            # subclasses of the deserialisers may deserialise differently, so they are unknown
+            if type(deserialiser) is LiteralDictDeserialiser:
+                self._literal_classes[name] = deserialiser.expr_class  # type: ignore
+            elif type(deserialiser) is HomogeneousListDictDeserialiser:
+                self._builders[name] = self._homogeneous_list_builder(deserialiser.expr_class)
+            elif type(deserialiser) is MappeableDeserialiser:
+                self._builders[name] = self._mappeable_builder(deserialiser.expr_class)
+
+    def decode(self, data: str) -> Expression:
+        """Decode JSON string into an expression.
+
+        Args:
+            data: JSON string.
+
+        Returns:
+            Decoded expression.
+
+        Raises:
+            ParseError.
+        """
+        if self._version != registry.version:
+            self._read_deserialisers()
+        return self._expression(self._json_decoder.decode(data))
+
+    def _object_hook(self, obj: dict) -> Any:
+        if len(obj) == 1:
+            ((name, value),) = obj.items()
+            builder = self._builders.get(name)
+            if builder is not None:
+                try:
+                    return builder(value)
+                except (TypeError, ParseError):
+                    # it may be a parameter, and it's invalid as an expression otherwise
+                    return obj
+            if registry.query_deserialiser(name) is not None:
+                raise _UnknownDeserialiserError(name)
+        return expression_dict_decoder(obj)
+
+    def _expression(self, value: Any) -> Expression:
+        """Return expression of a decoded value, wrapping primitive values into literals."""
+        literal_class = self._literal_classes.get(value.__class__.__name__)
+        if literal_class is not None:
+            return literal_class(value)  # type: ignore
+        if isinstance(value, Expression):
+            return value
+        raise ParseError(f"can't parse {value!r} as an expression")
+
+    def _homogeneous_list_builder(self, klass: type) -> Callable[[Any], Expression]:
+        expression = self._expression
+
+        def build(value: Any) -> Expression:
+            if not isinstance(value, list):
+                raise ParseError(f"deserialiser expected list, got {type(value)}")
+            return klass(*[expression(sub_value) for sub_value in value])  # type: ignore
+
+        return build
+
+    def _mappeable_builder(self, klass: type) -> Callable[[Any], Expression]:
+        expression = self._expression
+        sub_expression_names = klass.sub_expression_names  # type: ignore
+
+        def build(value: Any) -> Expression:
+            if not isinstance(value, dict):
+                raise ParseError(f"deserialiser expected dict, got {type(value)}")
+            for key, sub_value in value.items():
+                if key in sub_expression_names:
+                    value[key] = expression(sub_value)
+                elif _contains_expression(sub_value):
+                    # a parameter decoded as an expression, parsed again with `PrimitiveParser`
+                    raise _UnknownDeserialiserError(key)
+            return klass(**value)  # type: ignore
+
+        return build
+
+
 class JSONExpressionEncoder(json.JSONEncoder):
     """Json encoder for python primitives representing expressions.
 
@@ -161,7 +325,8 @@ def dict_to_type(obj: dict) -> type:  # type: ignore  # pylint: disable=R0911
     type_name: str | None = obj.get("__value__", None)
     args: list[dict] | None = obj.get("__args__", None)
     match type_name, args:
-        case "null", _:
+        # types are encoded with their class name
+        case "null" | "NoneType", _:
             return type(None)
         case "bool", _:
             return bool
@@ -169,7 +334,7 @@ def dict_to_type(obj: dict) -> type:  # type: ignore  # pylint: disable=R0911
             return int
         case "float", _:
             return float
-        case "bignum", _:
+        case "bignum" | "Decimal", _:
             return Decimal
         case "str", _:
             return str
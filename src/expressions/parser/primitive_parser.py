@@ -1,6 +1,5 @@
-# import dict_serialiser_init to initialise all expr<->dict serialisers and deserialisers
-import expressions.serialiser.dict_serialiser_init  # noqa: F401  # pylint: disable=unused-import
 from expressions.expr.expr_base import Expression
+from expressions.expr.interning import ExpressionInterner
 from expressions.parser.parser import Parser
 from expressions.serialiser.dict_serialiser import (
     PrimitiveType,
@@ -10,7 +9,19 @@ from expressions.serialiser.dict_serialiser import (
 
 
 class PrimitiveParser(Parser[PrimitiveType]):
-    """Parser from and to python literal primitive data types."""
+    """Parser from and to python literal primitive data types.
+
+    If the parser has an expression interner, parsed expressions are interned, so equal
+    sub-expressions of all the parsed expressions are shared.
+    """
+
+    def __init__(self, interner: ExpressionInterner | None = None) -> None:
+        """Constructor.
+
+        Args:
+            interner: Optional registry used to intern parsed expressions.
+        """
+        self._interner = interner
 
     def serialise(self, expr: Expression) -> PrimitiveType:
         """Serialise an expression into python primitive types.
@@ -39,4 +50,6 @@ class PrimitiveParser(Parser[PrimitiveType]):
         """
         deserialiser = deserialiser_from_instance(data)
         expr = deserialiser.deserialise(data)  # type: ignore
+        if self._interner is not None:
+            expr = self._interner.intern(expr)
         return expr
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import struct
+from collections.abc import Callable, Iterable, Iterator
+from functools import partial
+from typing import IO, Any
+
+from expressions.chunking import chunks, map_chunks
+from expressions.exceptions import ParseError
+from expressions.expr.expr_base import Expression
+from expressions.expr.interning import ExpressionInterner
+from expressions.parser.binary_parser import BinaryParser
+from expressions.parser.json_parser import JsonParser
+from expressions.parser.parser import Parser
+
+# one expression serialised as JSON per line, in a text file
+NDJSON = "ndjson"
+# every expression serialised as UTF-8 JSON, preceded by its length in 4 bytes (big endian), in a
+# binary file
+LENGTH_PREFIXED = "length-prefixed"
+# every expression serialised by `BinaryParser`, preceded by its length in 4 bytes (big endian), in
+# a binary file
+BINARY = "binary"
+
+_LENGTH = struct.Struct(">I")
+
+# parsers of the worker processes, by format
+_worker_parsers: dict[str, Parser] = {}
+
+
+def _read_ndjson(file: IO[str]) -> Iterator[str]:
+    for line in file:
+        if line.strip():
+            yield line
+
+
+def _read_binary(file: IO[bytes]) -> Iterator[bytes]:
+    while header := file.read(_LENGTH.size):
+        if len(header) < _LENGTH.size:
+            raise ParseError("truncated length prefix")
+        (length,) = _LENGTH.unpack(header)
+        data = file.read(length)
+        if len(data) < length:
+            raise ParseError(f"truncated expression, expected {length} bytes, got {len(data)}")
+        yield data
+
+
+def _read_length_prefixed(file: IO[bytes]) -> Iterator[str]:
+    for data in _read_binary(file):
+        yield data.decode("utf-8")
+
+
+_READERS: dict[str, Callable[[IO[Any]], Iterator[Any]]] = {
+    NDJSON: _read_ndjson,
+    LENGTH_PREFIXED: _read_length_prefixed,
+    BINARY: _read_binary,
+}
+
+
+def _parser(format: str, interner: ExpressionInterner | None = None) -> Parser:  # noqa: A002
+    # pylint: disable=redefined-builtin
+    return BinaryParser(interner) if format == BINARY else JsonParser(interner)
+
+
+def _parse_chunk(format: str, chunk: list[Any]) -> list[Expression]:  # noqa: A002
+    """Parse a chunk of serialised expressions in a worker process."""
+    # pylint: disable=redefined-builtin
+    parser = _worker_parsers.get(format)
+    if parser is None:
+        parser = _worker_parsers[format] = _parser(format)
+    return [parser.parse(data) for data in chunk]
+
+
+def load_many(
+    file: IO[Any],
+    format: str = NDJSON,  # noqa: A002  # pylint: disable=redefined-builtin
+    interner: ExpressionInterner | None = None,
+    workers: int | None = 0,
+    chunksize: int = 1000,
+) -> Iterator[Expression]:
+    """Return lazy iterator over the expressions serialised in a file.
+
+    Expressions are read and parsed one at a time, so memory use doesn't depend on the size of the
+    file. With workers, expressions are read in chunks of `chunksize` expressions, parsed in a pool
+    of processes, and returned in order. At most two chunks per worker are pending at any time.
+
+    Args:
+        file: Text file for `NDJSON`, or binary file for `LENGTH_PREFIXED` and `BINARY`.
+        format: Format of the file, `NDJSON`, `LENGTH_PREFIXED` or `BINARY`.
+        interner: Optional registry used to intern parsed expressions.
+        workers: Number of worker processes, or None for the number of CPUs. By default, expressions
+            are parsed in this process.
+        chunksize: Number of expressions sent to a worker at once.
+
+    Yields:
+        Parsed expressions, in the order of the file.
+
+    Raises:
+        ParseError if the file is truncated or an expression is invalid.
+    """
+    if format not in _READERS:
+        raise ValueError(f"unknown format {format!r}")
+    serialised = _READERS[format](file)
+    if workers == 0:
+        parser = _parser(format, interner)
+        for data in serialised:
+            yield parser.parse(data)
+        return
+
+    parse_chunk = partial(_parse_chunk, format)
+    for expressions in map_chunks(parse_chunk, chunks(serialised, chunksize), workers):
+        for expr in expressions:
+            yield expr if interner is None else interner.intern(expr)
+
+
+def dump_many(
+    expressions: Iterable[Expression],
+    file: IO[Any],
+    format: str = NDJSON,  # noqa: A002  # pylint: disable=redefined-builtin
+) -> int:
+    """Serialise expressions into a file, one at a time.
+
+    Args:
+        expressions: Expressions to serialise.
+        file: Text file for `NDJSON`, or binary file for `LENGTH_PREFIXED` and `BINARY`.
+        format: Format of the file, `NDJSON`, `LENGTH_PREFIXED` or `BINARY`.
+
+    Returns:
+        Number of expressions written.
+    """
+    if format not in _READERS:
+        raise ValueError(f"unknown format {format!r}")
+    parser = _parser(format)
+    count = 0
+    for expr in expressions:
+        data = parser.serialise(expr)
+        if format == NDJSON:
+            file.write(data + "\n")
+        else:
+            encoded = data if format == BINARY else data.encode("utf-8")
+            file.write(_LENGTH.pack(len(encoded)) + encoded)
+        count += 1
+    return count
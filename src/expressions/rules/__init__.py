@@ -0,0 +1,6 @@
+# flake8: noqa=F401
+from .equality_index import EqualityIndex, equality_condition
+from .indexed_ruleset import IndexedRuleSet
+from .interval_index import Interval, IntervalIndex, range_conditions
+from .rule_index import RuleIndex, conjuncts, convert_literal
+from .ruleset import BoundRuleSet, RuleId, RuleSet, RuleSetCompiler, SlotRuleSetCompiler
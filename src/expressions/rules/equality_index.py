@@ -0,0 +1,123 @@
+from collections import defaultdict
+from collections.abc import Hashable
+from typing import Any
+
+from expressions.context import Context
+from expressions.exceptions import ExpressionEvaluationError
+from expressions.expr.comparison import Equal
+from expressions.expr.expr_base import Expression
+from expressions.expr.variable import Variable, resolve_variable
+from expressions.numeric import DECIMAL, NumericBackend, numeric_backend
+from expressions.rules.rule_index import RuleIndex, conjuncts, convert_literal
+from expressions.rules.ruleset import RuleId, variable_key
+
+
+def equality_condition(expr: Expression) -> tuple[Variable, Any] | None:
+    """Return variable and value compared by `Equal(Variable, literal)` expressions.
+
+    Args:
+        expr: Expression.
+
+    Returns:
+        (variable, literal value) if the expression compares a variable with a hashable literal,
+        None in other case.
+    """
+    if type(expr) is not Equal:
+        return None
+    left, right = expr.sub_expressions()
+    if isinstance(right, Variable):
+        left, right = right, left
+    if not isinstance(left, Variable) or not right.is_literal:
+        return None
+    value = right.value  # type: ignore
+    if not isinstance(value, Hashable):
+        return None
+    return left, value
+
+
+class EqualityIndex(RuleIndex):
+    """Inverted index of rules with equality conditions.
+
+    Rules requiring a variable to be equal to a literal value, `Equal(Variable, literal)` or a
+    conjunction including it, are indexed by the variable and the literal value. Given a context,
+    every indexed variable is resolved once and only the rules indexed by its value are candidates,
+    so finding the candidates takes constant time on the number of rules.
+
+    Literal numbers are converted into the numbers of the numeric backend of the context, like
+    when rules are evaluated, and rules whose literals can't be converted are always candidates.
+    Rules reading variables that can't be resolved are candidates too, so their errors are raised.
+    """
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self._variables: dict[tuple, Variable] = {}
+        self._rules: dict[tuple, defaultdict[Any, set[RuleId]]] = {}
+        # (rules by variable and literal converted into the backend, rules whose literal can't be
+        # converted) by numeric backend, built in the first lookup with the backend
+        self._converted: dict[
+            NumericBackend,
+            tuple[dict[tuple, defaultdict[Any, set[RuleId]]], set[RuleId]],
+        ] = {DECIMAL: (self._rules, set())}
+
+    def add(self, rule_id: RuleId, rule: Expression) -> bool:
+        """Add rule to the index, if it has an equality condition."""
+        for condition in conjuncts(rule):
+            equality = equality_condition(condition)
+            if equality is not None:
+                variable, value = equality
+                key = variable_key(variable)
+                self._variables.setdefault(key, variable)
+                self._rules.setdefault(key, defaultdict(set))[value].add(rule_id)
+                self._converted = {DECIMAL: (self._rules, set())}
+                return True
+        return False
+
+    def candidates(self, context: Context) -> set[RuleId]:
+        """Return ids of indexed rules whose equality condition holds in the given context."""
+        all_rules, unconverted = self._backend_rules(numeric_backend(context))
+        candidates = set(unconverted)
+        for key, variable in self._variables.items():
+            rules = all_rules[key]
+            try:
+                value = resolve_variable(
+                    context,
+                    variable.name,
+                    variable.return_type,
+                    variable.default,
+                )
+            except Exception:  # pylint: disable=broad-exception-caught
+                # rules reading the variable raise when evaluated
+                for rule_ids in rules.values():
+                    candidates.update(rule_ids)
+                continue
+            if isinstance(value, Hashable):
+                candidates.update(rules.get(value, ()))
+            else:
+                # unhashable values can still be equal to some literal
+                for literal, rule_ids in rules.items():
+                    if literal == value:
+                        candidates.update(rule_ids)
+        return candidates
+
+    def _backend_rules(
+        self,
+        backend: NumericBackend,
+    ) -> tuple[dict[tuple, defaultdict[Any, set[RuleId]]], set[RuleId]]:
+        """Return rules by variable and converted literal, and rules with unconverted literals."""
+        converted = self._converted.get(backend)
+        if converted is None:
+            all_rules: dict[tuple, defaultdict[Any, set[RuleId]]] = {}
+            unconverted: set[RuleId] = set()
+            for key, rules in self._rules.items():
+                backend_rules = all_rules[key] = defaultdict(set)
+                for literal, rule_ids in rules.items():
+                    try:
+                        backend_rules[convert_literal(literal, backend)].update(rule_ids)
+                    except ExpressionEvaluationError:
+                        unconverted.update(rule_ids)
+            converted = self._converted[backend] = (all_rules, unconverted)
+        return converted
+
+    def __len__(self) -> int:
+        """Return number of indexed rules."""
+        return sum(len(rule_ids) for rules in self._rules.values() for rule_ids in rules.values())
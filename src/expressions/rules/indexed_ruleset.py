@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+
+from expressions.compiler.python_compiler import CompiledExpression, PythonCompiler
+from expressions.context import Context
+from expressions.exceptions import ContextValuePendingError
+from expressions.expr.expr_base import Expression
+from expressions.numeric import DECIMAL, NumericBackend, numeric_backend
+from expressions.rules.equality_index import EqualityIndex
+from expressions.rules.interval_index import IntervalIndex
+from expressions.rules.rule_index import RuleIndex
+from expressions.rules.ruleset import RuleId
+
+
+class IndexedRuleSet:
+    """Collection of rules where only the rules that can match a context are evaluated.
+
+    Every rule is added to the first index accepting it, and rules not accepted by any index are
+    always evaluated. Given a context, the indexes return the candidate rules that can match, and
+    only those are evaluated, each one compiled into a python function for the numeric backend of
+    the context. With the default indexes, rules comparing a variable with a literal are only
+    evaluated for contexts where the variable has that value (`EqualityIndex`), or a value in the
+    range of the rule (`IntervalIndex`).
+
+    Rules that are not candidates are not evaluated, so their errors are not reported.
+    """
+
+    def __init__(
+        self,
+        rules: Mapping[RuleId, Expression] | Iterable[tuple[RuleId, Expression]],
+        indexes: Sequence[RuleIndex] | None = None,
+    ):
+        """Indexed rule set constructor.
+
+        Args:
+            rules: Mapping from rule id to rule, or iterable of (rule id, rule) pairs.
+            indexes: Empty indexes where rules are added, tried in order. By default, rules are
+                indexed by their equality conditions, or else by their range conditions.
+        """
+        self._rules: dict[RuleId, Expression] = dict(rules)
+        self._indexes = list(indexes) if indexes is not None else [EqualityIndex(), IntervalIndex()]
+        self._positions = {rule_id: position for position, rule_id in enumerate(self._rules)}
+        self._unindexed: set[RuleId] = set()
+        self._compiled: dict[NumericBackend, dict[RuleId, CompiledExpression]] = {}
+        for rule_id, rule in self._rules.items():
+            if not any(index.add(rule_id, rule) for index in self._indexes):
+                self._unindexed.add(rule_id)
+        self._compile(DECIMAL)
+
+    @property
+    def rules(self) -> Mapping[RuleId, Expression]:
+        """Return mapping from rule id to rule."""
+        return self._rules
+
+    @property
+    def indexes(self) -> Sequence[RuleIndex]:
+        """Return indexes of the rules."""
+        return tuple(self._indexes)
+
+    def candidates(self, context: Context) -> list[RuleId]:
+        """Return ids of rules that can match in the given context.
+
+        Args:
+            context: Evaluation context.
+
+        Returns:
+            Ids of candidate rules, in the order the rules were given.
+        """
+        candidates = set(self._unindexed)
+        for index in self._indexes:
+            candidates.update(index.candidates(context))
+        return sorted(candidates, key=self._positions.__getitem__)
+
+    def match(
+        self,
+        context: Context,
+        errors: dict[RuleId, Exception] | None = None,
+    ) -> list[RuleId]:
+        """Return ids of rules that match in the given context.
+
+        Args:
+            context: Evaluation context.
+            errors: Optional dictionary where errors raised by candidate rules are stored by id.
+
+        Returns:
+            Ids of rules that evaluate to a true value, in the order the rules were given. Rules
+            raising any exception don't match.
+
+        Raises:
+            ContextValuePendingError if a rule reads a variable whose asynchronous provider hasn't
+            been awaited.
+        """
+        backend = numeric_backend(context)
+        compiled = self._compiled.get(backend) or self._compile(backend)
+        matched = []
+        for rule_id in self.candidates(context):
+            try:
+                if compiled[rule_id](context):
+                    matched.append(rule_id)
+            except ContextValuePendingError:
+                raise
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                if errors is not None:
+                    errors[rule_id] = exc
+        return matched
+
+    def _compile(self, backend: NumericBackend) -> dict[RuleId, CompiledExpression]:
+        """Return rules compiled for the given numeric backend, by rule id."""
+        compiler = PythonCompiler(backend)
+        compiled = self._compiled[backend] = {}
+        for rule_id, rule in self._rules.items():
+            try:
+                compiled[rule_id] = compiler.compile(rule)
+            except Exception:  # pylint: disable=broad-exception-caught
+                # rules that can't be compiled are evaluated
+                compiled[rule_id] = rule.evaluate
+        return compiled
+
+    def __len__(self) -> int:
+        """Return number of rules."""
+        return len(self._rules)
+
+    def __repr__(self) -> str:
+        """Return string representation of this instance."""
+        return (
+            f"{self.__class__.__name__}({len(self._rules)} rules, "
+            f"{len(self._unindexed)} unindexed)"
+        )
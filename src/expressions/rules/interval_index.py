@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+from expressions.context import Context
+from expressions.exceptions import ExpressionEvaluationError
+from expressions.expr.comparison import (
+    GreaterThan,
+    GreaterThanOrEqual,
+    LessThan,
+    LessThanOrEqual,
+)
+from expressions.expr.expr_base import Expression
+from expressions.expr.variable import Variable, resolve_variable
+from expressions.numeric import NumericBackend, numeric_backend
+from expressions.rules.rule_index import RuleIndex, conjuncts, convert_literal
+from expressions.rules.ruleset import RuleId, variable_key
+
+# types of the values that can be indexed by range
+_RANGE_TYPES = (Decimal, datetime, timedelta)
+
+
+def _is_nan(value: Any) -> bool:
+    """Return True if the value is a NaN number, that can't be compared with the bounds."""
+    if isinstance(value, Decimal):
+        return value.is_nan()
+    return isinstance(value, float) and math.isnan(value)
+
+
+# (bound, inclusive) set on a variable compared with a literal, for every comparison and side of
+# the variable
+_VARIABLE_LEFT_BOUNDS: dict[type[Expression], tuple[str, bool]] = {
+    GreaterThan: ("lower", False),
+    GreaterThanOrEqual: ("lower", True),
+    LessThan: ("upper", False),
+    LessThanOrEqual: ("upper", True),
+}
+_VARIABLE_RIGHT_BOUNDS: dict[type[Expression], tuple[str, bool]] = {
+    GreaterThan: ("upper", False),
+    GreaterThanOrEqual: ("upper", True),
+    LessThan: ("lower", False),
+    LessThanOrEqual: ("lower", True),
+}
+
+
+class Interval:
+    """Interval of values, with optional and inclusive or exclusive bounds."""
+
+    __slots__ = ("lower", "upper", "lower_inclusive", "upper_inclusive")
+
+    def __init__(
+        self,
+        lower: Any = None,
+        upper: Any = None,
+        lower_inclusive: bool = True,
+        upper_inclusive: bool = True,
+    ) -> None:
+        """Interval constructor.
+
+        Args:
+            lower: Lower bound, or None if the interval has no lower bound.
+            upper: Upper bound, or None if the interval has no upper bound.
+            lower_inclusive: True if the lower bound belongs to the interval.
+            upper_inclusive: True if the upper bound belongs to the interval.
+        """
+        self.lower = lower
+        self.upper = upper
+        self.lower_inclusive = lower_inclusive
+        self.upper_inclusive = upper_inclusive
+
+    def restrict(self, bound: str, value: Any, inclusive: bool) -> None:
+        """Restrict interval with a new lower or upper bound.
+
+        Args:
+            bound: "lower" or "upper".
+            value: Value of the bound.
+            inclusive: True if the value belongs to the interval.
+        """
+        current = getattr(self, bound)
+        current_inclusive = getattr(self, f"{bound}_inclusive")
+        if current is None or (value > current if bound == "lower" else value < current):
+            setattr(self, bound, value)
+            setattr(self, f"{bound}_inclusive", inclusive)
+        elif value == current:
+            setattr(self, f"{bound}_inclusive", current_inclusive and inclusive)
+
+    def is_empty(self) -> bool:
+        """Return True if no value belongs to the interval."""
+        if self.lower is None or self.upper is None:
+            return False
+        if self.lower == self.upper:
+            return not (self.lower_inclusive and self.upper_inclusive)
+        return bool(self.lower > self.upper)
+
+    def contains(self, value: Any) -> bool:
+        """Return True if value belongs to the interval."""
+        if self.lower is not None and (
+            value < self.lower or (value == self.lower and not self.lower_inclusive)
+        ):
+            return False
+        if self.upper is not None and (
+            value > self.upper or (value == self.upper and not self.upper_inclusive)
+        ):
+            return False
+        return True
+
+    def __repr__(self) -> str:
+        """Return string representation of this instance."""
+        lower = (
+            "(-inf" if self.lower is None else f"{'[' if self.lower_inclusive else '('}{self.lower}"
+        )
+        upper = (
+            "inf)" if self.upper is None else f"{self.upper}{']' if self.upper_inclusive else ')'}"
+        )
+        return f"{lower}, {upper}"
+
+
+def range_conditions(expr: Expression) -> Iterator[tuple[Variable, str, Any, bool]]:
+    """Yield the bounds set on variables by the conditions of the expression.
+
+    Args:
+        expr: Expression.
+
+    Yields:
+        (variable, "lower" or "upper", value, inclusive) for every condition of the expression
+        comparing a variable with a literal number, datetime or timedelta.
+    """
+    for condition in conjuncts(expr):
+        if type(condition) not in _VARIABLE_LEFT_BOUNDS:
+            continue
+        left, right = condition.sub_expressions()
+        if isinstance(left, Variable) and right.is_literal:
+            variable, literal, bounds = left, right, _VARIABLE_LEFT_BOUNDS
+        elif isinstance(right, Variable) and left.is_literal:
+            variable, literal, bounds = right, left, _VARIABLE_RIGHT_BOUNDS
+        else:
+            continue
+        value = literal.value  # type: ignore
+        if isinstance(value, _RANGE_TYPES):
+            bound, inclusive = bounds[type(condition)]
+            yield variable, bound, value, inclusive
+
+
+def _convert_interval(interval: Interval, backend: NumericBackend) -> Interval:
+    """Return interval with its bounds converted into the numbers of a numeric backend."""
+    return Interval(
+        None if interval.lower is None else convert_literal(interval.lower, backend),
+        None if interval.upper is None else convert_literal(interval.upper, backend),
+        interval.lower_inclusive,
+        interval.upper_inclusive,
+    )
+
+
+def _any_bound(interval: Interval) -> Any:
+    """Return lower bound of interval, or its upper bound if it has no lower bound."""
+    return interval.upper if interval.lower is None else interval.lower
+
+
+class _IntervalNode:
+    """Node of a centered interval tree.
+
+    The node keeps the intervals containing its center, sorted by their lower and upper bounds, and
+    the intervals below and above the center are kept in its left and right subtrees.
+    """
+
+    __slots__ = ("center", "by_lower", "by_upper", "left", "right")
+
+    def __init__(self, entries: list[tuple[Interval, RuleId]]) -> None:
+        """Build tree with the given (interval, rule id) entries, which must not be empty."""
+        endpoints = sorted(
+            endpoint
+            for interval, _ in entries
+            for endpoint in (interval.lower, interval.upper)
+            if endpoint is not None
+        )
+        self.center = endpoints[len(endpoints) // 2]
+        left: list[tuple[Interval, RuleId]] = []
+        right: list[tuple[Interval, RuleId]] = []
+        here: list[tuple[Interval, RuleId]] = []
+        for entry in entries:
+            interval = entry[0]
+            if interval.upper is not None and interval.upper < self.center:
+                left.append(entry)
+            elif interval.lower is not None and interval.lower > self.center:
+                right.append(entry)
+            else:
+                here.append(entry)
+        # unbounded intervals go first, so lookups stop on the first bound not containing a value
+        self.by_lower = sorted(here, key=lambda e: (e[0].lower is not None, e[0].lower))
+        self.by_upper = sorted(here, key=lambda e: (e[0].upper is None, e[0].upper))
+        self.by_upper.reverse()
+        self.left = _IntervalNode(left) if left else None
+        self.right = _IntervalNode(right) if right else None
+
+    def stab(self, value: Any, rule_ids: set[RuleId]) -> None:
+        """Add to rule_ids the ids of rules whose intervals contain the value."""
+        node: _IntervalNode | None = self
+        while node is not None:
+            if value < node.center:
+                for interval, rule_id in node.by_lower:
+                    if interval.lower is not None and interval.lower > value:
+                        break
+                    if interval.contains(value):
+                        rule_ids.add(rule_id)
+                node = node.left
+            elif value > node.center:
+                for interval, rule_id in node.by_upper:
+                    if interval.upper is not None and interval.upper < value:
+                        break
+                    if interval.contains(value):
+                        rule_ids.add(rule_id)
+                node = node.right
+            else:
+                rule_ids.update(
+                    rule_id for interval, rule_id in node.by_lower if interval.contains(value)
+                )
+                node = None
+
+
+class IntervalIndex(RuleIndex):
+    """Index of rules with range conditions.
+
+    Rules requiring a variable to be in a range, with comparisons between the variable and literal
+    numbers, datetimes or timedeltas, are indexed by the variable and the interval given by the
+    intersection of all their bounds on it. Every indexed variable keeps a centered interval tree,
+    so given a context, the rules whose intervals contain the value of the variable are found in
+    logarithmic time on the number of rules.
+
+    Bounds are converted into the numbers of the numeric backend of the context, like when rules
+    are evaluated, with a tree per backend. Rules whose bounds can't be converted, and rules on
+    variables that can't be resolved or whose values, like NaN, can't be compared with the bounds,
+    are always candidates, so their errors are raised.
+    Rules with empty intervals never match, so they are never candidates otherwise.
+    """
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self._variables: dict[tuple, Variable] = {}
+        self._entries: dict[tuple, list[tuple[Interval, RuleId]]] = {}
+        # (trees by variable, rules whose bounds can't be converted) by numeric backend, built in
+        # the first lookup with the backend
+        self._trees: dict[NumericBackend, tuple[dict[tuple, _IntervalNode], set[RuleId]]] = {}
+        self._size = 0
+
+    def add(self, rule_id: RuleId, rule: Expression) -> bool:
+        """Add rule to the index, if it has range conditions.
+
+        Rules with range conditions on more than one variable are indexed by the first one.
+        """
+        intervals: dict[tuple, Interval] = {}
+        variables: dict[tuple, Variable] = {}
+        try:
+            for variable, bound, value, inclusive in range_conditions(rule):
+                if _is_nan(value):
+                    # rules comparing with NaN are evaluated, as they never match or raise
+                    return False
+                key = variable_key(variable)
+                if key not in intervals:
+                    if intervals:
+                        continue
+                    intervals[key] = Interval()
+                    variables[key] = variable
+                intervals[key].restrict(bound, value, inclusive)
+            if not intervals:
+                return False
+            ((key, interval),) = intervals.items()
+            interval.is_empty()
+            entries = self._entries.get(key)
+            if entries:
+                # the bounds of a tree are compared with each other when it's built
+                _ = _any_bound(interval) < _any_bound(entries[0][0])
+        except (TypeError, ArithmeticError):
+            # bounds that can't be compared, like naive and aware datetimes
+            return False
+        self._size += 1
+        self._variables.setdefault(key, variables[key])
+        self._entries.setdefault(key, []).append((interval, rule_id))
+        # trees are rebuilt in the next lookup
+        self._trees.clear()
+        return True
+
+    def candidates(self, context: Context) -> set[RuleId]:
+        """Return ids of indexed rules whose ranges contain the values of the context."""
+        trees, unconverted = self._backend_trees(numeric_backend(context))
+        candidates = set(unconverted)
+        for key, entries in self._entries.items():
+            variable = self._variables[key]
+            try:
+                value = resolve_variable(
+                    context,
+                    variable.name,
+                    variable.return_type,
+                    variable.default,
+                )
+            except Exception:  # pylint: disable=broad-exception-caught
+                # rules reading the variable raise when evaluated
+                candidates.update(rule_id for _, rule_id in entries)
+                continue
+            tree = trees.get(key)
+            if tree is None:
+                continue
+            if not _is_nan(value):
+                found: set[RuleId] = set()
+                try:
+                    tree.stab(value, found)
+                except (TypeError, ArithmeticError):
+                    pass
+                else:
+                    candidates.update(found)
+                    continue
+            # NaN, and values that can't be compared with the bounds, are left to the rules
+            candidates.update(rule_id for _, rule_id in entries)
+        return candidates
+
+    def _backend_trees(
+        self,
+        backend: NumericBackend,
+    ) -> tuple[dict[tuple, _IntervalNode], set[RuleId]]:
+        """Return trees by variable with converted bounds, and rules with unconverted bounds."""
+        trees = self._trees.get(backend)
+        if trees is None:
+            by_key: dict[tuple, _IntervalNode] = {}
+            unconverted: set[RuleId] = set()
+            for key, entries in self._entries.items():
+                converted = []
+                for interval, rule_id in entries:
+                    try:
+                        backend_interval = _convert_interval(interval, backend)
+                    except ExpressionEvaluationError:
+                        unconverted.add(rule_id)
+                        continue
+                    if not backend_interval.is_empty():
+                        converted.append((backend_interval, rule_id))
+                if converted:
+                    by_key[key] = _IntervalNode(converted)
+            trees = self._trees[backend] = (by_key, unconverted)
+        return trees
+
+    def __len__(self) -> int:
+        """Return number of indexed rules."""
+        return self._size
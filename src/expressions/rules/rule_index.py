@@ -0,0 +1,83 @@
+import abc
+from collections.abc import Iterator
+from decimal import Decimal
+from typing import Any
+
+from expressions.context import Context
+from expressions.expr.expr_base import Expression
+from expressions.expr.logical import And
+from expressions.numeric import DECIMAL, NumericBackend
+from expressions.rules.ruleset import RuleId
+
+
+def conjuncts(expr: Expression) -> Iterator[Expression]:
+    """Yield the conditions that must be true for the expression to be true.
+
+    The operands of `And` expressions, and nested `And` expressions, are conditions of the
+    expression. Any other expression is its own only condition.
+
+    Args:
+        expr: Expression.
+
+    Yields:
+        Conditions of the expression.
+    """
+    if type(expr) is And:
+        for sub_expr in expr.sub_expressions():
+            yield from conjuncts(sub_expr)
+    else:
+        yield expr
+
+
+def convert_literal(value: Any, backend: NumericBackend) -> Any:
+    """Return value of a literal as evaluated with a numeric backend.
+
+    Numbers are converted into the number type of the backend, like the values of numeric
+    variables, and any other value is returned as it is.
+
+    Args:
+        value: Value of a literal.
+        backend: Numeric backend.
+
+    Returns:
+        Converted value.
+
+    Raises:
+        ExpressionEvaluationError if the number can't be represented by the backend.
+    """
+    if backend is DECIMAL or type(value) is not Decimal:
+        return value
+    return backend.convert(value)
+
+
+class RuleIndex(abc.ABC):
+    """Index of rules, used to find the rules that can match in a context.
+
+    Indexes accept the rules they know how to index, and given a context return the ids of the
+    indexed rules that can match in it (candidates), so only those need to be evaluated. Rules not
+    returned as candidates evaluate to a false value, or raise, in the context. Rules reading
+    variables that can't be resolved in the context are returned, so their errors are reported.
+    """
+
+    @abc.abstractmethod
+    def add(self, rule_id: RuleId, rule: Expression) -> bool:
+        """Add rule to the index, if it can be indexed.
+
+        Args:
+            rule_id: Id of the rule.
+            rule: Rule to index.
+
+        Returns:
+            True if the rule was indexed.
+        """
+
+    @abc.abstractmethod
+    def candidates(self, context: Context) -> set[RuleId]:
+        """Return ids of indexed rules that can match in the given context.
+
+        Args:
+            context: Evaluation context.
+
+        Returns:
+            Set of rule ids.
+        """
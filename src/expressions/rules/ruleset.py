@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable, Mapping, Sequence
+from typing import Any
+
+from expressions.compiler.binding import (
+    CONTEXT_HELPER,
+    Row,
+    assign_slots,
+    names_by_slot,
+    resolve_slot,
+)
+from expressions.compiler.python_compiler import PythonCompiler
+from expressions.context import Context
+from expressions.exceptions import ContextValuePendingError
+from expressions.expr.expr_base import Expression
+from expressions.expr.variable import Variable, resolve_variable
+from expressions.numeric import DECIMAL, NumericBackend, numeric_backend
+
+RuleId = Hashable
+
+
+def variable_key(variable: Variable) -> tuple:
+    """Return key identifying variables with the same name, type and default."""
+    return (variable.name, variable.return_type, type(variable.default), repr(variable.default))
+
+
+# value of the variables not resolved yet by the generated function
+_UNRESOLVED = object()
+
+
+class RuleSetCompiler(PythonCompiler):
+    """Compiler of a collection of rules into a single python function.
+
+    The generated function receives a context and a dictionary where errors are stored, and returns
+    the list of ids of the rules evaluating to a true value:
+
+    * Every distinct variable used by the rules is resolved at most once, the first time a rule
+      reads it, so variables of operands not evaluated (like the right operand of `False and x`)
+      aren't resolved, and their providers aren't called.
+    * Rules raising any exception don't match, and their errors are stored by rule id, but
+      `ContextValuePendingError`, which is raised.
+    * Rules that can't be compiled are evaluated calling their `evaluate()` method.
+    """
+
+    namespace = {
+        **PythonCompiler.namespace,
+        "_resolve_variable": resolve_variable,
+        "_UNRESOLVED": _UNRESOLVED,
+        "_ContextValuePendingError": ContextValuePendingError,
+    }
+
+    def __init__(self, numeric_backend: NumericBackend = DECIMAL) -> None:
+        """Constructor.
+
+        Args:
+            numeric_backend: Numeric backend of the compiled rules.
+        """
+        super().__init__(numeric_backend)
+        self._resolutions: list[str] = []
+
+    def compile_rules(self, rules: Mapping[RuleId, Expression]) -> Any:
+        """Compile rules into a python function.
+
+        Args:
+            rules: Mapping from rule id to rule.
+
+        Returns:
+            Function with signature `(context, errors) -> list[RuleId]`.
+        """
+        self._reset()
+        self._resolutions = []
+        evaluations: list[str] = []
+        for rule_id, rule in rules.items():
+            rule_id_name = self._constant(rule_id)
+            evaluations.extend(
+                [
+                    "try:",
+                    f"    if {self._gen_rule(rule)}:",
+                    f"        matched.append({rule_id_name})",
+                    "except _ContextValuePendingError:",
+                    "    raise",
+                    "except Exception as exc:",
+                    "    if errors is not None:",
+                    f"        errors[{rule_id_name}] = exc",
+                ],
+            )
+        statements = ["matched = []", *self._resolutions, *evaluations, "return matched"]
+        return self._build_function(
+            self._function_source("context, errors", statements),
+            "RuleSet",
+        )
+
+    def _gen_rule(self, rule: Expression) -> str:
+        """Return python source for the rule, or calling its `evaluate()` if it can't compile."""
+        try:
+            return self._gen(rule)
+        except Exception:  # pylint: disable=broad-exception-caught
+            return self._gen_evaluate(rule)
+
+    def _gen_variable(self, expr: Variable) -> str:
+        key = variable_key(expr)
+        if key not in self._variables:
+            index = str(len(self._variables))
+            self._variables[key] = index
+            self._resolutions.append(f"_x{index} = _UNRESOLVED")
+        index = self._variables[key]
+        # the variable is resolved on its first read, and assigned to its local for the next ones
+        return (
+            f"(_x{index} if _x{index} is not _UNRESOLVED "
+            f"else (_x{index} := {self._resolution_source(expr)}))"
+        )
+
+    def _resolution_source(self, expr: Variable) -> str:
+        """Return source resolving the value of the variable."""
+        return (
+            f"_resolve_variable(context, {expr.name!r}, "
+            f"{self._constant(expr.return_type)}, {self._constant(expr.default)})"
+        )
+
+
+class SlotRuleSetCompiler(RuleSetCompiler):
+    """Compiler of a collection of rules into a python function evaluating rows of values.
+
+    Like `RuleSetCompiler`, but the generated function receives a row with the value of every
+    variable in its slot instead of a context.
+    """
+
+    namespace = {
+        **RuleSetCompiler.namespace,
+        "_Context": Context,
+        "_resolve_slot": resolve_slot,
+    }
+    context_source = "_to_context(context)"
+
+    def __init__(self, slots: dict[str, int]) -> None:
+        """Slot rule set compiler constructor.
+
+        Args:
+            slots: Mapping from variable name to slot index.
+        """
+        super().__init__()
+        self.slots = slots
+
+    def _reset(self) -> None:
+        super()._reset()
+        self._helpers.append(
+            CONTEXT_HELPER.format(slots=self._constant(names_by_slot(self.slots))),
+        )
+
+    def _resolution_source(self, expr: Variable) -> str:
+        return (
+            f"_resolve_slot(context, {self.slots[expr.name]}, {expr.name!r}, "
+            f"{self._constant(expr.return_type)}, {self._constant(expr.default)})"
+        )
+
+
+class RuleSet:
+    """Collection of rules evaluated together against a context.
+
+    A rule is any expression, identified by a hashable id. All the rules are compiled into a single
+    python function that resolves every distinct variable once per context, and then evaluates all
+    the rules, returning the ids of the rules that match (evaluate to a true value).
+
+    Rules are evaluated with the numeric backend of the context, compiled into a function for every
+    numeric backend the first time a context with that backend is matched.
+    """
+
+    def __init__(self, rules: Mapping[RuleId, Expression] | Iterable[tuple[RuleId, Expression]]):
+        """Rule set constructor.
+
+        Args:
+            rules: Mapping from rule id to rule, or iterable of (rule id, rule) pairs.
+        """
+        self._rules: dict[RuleId, Expression] = dict(rules)
+        self._matchers: dict[NumericBackend, Any] = {}
+        self._matcher(DECIMAL)
+
+    @property
+    def rules(self) -> Mapping[RuleId, Expression]:
+        """Return mapping from rule id to rule."""
+        return self._rules
+
+    def match(
+        self,
+        context: Context,
+        errors: dict[RuleId, Exception] | None = None,
+    ) -> list[RuleId]:
+        """Return ids of rules that match in the given context.
+
+        Args:
+            context: Evaluation context.
+            errors: Optional dictionary where errors raised by rules are stored by rule id.
+
+        Returns:
+            Ids of rules that evaluate to a true value, in the order the rules were given. Rules
+            raising any exception don't match.
+
+        Raises:
+            ContextValuePendingError if a rule reads a variable whose asynchronous provider hasn't
+            been awaited.
+        """
+        backend = numeric_backend(context)
+        matcher = self._matchers.get(backend) or self._matcher(backend)
+        return matcher(context, errors)
+
+    def _matcher(self, backend: NumericBackend) -> Any:
+        """Return function matching the rules, compiled for the given numeric backend."""
+        matcher = self._matchers[backend] = RuleSetCompiler(backend).compile_rules(self._rules)
+        return matcher
+
+    def bind(self, slots: Sequence[str] | None = None) -> BoundRuleSet:
+        """Bind the variables of the rules to slots of rows of values.
+
+        Args:
+            slots: Names of the values in a row. By default, variables are bound in order of first
+                appearance.
+
+        Returns:
+            Rule set matched against rows of values.
+
+        Raises:
+            ExpressionValidationError if a variable isn't in the given slots.
+        """
+        return BoundRuleSet(self._rules, slots)
+
+    def __len__(self) -> int:
+        """Return number of rules."""
+        return len(self._rules)
+
+    def __repr__(self) -> str:
+        """Return string representation of this instance."""
+        return f"{self.__class__.__name__}({len(self._rules)} rules)"
+
+
+class BoundRuleSet:
+    """Collection of rules bound to slots, matched against rows of values instead of contexts."""
+
+    def __init__(
+        self,
+        rules: Mapping[RuleId, Expression] | Iterable[tuple[RuleId, Expression]],
+        slots: Sequence[str] | None = None,
+    ):
+        """Bound rule set constructor.
+
+        Args:
+            rules: Mapping from rule id to rule, or iterable of (rule id, rule) pairs.
+            slots: Names of the values in a row. By default, variables are bound in order of first
+                appearance.
+
+        Raises:
+            ExpressionValidationError if a variable isn't in the given slots.
+        """
+        self._rules: dict[RuleId, Expression] = dict(rules)
+        compiler = SlotRuleSetCompiler(assign_slots(self._rules.values(), slots))
+        self.slots = names_by_slot(compiler.slots)
+        self._match = compiler.compile_rules(self._rules)
+
+    @property
+    def rules(self) -> Mapping[RuleId, Expression]:
+        """Return mapping from rule id to rule."""
+        return self._rules
+
+    def match(
+        self,
+        row: Row,
+        errors: dict[RuleId, Exception] | None = None,
+    ) -> list[RuleId]:
+        """Return ids of rules that match in the given row.
+
+        Args:
+            row: Sequence with the value of every variable in its slot.
+            errors: Optional dictionary where errors raised by rules are stored by rule id.
+
+        Returns:
+            Ids of rules that evaluate to a true value, in the order the rules were given. Rules
+            raising any exception don't match.
+        """
+        return self._match(row, errors)
+
+    def __len__(self) -> int:
+        """Return number of rules."""
+        return len(self._rules)
+
+    def __repr__(self) -> str:
+        """Return string representation of this instance."""
+        return f"{self.__class__.__name__}({len(self._rules)} rules, slots={self.slots!r})"
@@ -1,58 +1,270 @@
+from collections.abc import Callable
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, cast
-
-import zope.interface  # type: ignore
-from zope.component import getUtility  # type: ignore
+from typing import Any, Protocol, cast
 
 from expressions import Expression
-from expressions.exceptions import ParseError
+from expressions.exceptions import ParseError, SerialiserLookupError
 from expressions.expr.expr_base import HomogeneousListMixin, MappeableMixin
 from expressions.expr.literals import LiteralMixin
 
 PrimitiveType = None | bool | int | float | Decimal | str | datetime | timedelta | dict
 
 
-class IPrimitiveSerialiser(zope.interface.Interface):  # pylint: disable=inherit-non-class
-    """Interface for Serialiser from Expressions to Python Primitive types."""
+class PrimitiveSerialiser(Protocol):
+    """Serialiser from Expressions to Python Primitive types."""
 
-    def serialise(expr: Expression) -> PrimitiveType:  # pylint: disable=no-self-argument
+    def serialise(self, expr: Expression) -> PrimitiveType:
         """Serialise expression into primitive python types."""
 
 
-class IPrimitiveDeserialiser(zope.interface.Interface):  # pylint: disable=inherit-non-class
-    """Interfcace fod Deserialiser from Python Primitive types to Expressions."""
+class PrimitiveDeserialiser(Protocol):
+    """Deserialiser from Python Primitive types to Expressions."""
 
-    def deserialise(  # type: ignore # pylint: disable=no-self-argument
-        data: PrimitiveType,
-    ) -> Expression:
+    def deserialise(self, data: PrimitiveType) -> Expression:
         """Deserialise expression from primitive python types."""
 
 
-def serialiser_from_instance(expr: Expression) -> IPrimitiveSerialiser:
+# zope interfaces IPrimitiveSerialiser and IPrimitiveDeserialiser, by name, once created
+_interfaces: dict[str, Any] = {}
+
+
+def _zope_interfaces() -> dict[str, Any]:
+    """Return zope interfaces of serialisers and deserialisers, creating them on first use.
+
+    Zope is slow to import and it's not needed to serialise and parse expressions, so its interfaces
+    are created only when they're requested. Then, the serialisers and deserialisers of the
+    registry are registered as zope utilities too.
+    """
+    if _interfaces:
+        return _interfaces
+    # pylint: disable=import-outside-toplevel
+    import zope.interface  # type: ignore
+
+    class IPrimitiveSerialiser(zope.interface.Interface):  # pylint: disable=inherit-non-class
+        """Interface for Serialiser from Expressions to Python Primitive types."""
+
+        def serialise(expr: Expression) -> PrimitiveType:  # pylint: disable=no-self-argument
+            """Serialise expression into primitive python types."""
+
+    class IPrimitiveDeserialiser(zope.interface.Interface):  # pylint: disable=inherit-non-class
+        """Interfcace fod Deserialiser from Python Primitive types to Expressions."""
+
+        def deserialise(  # type: ignore # pylint: disable=no-self-argument
+            data: PrimitiveType,
+        ) -> Expression:
+            """Deserialise expression from primitive python types."""
+
+    for serialiser_class in (
+        LiteralDictSerialiser,
+        HomogeneousListDictSerialiser,
+        MappeableSerialiser,
+    ):
+        zope.interface.classImplements(serialiser_class, IPrimitiveSerialiser)
+    for deserialiser_class in (
+        LiteralDictDeserialiser,
+        HomogeneousListDictDeserialiser,
+        MappeableDeserialiser,
+    ):
+        zope.interface.classImplements(deserialiser_class, IPrimitiveDeserialiser)
+    _interfaces.update(
+        IPrimitiveSerialiser=IPrimitiveSerialiser,
+        IPrimitiveDeserialiser=IPrimitiveDeserialiser,
+    )
+    registry.register_utilities()
+    return _interfaces
+
+
+def __getattr__(name: str) -> Any:
+    """Return zope interfaces, created on first use."""
+    if name in ("IPrimitiveSerialiser", "IPrimitiveDeserialiser"):
+        return _zope_interfaces()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _query_utility(interface_name: str, name: str) -> Any:
+    """Return zope utility with the given name, or None if there's none."""
+    if not _interfaces:
+        # nothing can be registered for interfaces not created yet
+        return None
+    from zope.component import queryUtility  # type: ignore  # pylint: disable=import-outside-toplevel
+
+    return queryUtility(_interfaces[interface_name], name)
+
+
+class SerialiserRegistry:
+    """Registry of serialisers by expression class, and of deserialisers by name.
+
+    Serialisers are looked up by the class of the expression, and deserialisers by the name of the
+    expression (the only key of its dictionary) or, for literals, by the class name of the value.
+    Lookups are plain dictionary lookups, so they are cheap enough to be done for every node.
+
+    A registry may have a loader, registering its serialisers and deserialisers the first time the
+    registry is used, so they aren't built if expressions are never serialised or parsed.
+
+    Serialisers and deserialisers registered as named utilities in Zope Component Architecture, by
+    class name and by name, for the interfaces `IPrimitiveSerialiser` and `IPrimitiveDeserialiser`
+    of this module, are still found: they are looked up when there's no registration for a class or
+    name, and then added to the registry.
+
+    The registry has a version, increased whenever a deserialiser is registered, so parsers building
+    tables from its deserialisers know when to rebuild them.
+    """
+
+    def __init__(self, loader: Callable[["SerialiserRegistry"], None] | None = None) -> None:
+        """Constructor.
+
+        Args:
+            loader: Optional function registering serialisers and deserialisers in the registry,
+                called once, the first time the registry is used.
+        """
+        self._serialisers: dict[type, PrimitiveSerialiser] = {}
+        self._deserialisers: dict[str, PrimitiveDeserialiser] = {}
+        self._loader = loader
+        self._utilities = False
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Version of the deserialisers, increased whenever a deserialiser is registered."""
+        return self._version
+
+    def add_serialiser(self, klass: type, serialiser: PrimitiveSerialiser) -> None:
+        """Register serialiser of the expressions of a class.
+
+        Args:
+            klass: Expression class.
+            serialiser: Serialiser of the expressions of the class.
+        """
+        self._load()
+        self._serialisers[klass] = serialiser
+        if self._utilities:
+            self._provide_utility(serialiser, "IPrimitiveSerialiser", klass.__name__)
+
+    def add_deserialiser(self, name: str, deserialiser: PrimitiveDeserialiser) -> None:
+        """Register deserialiser of the expressions with the given name.
+
+        Args:
+            name: Name of the expression, or class name of the literal values.
+            deserialiser: Deserialiser of the expressions with the name.
+        """
+        self._load()
+        self._deserialisers[name] = deserialiser
+        self._version += 1
+        if self._utilities:
+            self._provide_utility(deserialiser, "IPrimitiveDeserialiser", name)
+
+    def register_utilities(self) -> None:
+        """Register serialisers and deserialisers as zope utilities, now and when they're added."""
+        self._load()
+        self._utilities = True
+        for klass, serialiser in self._serialisers.items():
+            self._provide_utility(serialiser, "IPrimitiveSerialiser", klass.__name__)
+        for name, deserialiser in self._deserialisers.items():
+            self._provide_utility(deserialiser, "IPrimitiveDeserialiser", name)
+
+    def deserialisers(self) -> dict[str, PrimitiveDeserialiser]:
+        """Return mapping from name to deserialiser, with all the deserialisers in the registry."""
+        self._load()
+        return dict(self._deserialisers)
+
+    def serialiser(self, klass: type) -> PrimitiveSerialiser:
+        """Return serialiser of the expressions of a class.
+
+        Raises:
+            SerialiserLookupError if there's no serialiser for the class.
+        """
+        try:
+            return self._serialisers[klass]
+        except KeyError:
+            pass
+        if self._load():
+            return self.serialiser(klass)
+        serialiser = _query_utility("IPrimitiveSerialiser", klass.__name__)
+        if serialiser is None:
+            raise SerialiserLookupError(f"no serialiser for {klass.__name__}")
+        self._serialisers[klass] = serialiser
+        return serialiser
+
+    def query_deserialiser(self, name: str) -> PrimitiveDeserialiser | None:
+        """Return deserialiser of the expressions with the given name, or None if there's none."""
+        try:
+            return self._deserialisers[name]
+        except KeyError:
+            pass
+        if self._load():
+            return self.query_deserialiser(name)
+        deserialiser = _query_utility("IPrimitiveDeserialiser", name)
+        if deserialiser is not None:
+            self._deserialisers[name] = deserialiser
+        return deserialiser
+
+    def deserialiser(self, name: str) -> PrimitiveDeserialiser:
+        """Return deserialiser of the expressions with the given name.
+
+        Raises:
+            SerialiserLookupError if there's no deserialiser for the name.
+        """
+        deserialiser = self.query_deserialiser(name)
+        if deserialiser is None:
+            raise SerialiserLookupError(f"no deserialiser for {name}")
+        return deserialiser
+
+    def _load(self) -> bool:
+        """Call the loader if it wasn't called yet, returning whether it was called."""
+        loader = self._loader
+        if loader is None:
+            return False
+        self._loader = None
+        loader(self)
+        return True
+
+    @staticmethod
+    def _provide_utility(component: Any, interface_name: str, name: str) -> None:
+        # pylint: disable=import-outside-toplevel
+        from zope.component import provideUtility  # type: ignore
+
+        provideUtility(component, _zope_interfaces()[interface_name], name)
+
+
+def _register_builtins(registry: SerialiserRegistry) -> None:
+    """Register serialisers and deserialisers of the built-in expressions."""
+    # pylint: disable=import-outside-toplevel
+    from expressions.serialiser.dict_serialiser_init import (
+        register_dict_serialisers_and_deserialisers,
+    )
+
+    register_dict_serialisers_and_deserialisers(registry)
+
+
+# registry used by the dict serialisers and parsers
+registry = SerialiserRegistry(_register_builtins)
+
+
+def serialiser_from_instance(expr: Expression) -> PrimitiveSerialiser:
     """Return the dict serialiser for the given expression.
 
-    The appropriate serialiser is a named zope adapter looked up from Zope Component Architecture
-    using the expression class name.
+    The appropriate serialiser is looked up in the registry by the expression class.
 
     Args:
         expr: Expression to serialiser.
 
     Returns:
         Expression Serialiser.
+
+    Raises:
+        SerialiserLookupError if there's no serialiser for the expression.
     """
-    serialiser = getUtility(IPrimitiveSerialiser, expr.__class__.__name__)
-    return serialiser
+    return registry.serialiser(expr.__class__)
 
 
-def deserialiser_from_instance(data: PrimitiveType) -> IPrimitiveDeserialiser:
+def deserialiser_from_instance(data: PrimitiveType) -> PrimitiveDeserialiser:
     """Return the dict deserialiser for the given primitive.
 
-    The appropriate deserialiser is a named zope adapter looked up from Zope Component Architecture,
-    where the name is determined by:
+    The appropriate deserialiser is looked up in the registry by a name determined by:
 
     * If the primitive value is a dictionary, it must have a single key which is used to select
-      the appropriate adapter.
+      the appropriate deserialiser.
     * In other case, the deserialiser is picked from the class name of the deserialised value.
 
     Args:
@@ -60,21 +272,22 @@ def deserialiser_from_instance(data: PrimitiveType) -> IPrimitiveDeserialiser:
 
     Returns:
         Data Deserialiser.
+
+    Raises:
+        ParseError if the data is a dictionary with more than one key.
+        SerialiserLookupError if there's no deserialiser for the data.
     """
     if isinstance(data, dict):
         # dict deserialiser is chosen by the name of its (only) key
-        keys = list(data.keys())
-        if len(keys) != 1:
-            raise ParseError("expression {data} has more than one key")
-        deserialiser_name = keys.pop()
+        if len(data) != 1:
+            raise ParseError(f"expression {data} has more than one key")
+        (deserialiser_name,) = data
     else:
         # other deserialisers are chosen by their class name
         deserialiser_name = data.__class__.__name__
-    deserialiser = getUtility(IPrimitiveDeserialiser, deserialiser_name)
-    return deserialiser
+    return registry.deserialiser(deserialiser_name)
 
 
-@zope.interface.implementer(IPrimitiveSerialiser)
 class LiteralDictSerialiser:
     """Serialiser for literal expressions.
 
@@ -87,7 +300,6 @@ class LiteralDictSerialiser:
         return cast(LiteralMixin, expr).value
 
 
-@zope.interface.implementer(IPrimitiveDeserialiser)
 class LiteralDictDeserialiser:
     """Deserialiser for literal expressions.
 
@@ -104,7 +316,6 @@ class LiteralDictDeserialiser:
         return cast(Expression, self.expr_class(data))
 
 
-@zope.interface.implementer(IPrimitiveSerialiser)
 class HomogeneousListDictSerialiser:
     """Serialiser for expressions with homogeneous lists.
 
@@ -127,7 +338,6 @@ class HomogeneousListDictSerialiser:
         return {self.expr_name: serialised_sub_expressions}
 
 
-@zope.interface.implementer(IPrimitiveDeserialiser)
 class HomogeneousListDictDeserialiser:
     """Deserialiser for expressions with homogeneous lists.
 
@@ -147,8 +357,7 @@ class HomogeneousListDictDeserialiser:
         # get the list from the first and only key in the data
         self.assert_is_dict(data)
         data = cast(dict, data)
-        data_key = list(data.keys()).pop()
-        data_list = data[data_key]
+        ((_, data_list),) = data.items()
         sub_expressions = []
         for sub_data in data_list:
             deserialiser = deserialiser_from_instance(sub_data)
@@ -163,7 +372,6 @@ class HomogeneousListDictDeserialiser:
             raise ParseError(f"serialiser expected dict, got {type(data)}")
 
 
-@zope.interface.implementer(IPrimitiveSerialiser)
 class MappeableSerialiser:
     """Serialiser for mappeable expressions.
 
@@ -187,7 +395,6 @@ class MappeableSerialiser:
         return {self.expr_name: vals_map}
 
 
-@zope.interface.implementer(IPrimitiveDeserialiser)
 class MappeableDeserialiser:
     """Deserialiser for mappeable expressions.
 
@@ -207,8 +414,7 @@ class MappeableDeserialiser:
         # get the list from the first and only key in the data
         self.assert_is_dict(data)
         data = cast(dict, data)
-        data_key = list(data.keys()).pop()
-        data_dict = data[data_key]
+        ((_, data_dict),) = data.items()
         # deserialise values is dict that correspond with sub-expressions
         for key in self.expr_class.sub_expression_names:
             sub_data = data_dict[key]
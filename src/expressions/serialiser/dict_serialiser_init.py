@@ -1,5 +1,3 @@
-from zope.component import provideUtility  # type: ignore
-
 from expressions import (
     Add,
     And,
@@ -30,81 +28,96 @@ from expressions.expr.literals import (
 from expressions.serialiser.dict_serialiser import (
     HomogeneousListDictDeserialiser,
     HomogeneousListDictSerialiser,
-    IPrimitiveDeserialiser,
-    IPrimitiveSerialiser,
     LiteralDictDeserialiser,
     LiteralDictSerialiser,
     MappeableDeserialiser,
     MappeableSerialiser,
+    SerialiserRegistry,
 )
+from expressions.serialiser.dict_serialiser import registry as default_registry
 
 
-def _register_literal(klass: type[LiteralMixin], primitive_type_names: str | list[str]) -> None:
+def _register_literal(
+    registry: SerialiserRegistry,
+    klass: type[LiteralMixin],
+    primitive_type_names: str | list[str],
+) -> None:
     """Register serialiser and deserialiser for Literal Expressions.
 
-    Literal serialisers are registered with the name of the expression.
+    Literal serialisers are registered with the expression class.
     Literal deserialisers are registered with the name of the primitive type ("bool", "str", etc.).
     """
-    provideUtility(LiteralDictSerialiser, IPrimitiveSerialiser, klass.__name__)
+    registry.add_serialiser(klass, LiteralDictSerialiser)  # type: ignore
     if not isinstance(primitive_type_names, list):
         primitive_type_names = [primitive_type_names]
     for name in primitive_type_names:
-        provideUtility(LiteralDictDeserialiser(klass), IPrimitiveDeserialiser, name)
+        registry.add_deserialiser(name, LiteralDictDeserialiser(klass))  # type: ignore
 
 
-def _register_hom_list(klass: type[HomogeneousListMixin], name: str) -> None:
+def _register_hom_list(
+    registry: SerialiserRegistry,
+    klass: type[HomogeneousListMixin],
+    name: str,
+) -> None:
     """Register serialiser and deserialiser for HomogeneousListExpressions.
 
-    Serialisers are registered with the name of the expression.
+    Serialisers are registered with the expression class.
     Deserialisers are registered with the given name.
     """
-    provideUtility(HomogeneousListDictSerialiser(name), IPrimitiveSerialiser, klass.__name__)
-    provideUtility(HomogeneousListDictDeserialiser(klass), IPrimitiveDeserialiser, name)
+    registry.add_serialiser(klass, HomogeneousListDictSerialiser(name))
+    registry.add_deserialiser(name, HomogeneousListDictDeserialiser(klass))  # type: ignore
 
 
-def _register_mappeable(klass: type[MappeableMixin], name: str) -> None:
+def _register_mappeable(
+    registry: SerialiserRegistry,
+    klass: type[MappeableMixin],
+    name: str,
+) -> None:
     """Register serialiser and deserialiser for Mappeable Expressions.
 
-    Serialisers are registered with the name of the expression.
+    Serialisers are registered with the expression class.
     Deserialisers are registered with the given name.
     """
-    provideUtility(MappeableSerialiser(name), IPrimitiveSerialiser, klass.__name__)
-    provideUtility(MappeableDeserialiser(klass), IPrimitiveDeserialiser, name)
+    registry.add_serialiser(klass, MappeableSerialiser(name))
+    registry.add_deserialiser(name, MappeableDeserialiser(klass))  # type: ignore
 
 
-def register_dict_serialisers_and_deserialisers() -> None:
+def register_dict_serialisers_and_deserialisers(
+    registry: SerialiserRegistry = default_registry,
+) -> None:
     """Register serialisers and deserialisers used by dict parser.
 
-    Serialisers and deserialisers are register using zope component architecture, like named
-    utilities for IDictSerialiser and IDictDeserialiser respectively.
+    Serialisers and deserialisers are registered by expression class and by name respectively.
+    The registry of the dict serialisers calls this function the first time it's used, so there's
+    no need to call it to serialise and parse expressions.
+
+    Args:
+        registry: Registry of serialisers and deserialisers. By default, the registry of the dict
+            serialisers.
     """
     # literals
-    _register_literal(Null, "NoneType")
-    _register_literal(Boolean, "bool")
-    _register_literal(Number, ["int", "float", "Decimal"])
-    _register_literal(String, "str")
-    _register_literal(Datetime, "datetime")
-    _register_literal(Timedelta, "timedelta")
+    _register_literal(registry, Null, "NoneType")
+    _register_literal(registry, Boolean, "bool")
+    _register_literal(registry, Number, ["int", "float", "Decimal"])
+    _register_literal(registry, String, "str")
+    _register_literal(registry, Datetime, "datetime")
+    _register_literal(registry, Timedelta, "timedelta")
     # logical
-    _register_hom_list(Not, "not")
-    _register_hom_list(And, "and")
-    _register_hom_list(Or, "or")
+    _register_hom_list(registry, Not, "not")
+    _register_hom_list(registry, And, "and")
+    _register_hom_list(registry, Or, "or")
     # comparison
-    _register_hom_list(Equal, "equal")
-    _register_hom_list(NotEqual, "not-equal")
-    _register_hom_list(LessThan, "less-than")
-    _register_hom_list(LessThanOrEqual, "less-than-or-equal")
-    _register_hom_list(GreaterThan, "greater-than")
-    _register_hom_list(GreaterThanOrEqual, "greater-than-or-equal")
+    _register_hom_list(registry, Equal, "equal")
+    _register_hom_list(registry, NotEqual, "not-equal")
+    _register_hom_list(registry, LessThan, "less-than")
+    _register_hom_list(registry, LessThanOrEqual, "less-than-or-equal")
+    _register_hom_list(registry, GreaterThan, "greater-than")
+    _register_hom_list(registry, GreaterThanOrEqual, "greater-than-or-equal")
     # arithmetic
-    _register_hom_list(Add, "add")
-    _register_hom_list(Sub, "sub")
-    _register_hom_list(Mul, "mul")
-    _register_hom_list(Div, "div")
-    _register_hom_list(Mod, "mod")
+    _register_hom_list(registry, Add, "add")
+    _register_hom_list(registry, Sub, "sub")
+    _register_hom_list(registry, Mul, "mul")
+    _register_hom_list(registry, Div, "div")
+    _register_hom_list(registry, Mod, "mod")
     # variable
-    _register_mappeable(Variable, "var")
-
-
-# we need to register serialisers and deserialisers on module load
-register_dict_serialisers_and_deserialisers()
+    _register_mappeable(registry, Variable, "var")
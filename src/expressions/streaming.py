@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping, Sequence
+from typing import Any
+
+from expressions.chunking import chunks
+from expressions.compiler.binding import BoundExpression
+from expressions.context import Context
+from expressions.exceptions import ExpressionEvaluationError
+from expressions.expr.expr_base import Expression
+
+# errors of the records that can't be evaluated, with the index of the record
+RecordErrors = list[tuple[int, ExpressionEvaluationError]]
+
+
+def _evaluator(
+    expressions: Expression | Mapping[Hashable, Expression],
+    slots: Sequence[str] | None,
+) -> Callable[[Any], Any]:
+    """Return function evaluating the expressions on a record, reusing a single context."""
+    single = isinstance(expressions, Expression)
+    expressions_map: dict[Hashable, Expression] = (
+        {None: expressions} if single else dict(expressions)  # type: ignore
+    )
+    if slots is not None:
+        bound = {key: BoundExpression(expr, slots) for key, expr in expressions_map.items()}
+        if single:
+            return bound[None]
+        return lambda row: {key: function(row) for key, function in bound.items()}
+
+    functions: dict[Hashable, Callable[[Context], Any]] = {
+        key: expr.compile() for key, expr in expressions_map.items()
+    }
+    context = Context()
+    reset = context.reset
+    if single:
+        function = functions[None]
+
+        def evaluate(record: Any) -> Any:
+            reset(record if type(record) is dict else dict(record))
+            return function(context)
+
+        return evaluate
+
+    def evaluate_all(record: Any) -> dict[Hashable, Any]:
+        reset(record if type(record) is dict else dict(record))
+        return {key: function(context) for key, function in functions.items()}
+
+    return evaluate_all
+
+
+def _evaluate(
+    evaluate: Callable[[Any], Any],
+    records: Iterable[Any],
+    chunksize: int,
+    errors: RecordErrors | None,
+) -> Iterator[tuple[Any, Any]]:
+    """Return iterator over pairs of record and value, skipping records that can't be evaluated."""
+    index = 0
+    for chunk in chunks(records, chunksize):
+        if errors is None:
+            yield from zip(chunk, map(evaluate, chunk), strict=True)
+            index += len(chunk)
+            continue
+        results = []
+        for record in chunk:
+            try:
+                results.append((record, evaluate(record)))
+            except ExpressionEvaluationError as exc:
+                errors.append((index, exc))
+            index += 1
+        yield from results
+
+
+def filter_records(
+    expr: Expression,
+    records: Iterable[Any],
+    slots: Sequence[str] | None = None,
+    chunksize: int = 1000,
+    errors: RecordErrors | None = None,
+) -> Iterator[Any]:
+    """Return lazy iterator over the records matching an expression.
+
+    The expression is compiled once, and records are evaluated reusing a single context whose
+    mapping is replaced by every record, so no context is built per record. Records are read in
+    chunks of `chunksize` records, evaluated together, and yielded.
+
+    Args:
+        expr: Expression evaluating to a true value for the matching records.
+        records: Mappings from variable name to value or, if slots are given, rows with the value of
+            every variable in its slot.
+        slots: Names of the values in a row, if records are rows of values.
+        chunksize: Number of records evaluated at once.
+        errors: Optional list where the index and the error of records raising
+            `ExpressionEvaluationError` are stored. Those records don't match. By default, errors
+            are raised.
+
+    Yields:
+        Records evaluating to a true value, unchanged and in order.
+    """
+    evaluate = _evaluator(expr, slots)
+    for record, value in _evaluate(evaluate, records, chunksize, errors):
+        if value:
+            yield record
+
+
+def project(
+    expressions: Expression | Mapping[Hashable, Expression],
+    records: Iterable[Any],
+    slots: Sequence[str] | None = None,
+    chunksize: int = 1000,
+    errors: RecordErrors | None = None,
+) -> Iterator[Any]:
+    """Return lazy iterator over the values of expressions computed for every record.
+
+    Expressions are compiled once and evaluated like in `filter_records()`.
+
+    Args:
+        expressions: Expression, or mapping from key to expression.
+        records: Mappings from variable name to value or, if slots are given, rows with the value of
+            every variable in its slot.
+        slots: Names of the values in a row, if records are rows of values.
+        chunksize: Number of records evaluated at once.
+        errors: Optional list where the index and the error of records raising
+            `ExpressionEvaluationError` are stored. Those records are skipped. By default, errors
+            are raised.
+
+    Yields:
+        For every record, the value of the expression or, if a mapping of expressions is given, a
+        dictionary from key to value.
+    """
+    evaluate = _evaluator(expressions, slots)
+    for _, value in _evaluate(evaluate, records, chunksize, errors):
+        yield value
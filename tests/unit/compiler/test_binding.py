@@ -0,0 +1,117 @@
+from array import array
+from decimal import Decimal
+from unittest import TestCase
+
+from expressions import (
+    And,
+    BooleanExpression,
+    Context,
+    Equal,
+    Expression,
+    ExpressionArity,
+    GreaterThan,
+    Number,
+    Or,
+    String,
+    Variable,
+)
+from expressions.compiler import bind, slot_names
+from expressions.exceptions import (
+    ExpressionValidationError,
+    VariableNotFoundError,
+    VariableTypeError,
+)
+from expressions.rules import RuleSet
+from tests.unit.variables import numeric_variable, string_variable
+
+COUNTRY = string_variable("country")
+AMOUNT = numeric_variable("amount")
+IS_ES = Equal(COUNTRY, String("ES"))
+IS_BIG = GreaterThan(AMOUNT, Number(100))
+
+
+class IsPositive(BooleanExpression):
+    """Expression unknown to the compiler, reading a variable from the context."""
+
+    arity = ExpressionArity.NULLARY
+
+    def sub_expressions(self) -> tuple[Expression, ...]:
+        """Return sub-expressions of this expression."""
+        return ()
+
+    def evaluate(self, context: Context) -> bool:
+        """Return True if value of x is positive."""
+        return bool(context.get("x", 0) > 0)
+
+    def __eq__(self, other: object) -> bool:
+        """Return true if expressions are equal."""
+        return isinstance(other, IsPositive)
+
+
+class TestBind(TestCase):
+    """Test case for expressions bound to slots."""
+
+    def test_bound_expressions_evaluate_rows(self):
+        """Bound expressions should evaluate rows like expressions evaluate contexts.
+
+        Given an expression bound to slots,
+        When it's evaluated on rows of values,
+        Then it should return the same values as the expression in equivalent contexts.
+        """
+        expr = Or(IS_ES, IS_BIG)
+        bound = bind(expr)
+        self.assertEqual(bound.slots, ("country", "amount"))
+        for row in [("ES", Decimal(1)), ("UK", Decimal(200)), ["UK", Decimal(1)]]:
+            with self.subTest(row):
+                context = Context(**dict(zip(bound.slots, row, strict=True)))
+                self.assertEqual(bound(row), expr.evaluate(context))
+                self.assertEqual(bound.evaluate(row), expr.evaluate(context))
+
+    def test_given_slots(self):
+        """Expressions can be bound to a given schema of rows."""
+        bound = bind(
+            GreaterThan(Variable("x", int), Variable("y", int)),
+            slots=["y", "unused", "x"],
+        )
+        self.assertTrue(bound(array("q", [1, 0, 2])))
+        self.assertEqual(bound.slots, ("y", "unused", "x"))
+        with self.assertRaises(ExpressionValidationError):
+            bind(IS_ES, slots=["amount"])
+
+    def test_missing_and_wrong_values(self):
+        """Rows should raise the same exceptions than contexts."""
+        bound = bind(And(IS_ES, GreaterThan(numeric_variable("amount", Decimal(0)), Number(-1))))
+        self.assertTrue(bound(["ES"]))
+        with self.assertRaises(VariableNotFoundError):
+            bound([])
+        with self.assertRaises(VariableTypeError):
+            bound([1, Decimal(1)])
+
+    def test_unknown_expressions(self):
+        """Expressions unknown to the compiler should be evaluated in a context built from rows."""
+        bound = bind(And(GreaterThan(Variable("x", int), Variable("y", int)), IsPositive()))
+        self.assertTrue(bound([2, 1]))
+        self.assertFalse(bound([-1, -2]))
+
+    def test_slot_names(self):
+        """Slot names should be in order of first appearance."""
+        self.assertEqual(slot_names([Or(IS_BIG, IS_ES), IS_ES]), ("amount", "country"))
+
+
+class TestBoundRuleSet(TestCase):
+    """Test case for rule sets bound to slots."""
+
+    def test_match_rows(self):
+        """Bound rule sets should match rows like rule sets match contexts."""
+        rules = {"es": IS_ES, "big": IS_BIG, "both": And(IS_ES, IS_BIG), "x": IsPositive()}
+        rule_set = RuleSet(rules)
+        bound = rule_set.bind(slots=["amount", "country", "x"])
+        self.assertEqual(len(bound), 4)
+        for row in [(Decimal(1), "ES", 1), (Decimal(200), "ES", 0), (Decimal(200), "UK", -1)]:
+            with self.subTest(row):
+                context = Context(**dict(zip(bound.slots, row, strict=True)))
+                self.assertEqual(bound.match(row), rule_set.match(context))
+
+        errors: dict = {}
+        self.assertEqual(bound.match([Decimal(1)], errors), [])
+        self.assertEqual(set(errors), {"es", "both"})
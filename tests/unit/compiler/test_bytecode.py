@@ -0,0 +1,133 @@
+import pickle
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest import TestCase
+
+import pytz  # type: ignore
+
+from expressions import (
+    Add,
+    And,
+    Boolean,
+    Context,
+    Datetime,
+    Div,
+    Equal,
+    Expression,
+    GreaterThan,
+    LessThan,
+    Mod,
+    Mul,
+    Not,
+    NotEqual,
+    Null,
+    Number,
+    Or,
+    String,
+    Sub,
+    Timedelta,
+)
+from expressions.compiler import OpCode, assemble, execute
+from expressions.exceptions import (
+    ExpressionEvaluationError,
+    VariableNotFoundError,
+    VariableTypeError,
+)
+from tests.unit.compiler.test_python_compiler import FailingExpression
+from tests.unit.variables import boolean_variable, numeric_variable, string_variable
+
+
+class TestBytecode(TestCase):
+    """Test case for expression programs and the virtual machine."""
+
+    context = Context(x=Decimal(3), y=Decimal("1.5"), name="foo", flag=True)
+    expressions: list[Expression] = [
+        Null(),
+        Boolean(False),
+        Number("1.3"),
+        String("hi"),
+        Datetime(datetime(2020, 11, 30, tzinfo=pytz.utc)),
+        Timedelta(timedelta(hours=3)),
+        numeric_variable("x"),
+        string_variable("missing", "default"),
+        Add(numeric_variable("x"), Number(2), numeric_variable("y")),
+        Sub(numeric_variable("x"), Number("0.5")),
+        Mul(Number(2), numeric_variable("y"), Number(3)),
+        Div(numeric_variable("x"), Number(4)),
+        Mod(Number(7), numeric_variable("x")),
+        Not(boolean_variable("flag")),
+        And(boolean_variable("flag"), LessThan(numeric_variable("y"), numeric_variable("x"))),
+        And(Boolean(True), Boolean(False), Boolean(True)),
+        And(Boolean(True), Or(Boolean(False), Boolean(False)), Boolean(True)),
+        Or(Boolean(False), Equal(string_variable("name"), String("foo"))),
+        Or(Boolean(False), Boolean(False)),
+        NotEqual(string_variable("name"), String("bar")),
+        GreaterThan(Add(Number(1), Number(2)), numeric_variable("y")),
+    ]
+
+    def test_program_evaluates_as_expression(self):
+        """Programs should evaluate to the same value than the expression they represent.
+
+        Given an expression,
+        When it is assembled into a program,
+        Then executing the program should return the same value than evaluating the expression.
+        """
+        for expr in self.expressions:
+            with self.subTest(expr):
+                program = assemble(expr)
+                self.assertEqual(execute(program, self.context), expr.evaluate(self.context))
+                self.assertEqual(program.evaluate(self.context), expr.evaluate(self.context))
+
+    def test_program_is_postfix(self):
+        """Programs should contain the instructions of the expression in postfix order."""
+        program = assemble(Add(numeric_variable("x"), Number(2)))
+        self.assertEqual(list(program.opcodes), [OpCode.VAR, OpCode.CONST, OpCode.ADD])
+        self.assertEqual(list(program.operands), [0, 1, 2])
+
+    def test_constants_are_shared(self):
+        """Equal constants should be stored only once in the constant pool."""
+        expr = Add(Number(2), numeric_variable("x"), Number(2), numeric_variable("x"))
+        program = assemble(expr)
+        self.assertEqual(len(program.constants), 2)
+
+    def test_and_or_short_circuit(self):
+        """And and Or should not evaluate sub-expressions after the result is known."""
+        for expr in [
+            And(Boolean(False), FailingExpression()),
+            Or(Boolean(True), FailingExpression()),
+        ]:
+            with self.subTest(expr):
+                self.assertEqual(assemble(expr).evaluate(self.context), expr.evaluate(self.context))
+
+    def test_programs_raise_like_expressions(self):
+        """Programs should raise the same exceptions than expressions."""
+        cases = [
+            (Div(Number(1), Number(0)), ExpressionEvaluationError),
+            (numeric_variable("not_there"), VariableNotFoundError),
+            (numeric_variable("name"), VariableTypeError),
+        ]
+        for expr, exception in cases:
+            with self.subTest(expr):
+                with self.assertRaises(exception):
+                    assemble(expr).evaluate(self.context)
+
+    def test_binary_expressions_with_wrong_arity(self):
+        """Binary expressions should use their first two operands only, like evaluate()."""
+        for expr in [
+            LessThan(Number(1), Number(2), Number(0)),
+            Sub(Number(5), Number(1), Number(1)),
+            Div(Number(6), Number(2), Number(0)),
+        ]:
+            with self.subTest(expr):
+                self.assertEqual(assemble(expr).evaluate(self.context), expr.evaluate(self.context))
+        for expr in [Equal(Number(1)), Div(Number(1))]:
+            with self.subTest(expr):
+                with self.assertRaises(IndexError):
+                    assemble(expr).evaluate(self.context)
+
+    def test_program_is_smaller_than_expression(self):
+        """Pickled programs should be smaller than the pickled expression."""
+        expr = And(*[GreaterThan(numeric_variable("x"), Number(i)) for i in range(20)])
+        program = assemble(expr)
+        self.assertLess(len(pickle.dumps(program)), len(pickle.dumps(expr)))
+        self.assertEqual(pickle.loads(pickle.dumps(program)), program)  # noqa: S301
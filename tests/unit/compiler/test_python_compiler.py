@@ -0,0 +1,202 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest import TestCase
+
+import pytz  # type: ignore
+
+from expressions import (
+    Add,
+    And,
+    Boolean,
+    BooleanExpression,
+    Context,
+    Datetime,
+    Div,
+    Equal,
+    Expression,
+    ExpressionArity,
+    GreaterThan,
+    GreaterThanOrEqual,
+    LessThan,
+    LessThanOrEqual,
+    Mod,
+    Mul,
+    Not,
+    NotEqual,
+    Null,
+    Number,
+    Or,
+    String,
+    Sub,
+    Timedelta,
+)
+from expressions.compiler import compile_expression
+from expressions.exceptions import (
+    ExpressionEvaluationError,
+    VariableNotFoundError,
+    VariableTypeError,
+)
+from tests.unit.variables import (
+    boolean_variable,
+    datetime_variable,
+    numeric_variable,
+    string_variable,
+)
+
+
+class FailingExpression(BooleanExpression):
+    """Boolean expression that fails if evaluated."""
+
+    arity = ExpressionArity.NULLARY
+
+    def sub_expressions(self) -> tuple[Expression, ...]:
+        """Return sub-expressions of this expression."""
+        return ()
+
+    def evaluate(self, context: Context) -> bool:
+        """Fail evaluating this expression."""
+        raise AssertionError("expression should not be evaluated")
+
+    def __eq__(self, other: object) -> bool:
+        """Return true if expressions are equal."""
+        return self is other
+
+
+class TestPythonCompiler(TestCase):
+    """Test case for the python compiler."""
+
+    context = Context(
+        x=Decimal(3),
+        y=Decimal("1.5"),
+        name="foo",
+        flag=True,
+        when=datetime(2021, 1, 2, tzinfo=pytz.utc),
+    )
+    expressions: list[Expression] = [
+        Null(),
+        Boolean(True),
+        Number("1.3"),
+        String("hi"),
+        Datetime(datetime(2020, 11, 30, tzinfo=pytz.utc)),
+        Timedelta(timedelta(hours=3)),
+        numeric_variable("x"),
+        string_variable("missing", "default"),
+        Add(numeric_variable("x"), Number(2), numeric_variable("y")),
+        Sub(numeric_variable("x"), Number("0.5")),
+        Mul(Number(2), numeric_variable("y"), Number(3)),
+        Div(numeric_variable("x"), Number(4)),
+        Mod(Number(7), numeric_variable("x")),
+        Not(boolean_variable("flag")),
+        And(boolean_variable("flag"), LessThan(numeric_variable("y"), numeric_variable("x"))),
+        And(Boolean(True), Boolean(False), Boolean(True)),
+        Or(Boolean(False), Equal(string_variable("name"), String("foo"))),
+        Or(Boolean(False), Boolean(False)),
+        NotEqual(string_variable("name"), String("bar")),
+        LessThanOrEqual(Number(3), numeric_variable("x")),
+        GreaterThan(
+            datetime_variable("when"),
+            Datetime(datetime(2020, 11, 30, tzinfo=pytz.utc)),
+        ),
+        GreaterThanOrEqual(Add(Number(1), Number(2)), numeric_variable("x")),
+    ]
+
+    def test_compiled_expression_evaluates_as_expression(self):
+        """Compiled expressions should evaluate to the same value than expressions.
+
+        Given an expression,
+        When it is compiled,
+        Then the compiled function should return the same value than evaluating the expression.
+        """
+        for expr in self.expressions:
+            with self.subTest(expr):
+                compiled = compile_expression(expr)
+                self.assertEqual(compiled(self.context), expr.evaluate(self.context))
+
+    def test_expression_compile(self):
+        """Expression.compile() should return the compiled expression."""
+        expr = Add(Number(1), numeric_variable("x"))
+        self.assertEqual(expr.compile()(self.context), Decimal(4))
+
+    def test_literals_are_inlined(self):
+        """Literals with a python literal representation should be inlined in the source."""
+        compiled = compile_expression(Equal(String("hello"), string_variable("name")))
+        self.assertIn("'hello'", compiled.source)  # type: ignore
+
+    def test_and_or_short_circuit(self):
+        """And and Or should not evaluate sub-expressions after the result is known."""
+        for expr in [
+            And(Boolean(False), FailingExpression()),
+            Or(Boolean(True), FailingExpression()),
+        ]:
+            with self.subTest(expr):
+                compiled = compile_expression(expr)
+                self.assertEqual(compiled(self.context), expr.evaluate(self.context))
+
+    def test_unknown_expressions_are_evaluated(self):
+        """Expressions unknown to the compiler should be evaluated with their evaluate() method."""
+        compiled = compile_expression(And(Boolean(True), FailingExpression()))
+        with self.assertRaises(AssertionError):
+            compiled(self.context)
+
+    def test_compiled_expressions_raise_like_expressions(self):
+        """Compiled expressions should raise the same exceptions than expressions."""
+        cases = [
+            (Div(Number(1), Number(0)), ExpressionEvaluationError),
+            (numeric_variable("not_there"), VariableNotFoundError),
+            (numeric_variable("name"), VariableTypeError),
+        ]
+        for expr, exception in cases:
+            with self.subTest(expr):
+                compiled = compile_expression(expr)
+                with self.assertRaises(exception):
+                    compiled(self.context)
+
+    def test_binary_expressions_with_wrong_arity(self):
+        """Binary expressions should use their first two operands only, like evaluate().
+
+        Given binary expressions built with more or less than two operands,
+        When they are compiled,
+        Then the compiled functions should return or raise like evaluating the expressions.
+        """
+        for expr in [
+            LessThan(Number(1), Number(2), Number(0)),
+            Sub(Number(5), Number(1), Number(1)),
+            Div(Number(6), Number(2), Number(0)),
+        ]:
+            with self.subTest(expr):
+                compiled = compile_expression(expr)
+                self.assertEqual(compiled(self.context), expr.evaluate(self.context))
+        for expr in [Equal(Number(1)), Div(Number(1))]:
+            with self.subTest(expr):
+                compiled = compile_expression(expr)
+                with self.assertRaises(IndexError):
+                    compiled(self.context)
+
+    def test_chains_are_flattened(self):
+        """Nested Add, Mul, And and Or should be compiled into a single python expression."""
+        compiled = compile_expression(
+            And(
+                GreaterThan(Add(Add(numeric_variable("x"), Number(2)), Number(3)), Number(1)),
+                And(boolean_variable("flag"), Boolean(True)),
+            ),
+        )
+        source = compiled.source.splitlines()[-2]  # type: ignore
+        self.assertEqual(source.count("0 + _v0(context) + "), 1)
+        self.assertEqual(source.count("True if"), 1)
+
+    def test_deep_expressions(self):
+        """Expressions of any depth should be compiled.
+
+        Given deep expressions, nested beyond the nesting limits of the python parser
+        When they are compiled
+        Then the compiled function should return the same value than evaluating the expression.
+        """
+        left_deep: Expression = numeric_variable("x")
+        nested: Expression = numeric_variable("x")
+        for _ in range(150):
+            left_deep = Add(left_deep, numeric_variable("y"))
+            nested = Sub(Mul(nested, Number(1)), Number(1))
+        for expr in [left_deep, nested, GreaterThan(nested, left_deep)]:
+            with self.subTest(expr.__class__):
+                compiled = compile_expression(expr)
+                self.assertEqual(compiled(self.context), expr.evaluate(self.context))
@@ -1,8 +1,8 @@
 from decimal import Decimal
 from unittest import TestCase
 
-from expressions import Add, Arithmetic, Div, Mod, Mul, Number, Sub
-from expressions.exceptions import ExpressionEvaluationError
+from expressions import Add, Arithmetic, Context, Div, Mod, Mul, Number, String, Sub, Variable
+from expressions.exceptions import ExpressionEvaluationError, ExpressionValidationError
 
 
 class TestArithmetic(TestCase):
@@ -55,3 +55,15 @@ class TestArithmetic(TestCase):
         expr = Div(Number(1), Number(0))
         with self.assertRaises(ExpressionEvaluationError):
             expr.evaluate({})
+
+    def test_accepts_numeric_variables(self):
+        """Arithmetic operations accept variables with numeric return type."""
+        expr = Add(Variable("x", Decimal), Number(2))
+        self.assertEqual(expr.evaluate(Context(x=Decimal(1))), Decimal(3))
+
+    def test_raises_on_non_numeric_sub_expressions(self):
+        """Arithmetic operations raise if sub-expressions are not numeric."""
+        for sub_expr in [String("hi"), Variable("x", str)]:
+            with self.subTest(sub_expr):
+                with self.assertRaises(ExpressionValidationError):
+                    Add(sub_expr, Number(2))
@@ -1,5 +1,6 @@
 # pylint: disable=abstract-class-instantiated
 from datetime import datetime, timedelta
+from decimal import Decimal
 from itertools import product
 from operator import eq, ge, gt, le, lt, ne
 from unittest import TestCase
@@ -7,7 +8,9 @@ from unittest import TestCase
 import pytz
 
 from expressions import (
+    Add,
     Boolean,
+    Context,
     Datetime,
     Equal,
     Expression,
@@ -19,7 +22,9 @@ from expressions import (
     Number,
     String,
     Timedelta,
+    Variable,
 )
+from expressions.exceptions import ExpressionValidationError
 
 V = bool | int | float | str | datetime | timedelta
 
@@ -63,3 +68,15 @@ class TestComparison(TestCase):
                         right = expr_class(right_val)
                         compare = compare_class(left, right)
                         self.assertEqual(compare.evaluate({}), operator(left_val, right_val))
+
+    def test_accepts_sub_expressions_with_same_return_type(self):
+        """Comparisons accept any sub-expressions evaluating to the same type."""
+        compare = LessThan(Add(Number(1), Variable("x", Decimal)), Number(5))
+        self.assertTrue(compare.evaluate(Context(x=Decimal(3))))
+        compare = Equal(Variable("name", str), String("foo"))
+        self.assertTrue(compare.evaluate(Context(name="foo")))
+
+    def test_raises_on_sub_expressions_with_different_return_type(self):
+        """Comparisons raise if sub-expressions evaluate to different types."""
+        with self.assertRaises(ExpressionValidationError):
+            Equal(Variable("name", str), Number(3))
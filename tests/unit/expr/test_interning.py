@@ -0,0 +1,74 @@
+import gc
+from decimal import Decimal
+from unittest import TestCase
+
+from expressions import (
+    Add,
+    And,
+    Equal,
+    ExpressionInterner,
+    GreaterThan,
+    Number,
+    String,
+    Variable,
+)
+from expressions.parser import JsonParser, PrimitiveParser
+
+
+class TestExpressionInterner(TestCase):
+    """Test case for expression interning."""
+
+    def setUp(self):
+        """Create interner for each test."""
+        self.interner = ExpressionInterner()
+
+    def test_equal_expressions_are_shared(self):
+        """Interning equal expressions should return the same instance.
+
+        Given two structurally equal expressions built independently,
+        When both are interned,
+        Then the same instance should be returned for both.
+        """
+        first = self.interner.intern(GreaterThan(Variable("amount", Decimal), Number(100)))
+        second = self.interner.intern(GreaterThan(Variable("amount", Decimal), Number(100)))
+        self.assertIs(first, second)
+
+    def test_equal_sub_expressions_are_shared(self):
+        """Equal sub-expressions of different expressions should be shared."""
+        first = self.interner.intern(Equal(Variable("country", str), String("ES")))
+        second = self.interner.intern(Equal(Variable("country", str), String("UK")))
+        self.assertIs(first.sub_expressions()[0], second.sub_expressions()[0])
+        self.assertIsNot(first, second)
+
+    def test_interned_expression_is_equal_to_original(self):
+        """Interned expressions should be equal to the original expression."""
+        expr = And(
+            GreaterThan(Variable("amount", Decimal), Number(100)),
+            GreaterThan(Add(Variable("amount", Decimal), Number(1)), Number(100)),
+        )
+        self.assertEqual(self.interner.intern(expr), expr)
+
+    def test_literals_with_different_representation_are_not_shared(self):
+        """Equal literals with different representation should not be shared."""
+        first = self.interner.intern(Number("1"))
+        second = self.interner.intern(Number("1.0"))
+        self.assertIsNot(first, second)
+
+    def test_create(self):
+        """create() should build and intern the expression."""
+        expr = self.interner.create(Variable, "country", str)
+        self.assertIs(expr, self.interner.create(Variable, "country", str))
+
+    def test_unused_expressions_are_released(self):
+        """Interned expressions no longer referenced should be removed from the registry."""
+        self.interner.intern(Equal(Variable("country", str), String("ES")))
+        gc.collect()
+        self.assertEqual(len(self.interner), 0)
+
+    def test_parsers_intern_expressions(self):
+        """Parsers with an interner should return interned expressions."""
+        for parser in [PrimitiveParser(self.interner), JsonParser(self.interner)]:
+            with self.subTest(parser):
+                expr = Equal(Variable("country", str), String("ES"))
+                serialised = parser.serialise(expr)
+                self.assertIs(parser.parse(serialised), parser.parse(serialised))
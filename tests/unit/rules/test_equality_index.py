@@ -0,0 +1,154 @@
+from decimal import Decimal
+from unittest import TestCase
+from unittest.mock import patch
+
+from expressions import (
+    And,
+    Context,
+    Equal,
+    GreaterThan,
+    LessThanOrEqual,
+    Number,
+    Or,
+    String,
+)
+from expressions.compiler import PythonCompiler
+from expressions.numeric import FLOAT, INT
+from expressions.rules import EqualityIndex, IndexedRuleSet, RuleSet
+from tests.unit.variables import numeric_variable, string_variable
+
+COUNTRY = string_variable("country")
+AMOUNT = numeric_variable("amount")
+
+
+class TestEqualityIndex(TestCase):
+    """Test case for equality indexes."""
+
+    def test_candidates_are_rules_with_equal_value(self):
+        """candidates() should return only the rules whose equality condition holds.
+
+        Given an equality index with rules comparing variables with literals,
+        When candidates are requested for a context,
+        Then only the rules comparing with the values of the context should be returned.
+        """
+        index = EqualityIndex()
+        self.assertTrue(index.add("es", Equal(COUNTRY, String("ES"))))
+        self.assertTrue(index.add("uk", Equal(String("UK"), COUNTRY)))
+        self.assertTrue(
+            index.add("big-es", And(GreaterThan(AMOUNT, Number(1)), Equal(COUNTRY, String("ES")))),
+        )
+        self.assertTrue(index.add("one", And(And(Equal(AMOUNT, Number(1))))))
+        self.assertEqual(len(index), 4)
+
+        context = Context(country="ES", amount=Decimal("1.0"))
+        self.assertEqual(index.candidates(context), {"es", "big-es", "one"})
+        self.assertEqual(index.candidates(Context(country="FR", amount=Decimal(2))), set())
+        # rules reading missing variables raise when evaluated
+        self.assertEqual(index.candidates(Context(country="FR")), {"one"})
+
+    def test_rules_without_equality_are_not_indexed(self):
+        """Rules without equality conditions required to match should not be indexed."""
+        index = EqualityIndex()
+        self.assertFalse(index.add("big", GreaterThan(AMOUNT, Number(1))))
+        self.assertFalse(
+            index.add("or", Or(Equal(COUNTRY, String("ES")), Equal(AMOUNT, Number(1)))),
+        )
+        self.assertFalse(index.add("literals", Equal(String("ES"), String("ES"))))
+        self.assertEqual(len(index), 0)
+
+    def test_variable_defaults(self):
+        """Variables should be resolved with their own defaults."""
+        index = EqualityIndex()
+        index.add("default", Equal(string_variable("country", "ES"), String("ES")))
+        index.add("other-default", Equal(string_variable("country", "UK"), String("ES")))
+        self.assertEqual(index.candidates(Context()), {"default"})
+
+
+class TestIndexedRuleSet(TestCase):
+    """Test case for indexed rule sets."""
+
+    rules = {
+        "spain": Equal(COUNTRY, String("ES")),
+        "big": GreaterThan(AMOUNT, Number(100)),
+        "big-spain": And(Equal(COUNTRY, String("ES")), GreaterThan(AMOUNT, Number(100))),
+        "uk": Equal(String("UK"), COUNTRY),
+        "spain-or-big": Or(Equal(COUNTRY, String("ES")), GreaterThan(AMOUNT, Number(100))),
+    }
+
+    def test_match_is_equal_to_ruleset(self):
+        """match() should return the same rules than a not indexed rule set.
+
+        Given an indexed rule set and a rule set with the same rules,
+        When both are matched against a context,
+        Then they should return the same rule ids.
+        """
+        indexed_rule_set = IndexedRuleSet(self.rules)
+        rule_set = RuleSet(self.rules)
+        contexts = [
+            Context(country="ES", amount=Decimal(200)),
+            Context(country="ES", amount=Decimal(5)),
+            Context(country="UK", amount=Decimal(500)),
+            Context(country="FR", amount=Decimal(1)),
+        ]
+        for context in contexts:
+            with self.subTest(context):
+                self.assertEqual(indexed_rule_set.match(context), rule_set.match(context))
+
+    def test_numeric_backends(self):
+        """match() should return the same rules and errors than a not indexed rule set.
+
+        Given an indexed rule set and a rule set comparing a variable with literal numbers
+        When both are matched against contexts with the float and int numeric backends
+        Then they should return the same rule ids and errors.
+        """
+        rules = {
+            "eq": Equal(AMOUNT, Number("0.1")),
+            "le": LessThanOrEqual(AMOUNT, Number("0.1")),
+            "three": Equal(AMOUNT, Number(3)),
+            "big": GreaterThan(AMOUNT, Number("2.5")),
+        }
+        indexed_rule_set = IndexedRuleSet(rules, indexes=[EqualityIndex()])
+        rule_set = RuleSet(rules)
+        for backend, amount in [(FLOAT, 0.1), (FLOAT, 3.0), (INT, 3), (INT, 0)]:
+            context = Context(amount=amount)
+            context.numeric_backend = backend
+            with self.subTest(backend=backend, amount=amount):
+                indexed_errors: dict = {}
+                errors: dict = {}
+                self.assertEqual(
+                    indexed_rule_set.match(context, indexed_errors),
+                    rule_set.match(context, errors),
+                )
+                self.assertEqual(indexed_errors.keys(), errors.keys())
+
+    def test_variables_that_cannot_be_resolved(self):
+        """Errors resolving the variables of the indexes should be reported like in rule sets."""
+        context = Context(amount=Decimal(200))
+        context.add_provider("country", lambda: 1 / 0)
+        indexed_errors: dict = {}
+        errors: dict = {}
+        self.assertEqual(
+            IndexedRuleSet(self.rules).match(context, indexed_errors),
+            RuleSet(self.rules).match(context, errors),
+        )
+        self.assertEqual(set(indexed_errors), {"spain", "big-spain", "uk", "spain-or-big"})
+        self.assertEqual(indexed_errors.keys(), errors.keys())
+
+    def test_only_candidates_are_evaluated(self):
+        """Only candidate rules should be evaluated."""
+        indexed_rule_set = IndexedRuleSet(self.rules, indexes=[EqualityIndex()])
+        self.assertEqual(
+            indexed_rule_set.candidates(Context(country="FR", amount=Decimal(1))),
+            ["big", "spain-or-big"],
+        )
+
+        errors: dict = {}
+        self.assertEqual(indexed_rule_set.match(Context(country="UK"), errors), ["uk"])
+        self.assertEqual(set(errors), {"big", "spain-or-big"})
+
+    def test_rules_that_cannot_be_compiled_are_evaluated(self):
+        """Rules that can't be compiled should be evaluated calling their evaluate() method."""
+        with patch.object(PythonCompiler, "compile", side_effect=RecursionError):
+            indexed_rule_set = IndexedRuleSet(self.rules)
+        context = Context(country="ES", amount=Decimal(200))
+        self.assertEqual(indexed_rule_set.match(context), RuleSet(self.rules).match(context))
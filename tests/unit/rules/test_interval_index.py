@@ -0,0 +1,248 @@
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest import TestCase
+
+import pytz  # type: ignore
+
+from expressions import (
+    And,
+    Context,
+    Datetime,
+    Equal,
+    GreaterThan,
+    GreaterThanOrEqual,
+    LessThan,
+    LessThanOrEqual,
+    Number,
+    String,
+    Timedelta,
+)
+from expressions.numeric import FLOAT, INT
+from expressions.rules import IndexedRuleSet, Interval, IntervalIndex, RuleSet
+from tests.unit.variables import (
+    datetime_variable,
+    numeric_variable,
+    string_variable,
+    timedelta_variable,
+)
+
+AMOUNT = numeric_variable("amount")
+TS = datetime_variable("ts")
+DURATION = timedelta_variable("duration")
+COMPARISONS = [GreaterThan, GreaterThanOrEqual, LessThan, LessThanOrEqual]
+
+
+class TestInterval(TestCase):
+    """Test case for intervals."""
+
+    def test_restrict(self):
+        """Restricting an interval should keep the tightest bounds."""
+        interval = Interval()
+        interval.restrict("lower", 1, True)
+        interval.restrict("lower", 0, False)
+        interval.restrict("upper", 5, True)
+        interval.restrict("upper", 5, False)
+        self.assertEqual(repr(interval), "[1, 5)")
+        self.assertTrue(interval.contains(1))
+        self.assertFalse(interval.contains(5))
+        self.assertFalse(interval.is_empty())
+
+        interval.restrict("lower", 5, True)
+        self.assertTrue(interval.is_empty())
+
+
+class TestIntervalIndex(TestCase):
+    """Test case for interval indexes."""
+
+    def test_candidates_are_rules_containing_value(self):
+        """candidates() should return only the rules whose ranges contain the context values.
+
+        Given an interval index with rules comparing variables with literals,
+        When candidates are requested for a context,
+        Then only the rules whose ranges contain the values of the context should be returned.
+        """
+        index = IntervalIndex()
+        day = datetime(2024, 1, 1, tzinfo=pytz.utc)
+        rules = {
+            "small": LessThan(AMOUNT, Number(10)),
+            "medium": And(GreaterThanOrEqual(AMOUNT, Number(10)), LessThan(AMOUNT, Number(100))),
+            "big": LessThanOrEqual(Number(100), AMOUNT),
+            "before": LessThan(TS, Datetime(day)),
+            "short": GreaterThan(Timedelta(timedelta(hours=1)), DURATION),
+            "empty": And(GreaterThan(AMOUNT, Number(10)), LessThan(AMOUNT, Number(10))),
+        }
+        for rule_id, rule in rules.items():
+            self.assertTrue(index.add(rule_id, rule))
+        self.assertEqual(len(index), 6)
+
+        values = {"amount": Decimal(5), "ts": day, "duration": timedelta(hours=2)}
+        cases = [
+            ({}, {"small"}),
+            ({"amount": Decimal(10)}, {"medium"}),
+            ({"amount": Decimal(100)}, {"big"}),
+            ({"ts": day - timedelta(seconds=1)}, {"small", "before"}),
+            ({"duration": timedelta(minutes=5), "amount": Decimal(500)}, {"short", "big"}),
+        ]
+        for changes, expected in cases:
+            with self.subTest(changes):
+                self.assertEqual(index.candidates(Context(**{**values, **changes})), expected)
+        # rules reading missing variables raise when evaluated
+        self.assertEqual(index.candidates(Context(amount=Decimal(5))), {"small", "before", "short"})
+
+    def test_values_that_cannot_be_compared(self):
+        """Rules on NaN, and on values that can't be compared with the bounds, should be candidates.
+
+        Given an interval index with rules comparing variables with numbers, NaN and datetimes
+        When candidates are requested for contexts with NaN and with naive datetimes
+        Then all indexed rules should be returned, and the rule comparing with NaN should not be
+        indexed.
+        """
+        rules = {
+            "small": LessThan(AMOUNT, Number(10)),
+            "big": GreaterThan(AMOUNT, Number(100)),
+            "before": LessThan(TS, Datetime(datetime(2024, 1, 1, tzinfo=pytz.utc))),
+        }
+        index = IntervalIndex()
+        for rule_id, rule in rules.items():
+            index.add(rule_id, rule)
+        self.assertFalse(index.add("nan", GreaterThan(AMOUNT, Number(Decimal("NaN")))))
+        rules["nan"] = GreaterThan(AMOUNT, Number(Decimal("NaN")))
+        indexed_rule_set = IndexedRuleSet(rules, indexes=[IntervalIndex()])
+        rule_set = RuleSet(rules)
+        naive = datetime(2023, 1, 1)  # noqa: DTZ001
+        contexts = [Context(amount=value, ts=naive) for value in [Decimal("NaN"), Decimal("sNaN")]]
+        contexts.append(Context(amount=float("nan"), ts=naive))
+        contexts[-1].numeric_backend = FLOAT
+        for context in contexts:
+            with self.subTest(context):
+                self.assertEqual(index.candidates(context), {"small", "big", "before"})
+                indexed_errors: dict = {}
+                errors: dict = {}
+                self.assertEqual(
+                    indexed_rule_set.match(context, indexed_errors),
+                    rule_set.match(context, errors),
+                )
+                self.assertEqual(indexed_errors.keys(), errors.keys())
+
+    def test_rules_without_ranges_are_not_indexed(self):
+        """Rules without range conditions required to match should not be indexed."""
+        index = IntervalIndex()
+        self.assertFalse(index.add("equal", Equal(AMOUNT, Number(1))))
+        self.assertFalse(index.add("string", LessThan(string_variable("name"), String("b"))))
+        self.assertFalse(index.add("literals", LessThan(Number(1), Number(2))))
+        self.assertEqual(len(index), 0)
+
+    def test_random_ranges(self):
+        """Candidates should be the rules that match, for random ranges and values."""
+        rng = random.Random(0)  # noqa: S311
+        rules = {}
+        for i in range(300):
+            conditions = []
+            for _ in range(rng.randint(1, 2)):
+                comparison = rng.choice(COMPARISONS)
+                operands = [AMOUNT, Number(rng.randint(0, 50))]
+                rng.shuffle(operands)
+                conditions.append(comparison(*operands))
+            rules[i] = And(*conditions) if len(conditions) > 1 else conditions[0]
+        index = IntervalIndex()
+        for rule_id, rule in rules.items():
+            index.add(rule_id, rule)
+
+        for value in range(-1, 52):
+            context = Context(amount=Decimal(value))
+            with self.subTest(value=value):
+                expected = {rule_id for rule_id, rule in rules.items() if rule.evaluate(context)}
+                self.assertEqual(index.candidates(context), expected)
+
+    def test_indexed_ruleset(self):
+        """Indexed rule sets should match the same rules than not indexed ones."""
+        rules = {
+            "es": Equal(string_variable("country"), String("ES")),
+            "small": LessThan(AMOUNT, Number(10)),
+            "big": GreaterThan(AMOUNT, Number(100)),
+        }
+        indexed_rule_set = IndexedRuleSet(rules)
+        rule_set = RuleSet(rules)
+        for context in [
+            Context(country="ES", amount=Decimal(1)),
+            Context(country="UK", amount=Decimal(200)),
+            Context(country="UK", amount=Decimal(50)),
+        ]:
+            with self.subTest(context):
+                self.assertEqual(indexed_rule_set.match(context), rule_set.match(context))
+                self.assertEqual(indexed_rule_set.candidates(context), rule_set.match(context))
+
+    def test_numeric_backends(self):
+        """match() should return the same rules and errors than a not indexed rule set.
+
+        Given an indexed rule set and a rule set comparing a variable with literal numbers
+        When both are matched against contexts with the float and int numeric backends
+        Then they should return the same rule ids and errors.
+        """
+        rules = {
+            "le": LessThanOrEqual(AMOUNT, Number("0.1")),
+            "gt": GreaterThan(AMOUNT, Number("0.1")),
+            "between": And(GreaterThanOrEqual(AMOUNT, Number(1)), LessThan(AMOUNT, Number(5))),
+            "big": GreaterThan(AMOUNT, Number("2.5")),
+        }
+        indexed_rule_set = IndexedRuleSet(rules, indexes=[IntervalIndex()])
+        rule_set = RuleSet(rules)
+        for backend, amount in [(FLOAT, 0.1), (FLOAT, 3.0), (INT, 3), (INT, 0)]:
+            context = Context(amount=amount)
+            context.numeric_backend = backend
+            with self.subTest(backend=backend, amount=amount):
+                indexed_errors: dict = {}
+                errors: dict = {}
+                self.assertEqual(
+                    indexed_rule_set.match(context, indexed_errors),
+                    rule_set.match(context, errors),
+                )
+                self.assertEqual(indexed_errors.keys(), errors.keys())
+
+    def test_variables_that_cannot_be_resolved(self):
+        """Rules reading variables that can't be resolved should be reported as errors.
+
+        Given an indexed rule set with range rules on a variable whose provider fails
+        When it is matched against a context
+        Then the rules on that variable should be in the errors, and the others should match.
+        """
+        rules = {
+            "small": LessThan(AMOUNT, Number(10)),
+            "big": GreaterThan(AMOUNT, Number(100)),
+            "short": LessThan(DURATION, Timedelta(timedelta(hours=1))),
+        }
+        context = Context(duration=timedelta(minutes=1))
+        context.add_provider("amount", lambda: 1 / 0)
+        errors: dict = {}
+        self.assertEqual(IndexedRuleSet(rules).match(context, errors), ["short"])
+        self.assertEqual(errors.keys(), {"small", "big"})
+
+    def test_bounds_that_cannot_be_compared(self):
+        """Rules with bounds that can't be compared with the indexed ones should not be indexed.
+
+        Given an indexed rule set with rules comparing a variable with naive and aware datetimes
+        When it is matched against contexts with naive and aware datetimes
+        Then it should return the same rule ids and errors than a not indexed rule set.
+        """
+        naive = datetime(2024, 1, 1)  # noqa: DTZ001
+        aware = datetime(2024, 1, 1, tzinfo=pytz.utc)
+        rules = {
+            "naive": GreaterThan(TS, Datetime(naive)),
+            "aware": GreaterThan(TS, Datetime(aware)),
+            "aware-before": LessThan(TS, Datetime(aware)),
+        }
+        index = IntervalIndex()
+        indexed = [index.add(rule_id, rule) for rule_id, rule in rules.items()]
+        self.assertEqual(indexed, [True, False, False])
+        indexed_rule_set = IndexedRuleSet(rules)
+        rule_set = RuleSet(rules)
+        for ts in [naive + timedelta(days=1), aware + timedelta(days=1)]:
+            with self.subTest(ts=ts):
+                indexed_errors: dict = {}
+                errors: dict = {}
+                self.assertEqual(
+                    indexed_rule_set.match(Context(ts=ts), indexed_errors),
+                    rule_set.match(Context(ts=ts), errors),
+                )
+                self.assertEqual(indexed_errors.keys(), errors.keys())
@@ -0,0 +1,148 @@
+import asyncio
+from decimal import Decimal
+from unittest import TestCase
+from unittest.mock import patch
+
+from expressions import (
+    And,
+    Context,
+    Div,
+    Equal,
+    GreaterThan,
+    LessThan,
+    Not,
+    Number,
+    Or,
+    String,
+)
+from expressions.exceptions import (
+    ContextValuePendingError,
+    ExpressionEvaluationError,
+    VariableNotFoundError,
+)
+from expressions.rules import IndexedRuleSet, RuleSet
+from expressions.rules.ruleset import RuleSetCompiler
+from tests.unit.compiler.test_python_compiler import FailingExpression
+from tests.unit.variables import numeric_variable, string_variable
+
+IS_ES = Equal(string_variable("country"), String("ES"))
+IS_BIG = GreaterThan(numeric_variable("amount"), Number(100))
+
+
+class TestRuleSet(TestCase):
+    """Test case for rule sets."""
+
+    rules = {
+        "spain": IS_ES,
+        "big": IS_BIG,
+        "big-spain": And(IS_ES, IS_BIG),
+        "small-or-not-spain": Or(Not(IS_ES), LessThan(numeric_variable("amount"), Number(10))),
+    }
+    contexts = [
+        Context(country="ES", amount=Decimal(200)),
+        Context(country="ES", amount=Decimal(5)),
+        Context(country="UK", amount=Decimal(500)),
+    ]
+
+    def test_match_returns_matching_rules(self):
+        """match() should return the ids of the rules evaluating to true.
+
+        Given a rule set,
+        When it is matched against a context,
+        Then it should return the ids of the rules that evaluate to true in that context.
+        """
+        rule_set = RuleSet(self.rules)
+        for context in self.contexts:
+            with self.subTest(context):
+                expected = [
+                    rule_id for rule_id, rule in self.rules.items() if rule.evaluate(context)
+                ]
+                self.assertEqual(rule_set.match(context), expected)
+
+    def test_rules_as_pairs(self):
+        """Rule sets can be created from (id, rule) pairs."""
+        rule_set = RuleSet([(1, IS_ES), (2, IS_BIG)])
+        self.assertEqual(len(rule_set), 2)
+        self.assertEqual(rule_set.match(self.contexts[1]), [1])
+
+    def test_variables_are_resolved_once(self):
+        """Every distinct variable should be read from the context once per match."""
+        context = self.contexts[0]
+        rule_set = RuleSet(self.rules)
+        with patch.object(context, "get", wraps=context.get) as get:
+            rule_set.match(context)
+        self.assertEqual(sorted(call.args[0] for call in get.call_args_list), ["amount", "country"])
+
+    def test_failing_rules_do_not_match(self):
+        """Rules raising should not match, and their errors should be reported."""
+        rule_set = RuleSet(
+            {
+                "missing": Equal(string_variable("missing"), String("x")),
+                "div": GreaterThan(Div(Number(1), Number(0)), Number(0)),
+                "short-circuit": And(Not(IS_ES), Equal(string_variable("missing"), String("x"))),
+                "spain": IS_ES,
+            },
+        )
+        errors: dict = {}
+        self.assertEqual(rule_set.match(self.contexts[0], errors), ["spain"])
+        self.assertEqual(set(errors), {"missing", "div"})
+        self.assertIsInstance(errors["missing"], VariableNotFoundError)
+        self.assertIsInstance(errors["div"], ExpressionEvaluationError)
+
+    def test_any_error_is_reported(self):
+        """Rules raising any exception should not match, and their errors should be reported."""
+        rule_set = RuleSet({"failing": Or(Not(IS_ES), FailingExpression()), "spain": IS_ES})
+        errors: dict = {}
+        self.assertEqual(rule_set.match(self.contexts[0], errors), ["spain"])
+        self.assertIsInstance(errors["failing"], AssertionError)
+
+    def test_rules_that_cannot_be_compiled_are_evaluated(self):
+        """Rules that can't be compiled should be evaluated, without affecting other rules."""
+        with patch.object(RuleSetCompiler, "_gen_not", side_effect=RecursionError):
+            rule_set = RuleSet(self.rules)
+        for context in self.contexts:
+            with self.subTest(context):
+                expected = [
+                    rule_id for rule_id, rule in self.rules.items() if rule.evaluate(context)
+                ]
+                self.assertEqual(rule_set.match(context), expected)
+
+    def test_variables_are_resolved_lazily(self):
+        """Variables should be resolved when read, so providers of unread variables aren't used."""
+        rule_set = RuleSet({"big-spain": And(IS_ES, IS_BIG)})
+        calls: list[str] = []
+        context = Context(country="UK")
+        context.add_provider("amount", lambda: calls.append("amount") or Decimal(200))
+        self.assertEqual(rule_set.match(context), [])
+        self.assertEqual(calls, [])
+
+        async def fetch_amount():
+            return Decimal(200)
+
+        context = Context(country="UK")
+        context.add_provider("amount", fetch_amount)
+        errors: dict = {}
+        self.assertEqual(rule_set.match(context, errors), [])
+        self.assertEqual(errors, {})
+
+    def test_pending_values_are_raised(self):
+        """Rules reading variables whose asynchronous providers weren't awaited should raise.
+
+        Given a rule set and an indexed rule set,
+        When they are matched against a context with an asynchronous provider not awaited yet,
+        Then ContextValuePendingError should be raised, and the rules should match once it is.
+        """
+
+        async def fetch_amount():
+            return Decimal(200)
+
+        for rule_set in [RuleSet(self.rules), IndexedRuleSet(self.rules)]:
+            with self.subTest(rule_set):
+                context = Context(country="ES")
+                context.add_provider("amount", fetch_amount)
+                errors: dict = {}
+                with self.assertRaises(ContextValuePendingError):
+                    rule_set.match(context, errors)
+                self.assertEqual(errors, {})
+                asyncio.run(context.fetch(["amount"]))
+                self.assertEqual(rule_set.match(context), ["spain", "big", "big-spain"])
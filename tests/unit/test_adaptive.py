@@ -0,0 +1,138 @@
+import time
+from decimal import Decimal
+from unittest import TestCase
+
+from expressions import (
+    And,
+    BooleanExpression,
+    Context,
+    Equal,
+    Expression,
+    ExpressionArity,
+    GreaterThan,
+    Number,
+    Or,
+    String,
+)
+from expressions.adaptive import (
+    AdaptiveAnd,
+    AdaptiveOr,
+    freeze,
+    learned_expression,
+    make_adaptive,
+)
+from expressions.exceptions import VariableNotFoundError
+from tests.unit.compiler.test_python_compiler import FailingExpression
+from tests.unit.variables import boolean_variable, numeric_variable, string_variable
+
+
+class SlowTrue(BooleanExpression):
+    """Boolean expression that is slow to evaluate and always true."""
+
+    arity = ExpressionArity.NULLARY
+
+    def sub_expressions(self) -> tuple[Expression, ...]:
+        """Return sub-expressions of this expression."""
+        return ()
+
+    def evaluate(self, context: Context) -> bool:
+        """Evaluate expression slowly."""
+        time.sleep(0.0001)
+        return True
+
+    def __eq__(self, other: object) -> bool:
+        """Return true if expressions are equal."""
+        return isinstance(other, SlowTrue)
+
+
+# SlowTrue is defined outside the library but is free of side effects
+SlowTrue.__module__ = "expressions.tests"
+
+IS_ES = Equal(string_variable("country"), String("ES"))
+IS_BIG = GreaterThan(numeric_variable("amount"), Number(100))
+
+
+class TestAdaptive(TestCase):
+    """Test case for adaptive logical expressions."""
+
+    contexts = [Context(country="UK", amount=Decimal(i)) for i in range(10)]
+
+    def test_decisive_cheap_operands_go_first(self):
+        """Adaptive expressions should evaluate cheap and decisive operands first.
+
+        Given an adaptive And where the cheap and decisive operand is the last one,
+        When it is evaluated enough times,
+        Then the cheap and decisive operand should be evaluated first.
+        """
+        expr = AdaptiveAnd(SlowTrue(), IS_BIG, IS_ES, reorder_interval=5)
+        for i in range(10):
+            self.assertFalse(expr.evaluate(Context(country="UK", amount=Decimal(i * 25))))
+        self.assertIsInstance(expr.evaluation_order()[-1], SlowTrue)
+
+    def test_adaptive_or(self):
+        """Adaptive Or should evaluate operands deciding true first."""
+        expr = AdaptiveOr(And(SlowTrue(), IS_ES), Equal(string_variable("country"), String("UK")))
+        expr.reorder_interval = 5
+        for i in range(10):
+            self.assertTrue(expr.evaluate(Context(country=["UK", "ES"][i % 2])))
+        self.assertIsInstance(expr.evaluation_order()[0], Equal)
+
+    def test_adaptive_expressions_evaluate_as_expression(self):
+        """Adaptive expressions should evaluate to the same values than the original."""
+        expr = Or(And(IS_ES, IS_BIG), And(SlowTrue(), IS_BIG))
+        adaptive = make_adaptive(expr, reorder_interval=2)
+        self.assertIsInstance(adaptive, AdaptiveOr)
+        for context in [*self.contexts, Context(country="ES", amount=Decimal(200))]:
+            with self.subTest(context):
+                self.assertEqual(adaptive.evaluate(context), expr.evaluate(context))
+
+    def test_expressions_with_side_effects_are_not_adaptive(self):
+        """And and Or with operands unknown to be free of side effects should not be adaptive."""
+        adaptive = make_adaptive(And(IS_ES, FailingExpression()))
+        self.assertNotIsInstance(adaptive, AdaptiveAnd)
+
+    def test_raising_operand_restores_order(self):
+        """If an operand raises, the original order should be restored and adaptation stopped."""
+        expr = AdaptiveAnd(Equal(string_variable("missing"), String("x")), IS_BIG)
+        expr.reorder_interval = 1
+        with self.assertRaises(VariableNotFoundError):
+            expr.evaluate(self.contexts[0])
+        self.assertTrue(expr.frozen)
+        self.assertEqual(expr.evaluation_order(), expr.sub_expressions())
+
+    def test_guards_are_evaluated_first(self):
+        """Operands guarded by other operands should be evaluated only when guards allow it.
+
+        Given an adaptive And whose first operand checks that the variable of the second is present
+        When it is evaluated in contexts with and without the variable
+        Then it should evaluate as the original expression, never raising VariableNotFoundError.
+        """
+        expr = And(boolean_variable("has"), GreaterThan(numeric_variable("y"), Number(1)))
+        adaptive = make_adaptive(expr, reorder_interval=2)
+        contexts = [
+            Context(has=False),
+            Context(has=False),
+            Context(has=False),
+            Context(has=True, y=Decimal(0)),
+            Context(has=True, y=Decimal(0)),
+            Context(has=True, y=Decimal(0)),
+            Context(has=True, y=Decimal(0)),
+            Context(has=False),
+        ] * 3
+        for i, context in enumerate(contexts):
+            with self.subTest(i):
+                self.assertEqual(adaptive.evaluate(context), expr.evaluate(context))
+
+    def test_freeze_and_learned_expression(self):
+        """Frozen expressions should keep their order and can be converted to plain expressions."""
+        adaptive = make_adaptive(And(SlowTrue(), IS_BIG, IS_ES), reorder_interval=5)
+        for context in self.contexts:
+            adaptive.evaluate(context)
+        freeze(adaptive)
+        order = adaptive.evaluation_order()  # type: ignore
+        for context in self.contexts:
+            adaptive.evaluate(context)
+        self.assertEqual(adaptive.evaluation_order(), order)  # type: ignore
+        learned = learned_expression(adaptive)
+        self.assertIs(type(learned), And)
+        self.assertEqual(learned.sub_expressions(), order)
@@ -0,0 +1,127 @@
+import asyncio
+from decimal import Decimal
+from unittest import IsolatedAsyncioTestCase
+
+from expressions import Add, And, Context, GreaterThan, Number, Or, Variable
+from expressions.asynchronous import evaluate_async
+from expressions.exceptions import (
+    ContextValuePendingError,
+    ExpressionEvaluationError,
+    VariableTypeError,
+)
+
+
+class FeatureStore:
+    """Local stand-in of a feature store, recording the features fetched."""
+
+    def __init__(self, **features):
+        """Constructor."""
+        self.features = features
+        self.fetched: list[str] = []
+        self.concurrent = 0
+        self.max_concurrent = 0
+
+    def provider(self, name):
+        """Return asynchronous provider of a feature."""
+
+        async def fetch():
+            self.fetched.append(name)
+            self.concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self.concurrent)
+            await asyncio.sleep(0)
+            self.concurrent -= 1
+            if isinstance(self.features[name], Exception):
+                raise self.features[name]
+            return self.features[name]
+
+        return fetch
+
+    def context(self, **mapping):
+        """Return context with providers for every feature."""
+        context = Context(**mapping)
+        for name in self.features:
+            context.add_provider(name, self.provider(name))
+        return context
+
+
+def is_big(name):
+    """Return expression checking if a numeric variable is big."""
+    return GreaterThan(Variable(name, Decimal), Number(100))
+
+
+class TestEvaluateAsync(IsolatedAsyncioTestCase):
+    """Test case for evaluate_async()."""
+
+    async def test_only_read_variables_are_fetched(self):
+        """Asynchronous providers should be awaited only for variables actually read.
+
+        Given an expression short-circuiting the reading of some variables,
+        When it's evaluated asynchronously,
+        Then only the providers of the read variables should be awaited.
+        """
+        store = FeatureStore(a=Decimal(50), b=Decimal(200), c=Decimal(300))
+        expr = Or(And(is_big("a"), is_big("c")), is_big("b"))
+        self.assertTrue(await evaluate_async(expr, store.context()))
+        self.assertEqual(store.fetched, ["a", "b"])
+
+    async def test_lookups_are_batched_and_deduplicated(self):
+        """Variables read by many expressions should be fetched concurrently, and once.
+
+        Given many expressions reading the same asynchronous variables,
+        When they are evaluated asynchronously,
+        Then every provider should be awaited once, concurrently with the others.
+        """
+        store = FeatureStore(a=Decimal(50), b=Decimal(200))
+        expressions = {i: And(is_big("a" if i % 2 else "b"), is_big("b")) for i in range(10)}
+        results = await evaluate_async(expressions, store.context())
+        self.assertEqual(
+            [result.value for result in results.values()],
+            [i % 2 == 0 for i in range(10)],
+        )
+        self.assertEqual(sorted(store.fetched), ["a", "b"])
+        self.assertEqual(store.max_concurrent, 2)
+
+    async def test_variables_always_read_are_fetched_together(self):
+        """Variables always read by an expression should be fetched concurrently.
+
+        Given an expression always reading many asynchronous variables,
+        When it's evaluated asynchronously,
+        Then all their providers should be awaited concurrently, in a single round.
+        """
+        store = FeatureStore(a=Decimal(50), b=Decimal(20), c=Decimal(40), d=Decimal(1))
+        total = Add(*(Variable(name, Decimal) for name in "abc"))
+        expr = Or(GreaterThan(total, Number(100)), is_big("d"))
+        self.assertTrue(await evaluate_async(expr, store.context()))
+        self.assertEqual(sorted(store.fetched), ["a", "b", "c"])
+        self.assertEqual(store.max_concurrent, 3)
+
+    async def test_errors(self):
+        """Errors should be captured per expression, and provider errors memoized.
+
+        Given expressions reading variables whose providers raise or return wrong values,
+        When they are evaluated asynchronously,
+        Then every expression should get its own error.
+        """
+        error = ExpressionEvaluationError("feature store unavailable")
+        store = FeatureStore(a=error, b="wrong")
+        context = store.context(c=Decimal(500))
+        results = await evaluate_async(
+            {"a": is_big("a"), "b": is_big("b"), "c": is_big("c")},
+            context,
+        )
+        self.assertIs(results["a"].error, error)
+        self.assertIsInstance(results["b"].error, VariableTypeError)
+        self.assertEqual(results["c"].value, True)
+
+        with self.assertRaises(ExpressionEvaluationError):
+            await evaluate_async(is_big("a"), context)
+        self.assertEqual(sorted(store.fetched), ["a", "b"])
+
+    def test_synchronous_evaluation(self):
+        """Reading asynchronous variables synchronously should raise until they are fetched."""
+        store = FeatureStore(a=Decimal(200))
+        context = store.context()
+        with self.assertRaises(ContextValuePendingError):
+            is_big("a").evaluate(context)
+        asyncio.run(context.fetch(["a"]))
+        self.assertTrue(is_big("a").evaluate(context))
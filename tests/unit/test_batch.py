@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest import TestCase
+
+import numpy as np
+import pytz  # type: ignore
+
+from expressions import (
+    Add,
+    And,
+    Boolean,
+    Context,
+    Datetime,
+    Div,
+    Equal,
+    Expression,
+    GreaterThan,
+    GreaterThanOrEqual,
+    LessThan,
+    LessThanOrEqual,
+    Mod,
+    Mul,
+    Not,
+    NotEqual,
+    Number,
+    Or,
+    String,
+    Sub,
+    Timedelta,
+)
+from expressions.batch import evaluate_batch
+from expressions.exceptions import ExpressionEvaluationError, VariableTypeError
+from tests.unit.variables import (
+    boolean_variable,
+    datetime_variable,
+    numeric_variable,
+    string_variable,
+    timedelta_variable,
+)
+
+
+class TestBatch(TestCase):
+    """Test case for batch evaluation."""
+
+    rows: list[dict] = [
+        {"x": Decimal(3), "y": Decimal("1.5"), "name": "foo", "flag": True},
+        {"x": Decimal(-1), "y": Decimal(2), "name": "bar", "flag": False},
+        {"x": Decimal(0), "y": Decimal(7), "name": "baz", "flag": True},
+    ]
+    columns = {
+        "x": np.array([3.0, -1.0, 0.0]),
+        "y": np.array([1.5, 2.0, 7.0]),
+        "name": np.array(["foo", "bar", "baz"]),
+        "flag": np.array([True, False, True]),
+    }
+    expressions: list[Expression] = [
+        Number(2),
+        Add(numeric_variable("x"), Number(2), numeric_variable("y")),
+        Sub(numeric_variable("x"), Number("0.5")),
+        Mul(Number(2), numeric_variable("y"), Number(3)),
+        Div(numeric_variable("x"), Number(4)),
+        Mod(numeric_variable("y"), Number(2)),
+        Not(boolean_variable("flag")),
+        And(boolean_variable("flag"), LessThan(numeric_variable("y"), numeric_variable("x"))),
+        Or(boolean_variable("flag"), Equal(string_variable("name"), String("bar"))),
+        NotEqual(string_variable("name"), String("bar")),
+        LessThanOrEqual(Number(0), numeric_variable("x")),
+        GreaterThan(numeric_variable("y"), Number(2)),
+        GreaterThanOrEqual(numeric_variable("y"), Number(2)),
+        Add(numeric_variable("x"), numeric_variable("missing", Decimal(10))),
+    ]
+
+    def test_batch_evaluates_as_expression(self):
+        """Batch evaluation should return the value of the expression for every row.
+
+        Given an expression and columns with the values of its variables,
+        When the expression is evaluated in batch,
+        Then the result for every row should be the result of evaluating the expression in the row.
+        """
+        for expr in self.expressions:
+            with self.subTest(expr):
+                result = evaluate_batch(expr, self.columns)
+                expected = [expr.evaluate(Context(**row)) for row in self.rows]
+                self.assertEqual(result.tolist(), [float(value) for value in expected])
+
+    def test_structured_arrays_are_accepted(self):
+        """Batch evaluation should accept structured arrays."""
+        data = np.array([(1.0, 2.0), (3.0, 1.0)], dtype=[("x", "f8"), ("y", "f8")])
+        result = evaluate_batch(LessThan(numeric_variable("x"), numeric_variable("y")), data)
+        self.assertEqual(result.tolist(), [True, False])
+
+    def test_division_by_zero_is_masked(self):
+        """Rows dividing by zero should be masked."""
+        result = evaluate_batch(Div(Number(1), numeric_variable("x")), self.columns)
+        self.assertEqual(result.mask.tolist(), [False, False, True])
+
+    def test_missing_variables_are_masked(self):
+        """Rows with missing variables without default should be masked."""
+        columns = {"x": np.ma.masked_array([1.0, 2.0, 3.0], mask=[False, True, False])}
+        result = evaluate_batch(Add(numeric_variable("x"), Number(1)), columns)
+        self.assertEqual(result.tolist(), [2.0, None, 4.0])
+        result = evaluate_batch(numeric_variable("y"), columns)
+        self.assertTrue(result.mask.all())
+
+    def test_masked_variables_with_default_are_filled(self):
+        """Missing values of variables with default should be filled with the default."""
+        columns = {"x": np.ma.masked_array([1.0, 2.0, 3.0], mask=[False, True, False])}
+        result = evaluate_batch(numeric_variable("x", Decimal(0)), columns)
+        self.assertEqual(result.tolist(), [1.0, 0.0, 3.0])
+
+    def test_and_or_masks_follow_short_circuit(self):
+        """Masked operands of And and Or should only mask rows not decided yet."""
+        divide = GreaterThan(Div(Number(1), numeric_variable("x")), Number(0))
+        result = evaluate_batch(And(boolean_variable("flag"), divide), self.columns)
+        self.assertEqual(result.tolist(), [True, False, None])
+        result = evaluate_batch(Or(divide, boolean_variable("flag")), self.columns)
+        self.assertEqual(result.tolist(), [True, False, None])
+
+    def test_datetimes_and_timedeltas(self):
+        """Datetime and timedelta literals should be compared with numpy columns."""
+        columns = {
+            "when": np.array(["2020-01-01T00:00", "2022-01-01T00:00"], dtype="datetime64[s]"),
+            "duration": np.array([60, 7200], dtype="timedelta64[s]"),
+        }
+        after = GreaterThan(
+            datetime_variable("when"),
+            Datetime(datetime(2021, 1, 1, tzinfo=pytz.utc)),
+        )
+        self.assertEqual(evaluate_batch(after, columns).tolist(), [False, True])
+        longer = GreaterThan(timedelta_variable("duration"), Timedelta(timedelta(hours=1)))
+        self.assertEqual(evaluate_batch(longer, columns).tolist(), [False, True])
+
+    def test_raises_on_wrong_column_type(self):
+        """Batch evaluation should raise if a column has the wrong dtype."""
+        with self.assertRaises(VariableTypeError):
+            evaluate_batch(numeric_variable("name"), self.columns)
+
+    def test_raises_on_columns_with_different_lengths(self):
+        """Batch evaluation should raise if columns have different lengths."""
+        with self.assertRaises(ExpressionEvaluationError):
+            evaluate_batch(Boolean(True), {"x": np.zeros(2), "y": np.zeros(3)})
@@ -0,0 +1,174 @@
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest import TestCase
+
+from expressions import (
+    Add,
+    And,
+    Datetime,
+    Equal,
+    GreaterThan,
+    LessThan,
+    Mul,
+    Not,
+    Number,
+    Or,
+    String,
+    Timedelta,
+    Variable,
+)
+from expressions.exceptions import ParseError
+from expressions.expr.interning import ExpressionInterner
+from expressions.parser import BinaryParser, JsonParser
+from tests.unit import test_parser
+from tests.unit.variables import (
+    boolean_variable,
+    numeric_variable,
+    string_variable,
+    timedelta_variable,
+)
+
+RULE = And(
+    GreaterThan(numeric_variable("amount"), Number("100.25")),
+    Or(
+        Equal(string_variable("country", "uk"), String("uk")),
+        LessThan(Mul(numeric_variable("risk", Decimal("0.5")), Number(3)), Number(2)),
+    ),
+    Not(Equal(string_variable("country", "uk"), String("es"))),
+)
+
+
+class TestBinaryParser(TestCase):
+    """Test case for the binary parser."""
+
+    def test_serialise_and_parse_is_identity(self):
+        """serialise() followed with parse() should be equivalent to identity.
+
+        Given an expression, with any literal and variable
+        When the expression is serialised and parsed
+        Then it should produce the same expression, with values of the same types.
+        """
+        parser = BinaryParser()
+        expressions = [expr for expr, _ in test_parser.TestPrimitivePaser.expr_dct] + [
+            RULE,
+            Number("-0.000"),
+            Number("-123456789012345678901234567890.123"),
+            Number("1E+30"),
+            Number(Decimal("-Infinity")),
+            Datetime(datetime(2020, 1, 2, 3, 4, 5, 6)),  # noqa: DTZ001
+            Datetime(datetime(2020, 1, 2, 3, 4, tzinfo=timezone(timedelta(hours=-5)))),
+            Timedelta(timedelta(days=-3, seconds=5, microseconds=7)),
+            Variable("x", float, 1.5),
+            Variable("x", int, -300),
+            Variable("x", type(None), None),
+            boolean_variable("x", False),
+            Variable("x", list, [1, "a", [True]]),
+            Variable("x", dict, {"a": timedelta(hours=1)}),
+        ]
+        for expr in expressions:
+            with self.subTest(expr):
+                parsed = parser.parse(parser.serialise(expr))
+                self.assertEqual(parsed, expr)
+                self.assertEqual(repr(parsed), repr(expr))
+
+    def test_same_expressions_as_json_parser(self):
+        """Expressions parsed from JSON should be serialised and parsed back identically."""
+        json_parser = JsonParser()
+        parser = BinaryParser()
+        for _, data in test_parser.TestJsonPaser.expr_dct:
+            with self.subTest(data):
+                expr = json_parser.parse(data)
+                parsed = parser.parse(parser.serialise(expr))
+                self.assertEqual(repr(parsed), repr(expr))
+                self.assertEqual(json_parser.serialise(parsed), data)
+
+    def test_serialisation_is_compact(self):
+        """Expressions should be serialised with single byte opcodes, counts and numbers.
+
+        Given expressions
+        When they are serialised
+        Then opcodes and small numbers should take a byte, and strings should be stored once
+        And serialised expressions should be smaller than their JSON serialisation.
+        """
+        parser = BinaryParser()
+        # header, empty string table, 1 and 2 as digits and exponent, add opcode and operands count
+        self.assertEqual(
+            parser.serialise(Add(Number(1), Number(2))),
+            b"X\x01\x00\x00\x05\x02\x00\x05\x04\x00\x49\x02",
+        )
+        data = parser.serialise(RULE)
+        self.assertEqual(data.count(b"country"), 1)
+        self.assertLess(len(data) * 3, len(JsonParser().serialise(RULE)))
+
+    def test_interning(self):
+        """Parsed expressions should be interned with the given interner."""
+        parser = BinaryParser(ExpressionInterner())
+        first = parser.parse(parser.serialise(RULE))
+        second = parser.parse(parser.serialise(RULE))
+        self.assertIs(first, second)
+
+    def test_invalid_data(self):
+        """parse() should raise ParseError when data isn't a valid serialised expression."""
+        parser = BinaryParser()
+        data = parser.serialise(RULE)
+        number = parser.serialise(Number(1))
+        invalid = [
+            b"",
+            b'{"add": [1, 2]}',
+            data[:-1],
+            data[: len(data) // 2],
+            data + number[4:],
+            number[:4] + b"\x49\x02",
+            number[:4] + b"\x7f\x00",
+            number[:4] + b"\x3f",
+        ]
+        for invalid_data in invalid:
+            with self.subTest(invalid_data), self.assertRaises(ParseError):
+                parser.parse(invalid_data)
+
+    def test_invalid_values(self):
+        """parse() should raise ParseError when values or parameters are invalid.
+
+        Given serialised expressions with invalid types, decimals, offsets, or number of parameters
+        When they are parsed
+        Then ParseError should be raised.
+        """
+        parser = BinaryParser()
+        invalid = [
+            b"X\x01\x02\x01\x03\x04xfooN\x02\x07\x00\x0b\x01\x00",
+            b"X\x01\x01\x03\x03NaX\x06\x00",
+            b"X\x01\x00\x00\t\x80\x90\xd8\xc6\x9e\x05\x00",
+            b"X\x01\x00\x00\t\xff\xff\xff\xff\xff\xff\xff\xff\xff\x0f\x00",
+            b"X\x01\x02\x01\x03\x04xintN\x01\x07\x00",
+            b"X\x01\x02\x01\x03\x04xintN\x04\x07\x00\x0b\x01\x00\x00\x00",
+        ]
+        for invalid_data in invalid:
+            with self.subTest(invalid_data), self.assertRaises(ParseError):
+                parser.parse(invalid_data)
+
+    def test_corrupted_data(self):
+        """parse() should raise only ParseError when data is corrupted.
+
+        Given serialised expressions with one of their bytes replaced
+        When they are parsed
+        Then they should be parsed, or ParseError should be raised.
+        """
+        parser = BinaryParser()
+        expressions = [
+            RULE,
+            Datetime(datetime(2020, 1, 1, tzinfo=timezone(timedelta(hours=1)))),
+            Number(Decimal("NaN")),
+            Equal(Timedelta(timedelta(days=1)), timedelta_variable("x", timedelta(hours=1))),
+        ]
+        generator = random.Random(0)  # noqa: S311
+        for expr in expressions:
+            data = bytearray(parser.serialise(expr))
+            for _ in range(500):
+                corrupted = bytearray(data)
+                corrupted[generator.randrange(len(data))] = generator.randrange(256)
+                with self.subTest(bytes(corrupted)):
+                    try:
+                        parser.parse(bytes(corrupted))
+                    except ParseError:
+                        pass
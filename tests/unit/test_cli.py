@@ -0,0 +1,139 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import TestCase
+
+from expressions import And, Equal, GreaterThan, Number, String
+from expressions.cli import main
+from expressions.parser import JsonParser
+from tests.unit.variables import numeric_variable, string_variable
+
+EXPRESSION = JsonParser().serialise(
+    And(
+        GreaterThan(numeric_variable("amount"), Number(100)),
+        Equal(string_variable("country", "uk"), String("uk")),
+    ),
+)
+
+NDJSON = """\
+{"amount": 50, "country": "uk"}
+{"amount": 150.5, "country": "uk"}
+{"amount": 250, "country": "es"}
+{"amount": "wrong"}
+{"amount": 350}
+"""
+CSV = """\
+amount,country
+50,uk
+150.5,uk
+250,es
+wrong,
+350,
+"""
+
+
+# error of the JSON decoder for the invalid line of test_invalid_ndjson_records
+INVALID_JSON_ERROR = "Expecting value: line 2 column 1 (char 12)"
+
+
+def run(*args, stdin=""):
+    """Run the command line evaluator, returning its exit status, output and summary."""
+    stdout, stderr = StringIO(), StringIO()
+    status = main(list(args), stdin=StringIO(stdin), stdout=stdout, stderr=stderr)
+    return status, stdout.getvalue(), stderr.getvalue()
+
+
+class TestCommandLine(TestCase):
+    """Test case for the command line evaluator."""
+
+    def test_ndjson_values(self):
+        """The value of the expression should be written for every record.
+
+        Given a NDJSON stream with records, some of them not valid for the expression,
+        When the expression is evaluated on the stream,
+        Then its value should be written for every valid record, and the error for the others.
+        """
+        status, output, summary = run(EXPRESSION, stdin=NDJSON)
+        self.assertEqual(status, 0)
+        lines = output.splitlines()
+        self.assertEqual(lines[:3] + lines[4:], ["false", "true", "false", "true"])
+        self.assertIn("Variable 'amount' has incorrect type", json.loads(lines[3])["error"])
+        self.assertRegex(summary, r"^5 records, 5 written, 1 errors in .* records/s\)\n$")
+
+    def test_invalid_ndjson_records(self):
+        """Lines that aren't JSON objects should be counted as errors, and the others evaluated."""
+        stdin = '{"amount": 150}\n{"amount": \n[1]\n"text"\n{"amount": 50}\n'
+        for workers in ["1", "2"]:
+            with self.subTest(workers=workers):
+                status, output, summary = run(EXPRESSION, "-w", workers, stdin=stdin)
+                self.assertEqual(status, 0)
+                self.assertEqual(
+                    [json.loads(line) for line in output.splitlines()],
+                    [
+                        True,
+                        {"error": f"invalid JSON record: {INVALID_JSON_ERROR}"},
+                        {"error": "record is not a JSON object: [1]"},
+                        {"error": 'record is not a JSON object: "text"'},
+                        False,
+                    ],
+                )
+                self.assertRegex(summary, r"^5 records, 5 written, 3 errors in ")
+
+    def test_decimals_keep_their_precision(self):
+        """Decimal values should be written as numbers only if no precision is lost."""
+        expr = JsonParser().serialise(numeric_variable("amount"))
+        stdin = '{"amount": 2}\n{"amount": 0.5}\n{"amount": 0.12345678901234567890123}\n'
+        _, output, _ = run(expr, stdin=stdin)
+        self.assertEqual(output.splitlines(), ["2", "0.5", '"0.12345678901234567890123"'])
+
+    def test_ndjson_filter(self):
+        """Matching records should be written unchanged with --filter."""
+        for workers in ["1", "2"]:
+            with self.subTest(workers=workers):
+                _, output, _ = run(
+                    EXPRESSION,
+                    "--filter",
+                    "-w",
+                    workers,
+                    "--chunksize",
+                    "2",
+                    stdin=NDJSON,
+                )
+                self.assertEqual(
+                    output,
+                    '{"amount": 150.5, "country": "uk"}\n{"amount": 350}\n',
+                )
+
+    def test_csv_files(self):
+        """CSV fields should be converted to the types of the variables, and empty ones missing.
+
+        Given a CSV file, and an expression in a file,
+        When the matching records are written to a file,
+        Then the file should have the header and the matching rows.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory)
+            (path / "rule.json").write_text(EXPRESSION, encoding="utf-8")
+            (path / "input.csv").write_text(CSV, encoding="utf-8")
+            status, _, _ = run(
+                f"@{path / 'rule.json'}",
+                str(path / "input.csv"),
+                "--filter",
+                "-o",
+                str(path / "output.csv"),
+                "--quiet",
+            )
+            self.assertEqual(status, 0)
+            output = (path / "output.csv").read_text(encoding="utf-8")
+        self.assertEqual(output, "amount,country\n150.5,uk\n350,\n")
+
+    def test_invalid_expression(self):
+        """Invalid expressions should be reported with exit status 2."""
+        status, output, summary = run(json.dumps({"unknown": 1}))
+        self.assertEqual((status, output), (2, ""))
+        self.assertEqual(
+            summary,
+            "error: can't parse expression: "
+            "can't parse {'unknown': Decimal('1')} as an expression\n",
+        )
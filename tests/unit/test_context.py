@@ -1,7 +1,12 @@
+import asyncio
 import unittest
 
 from expressions import Context
-from expressions.exceptions import ContextPopError, ContextVariableNotFoundError
+from expressions.exceptions import (
+    ContextPopError,
+    ContextValuePendingError,
+    ContextVariableNotFoundError,
+)
 
 
 class ContextTests(unittest.TestCase):
@@ -101,3 +106,110 @@ class ContextTests(unittest.TestCase):
         context.pop_subcontext()
         with self.assertRaises(ContextPopError):
             context.pop_subcontext()
+
+    def test_listeners(self):
+        """Listeners should be called with the names of variables that may have changed.
+
+        Given a context with a listener,
+        When a variable is set, or a subcontext is pushed or popped,
+        Then the listener should be called with the names of the affected variables.
+        """
+        context = Context(x=5)
+        names: list[str] = []
+        context.add_listener(names.append)
+        context.set("x", 6)
+        context.push_subcontext(y=1, z=2)
+        context.pop_subcontext()
+        self.assertEqual(names, ["x", "y", "z", "y", "z"])
+
+        context.remove_listener(names.append)
+        context.set("x", 7)
+        self.assertEqual(len(names), 5)
+
+    def test_resolved_values_at_any_depth(self):
+        """Variables should have their visible values after setting, pushing and popping.
+
+        Given a context with a stack of subcontexts,
+        When variables are set, and subcontexts are pushed and popped,
+        Then variables should have the value of the topmost mapping defining them.
+        """
+        context = Context(x=1, y=1)
+        context.push_subcontext(x=2)
+        context.push_subcontext(z=3)
+        context.set("y", 3)
+        self.assertEqual([context.get(name) for name in "xyz"], [2, 3, 3])
+
+        context.pop_subcontext()
+        self.assertEqual([context.get(name) for name in "xy"], [2, 1])
+        self.assertEqual(context.get("z", None), None)
+        context.set("y", 2)
+        context.pop_subcontext()
+        self.assertEqual([context.get(name) for name in "xy"], [1, 1])
+
+        context.pop_subcontext()
+        with self.assertRaises(ContextVariableNotFoundError):
+            context.get("x")
+        context.push_subcontext(x=4)
+        context.set("y", 5)
+        self.assertEqual([context.get(name) for name in "xy"], [4, 5])
+
+    def test_providers(self):
+        """Providers should be called once, only for variables not in any mapping.
+
+        Given a context with providers,
+        When variables are read,
+        Then providers should be called the first time their variable is read, unless a mapping
+        defines the variable.
+        """
+        calls: list[str] = []
+
+        def provider(name, value):
+            return lambda: calls.append(name) or value
+
+        context = Context(x=1)
+        context.add_provider("x", provider("x", 2))
+        context.add_provider("y", provider("y", 3))
+        context.add_provider("z", provider("z", 4))
+        self.assertEqual([context.get("x"), context.get("y"), context.get("y")], [1, 3, 3])
+        self.assertEqual(calls, ["y"])
+        self.assertEqual(context.flatten(), {"x": 1, "y": 3, "z": 4})
+        self.assertEqual(calls, ["y", "z"])
+
+    def test_flatten_raises_provider_errors(self):
+        """flatten() should raise if a provider raises or hasn't been awaited."""
+
+        async def fetch():
+            return 1
+
+        context = Context(x=1)
+        context.add_provider("y", lambda: 1 / 0)
+        with self.assertRaises(ZeroDivisionError):
+            context.flatten()
+
+        context = Context(x=1)
+        context.add_provider("y", fetch)
+        with self.assertRaises(ContextValuePendingError):
+            context.flatten()
+        asyncio.run(context.fetch(["y"]))
+        self.assertEqual(context.flatten(), {"x": 1, "y": 1})
+
+    def test_reset(self):
+        """Resetting a context should replace all its mappings by the given one.
+
+        Given a context with a stack of subcontexts and provided values,
+        When it's reset with a new mapping,
+        Then only the variables of the new mapping should be visible, and providers called again.
+        """
+        values = iter([1, 2])
+        context = Context(x=1)
+        context.push_subcontext(y=2)
+        context.add_provider("z", lambda: next(values))
+        self.assertEqual(context.get("z"), 1)
+
+        mapping = {"x": 5}
+        context.reset(mapping)
+        self.assertEqual(context.get("y", None), None)
+        self.assertEqual(context.flatten(), {"x": 5, "z": 2})
+        self.assertEqual(context.get("z"), 2)
+        context.set("x", 6)
+        self.assertEqual(mapping, {"x": 6})
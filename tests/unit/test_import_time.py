@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest import TestCase
+
+import expressions
+
+# modules slow to import, loaded only by the features that need them
+LAZY_MODULES = ["zope", "asyncio", "concurrent.futures", "inspect"]
+# generous bound of the cumulative import time, to catch big regressions in slow environments
+MAX_IMPORT_TIME_US = 1_000_000
+
+
+def import_times(code):
+    """Run code in a new interpreter, returning cumulative import time by module, and its output.
+
+    Import times are read from the output of `python -X importtime`, in microseconds.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(Path(expressions.__file__).parents[1]), env.get("PYTHONPATH", "")],
+    )
+    process = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times, process.stdout
+
+
+class TestImportTime(TestCase):
+    """Test case for the import time of the package."""
+
+    def test_lazy_modules_are_not_imported(self):
+        """Slow modules shouldn't be imported by the package or its parsers.
+
+        Given a new interpreter
+        When the package and its parsers are imported, and expressions serialised and parsed
+        Then zope, asyncio, concurrent.futures and inspect shouldn't be imported
+        And the import time should be within the bound.
+        """
+        code = (
+            "from expressions import Add, Number\n"
+            "from expressions.parser import JsonParser, PrimitiveParser\n"
+            "import expressions.cli, expressions.streaming, expressions.asynchronous\n"
+            "for parser in [JsonParser(), PrimitiveParser()]:\n"
+            "    parser.parse(parser.serialise(Add(Number(1), Number(2))))\n"
+        )
+        times, _ = import_times(code)
+        lazy = [
+            module
+            for module in times
+            if any(module == name or module.startswith(f"{name}.") for name in LAZY_MODULES)
+        ]
+        self.assertEqual(lazy, [])
+        total = times["expressions"] + times["expressions.parser"]
+        self.assertLess(total, MAX_IMPORT_TIME_US, times)
+
+    def test_zope_utilities_are_registered_on_first_use(self):
+        """Serialisers should be registered as zope utilities when zope interfaces are requested."""
+        code = (
+            "from zope.component import getUtility\n"
+            "from expressions.serialiser.dict_serialiser import IPrimitiveDeserialiser, registry\n"
+            "deserialiser = getUtility(IPrimitiveDeserialiser, 'add')\n"
+            "print(deserialiser is registry.deserialiser('add'))\n"
+        )
+        _, output = import_times(code)
+        self.assertEqual(output.strip(), "True")
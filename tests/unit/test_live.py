@@ -0,0 +1,123 @@
+from decimal import Decimal
+from unittest import TestCase
+from unittest.mock import patch
+
+from expressions import (
+    Add,
+    And,
+    BooleanExpression,
+    Context,
+    Div,
+    Expression,
+    ExpressionArity,
+    GreaterThan,
+    Mul,
+    Number,
+)
+from expressions.exceptions import ExpressionEvaluationError
+from expressions.live import LiveEvaluator
+from tests.unit.variables import numeric_variable
+
+X = numeric_variable("x")
+Y = numeric_variable("y")
+X_SCORE = Mul(X, Number(2))
+Y_SCORE = Mul(Y, Number(3))
+
+
+class ExternalFlag(BooleanExpression):
+    """Boolean expression whose value doesn't depend on the context."""
+
+    arity = ExpressionArity.NULLARY
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self.value = False
+
+    def sub_expressions(self) -> tuple[Expression, ...]:
+        """Return sub-expressions of this expression."""
+        return ()
+
+    def evaluate(self, context: Context) -> bool:
+        """Return value of the flag."""
+        return self.value
+
+    def __eq__(self, other: object) -> bool:
+        """Return true if expressions are equal."""
+        return self is other
+
+
+class TestLiveEvaluator(TestCase):
+    """Test case for live evaluators."""
+
+    def test_only_affected_subtrees_are_evaluated(self):
+        """Changing a variable should only evaluate again the nodes depending on it.
+
+        Given a live evaluator of expressions sharing a context,
+        When a variable of the context is set,
+        Then only the nodes depending on the variable should be evaluated again.
+        """
+        context = Context(x=Decimal(1), y=Decimal(1))
+        live = LiveEvaluator(
+            context,
+            {"total": Add(X_SCORE, Y_SCORE), "y-big": GreaterThan(Y_SCORE, Number(10))},
+        )
+        self.assertEqual(live.evaluate_all(), {"total": Decimal(5), "y-big": False})
+
+        with (
+            patch.object(Mul, "evaluate", autospec=True, side_effect=Mul.evaluate) as mul,
+            patch.object(
+                GreaterThan,
+                "evaluate",
+                autospec=True,
+                side_effect=GreaterThan.evaluate,
+            ) as gt,
+        ):
+            context.set("x", Decimal(2))
+            self.assertEqual(live.evaluate_all(), {"total": Decimal(7), "y-big": False})
+            self.assertEqual(mul.call_count, 1)
+            self.assertEqual(gt.call_count, 0)
+
+            context.set("y", Decimal(4))
+            self.assertEqual(live.evaluate("y-big"), True)
+            self.assertEqual(live.evaluate("total"), Decimal(16))
+            self.assertEqual(mul.call_count, 2)
+            self.assertEqual(gt.call_count, 1)
+
+    def test_subcontexts(self):
+        """Pushing and popping subcontexts should update values."""
+        context = Context(x=Decimal(1))
+        live = LiveEvaluator(context, [("x", X_SCORE)])
+        self.assertEqual(live.evaluate("x"), Decimal(2))
+        context.push_subcontext(x=Decimal(5))
+        self.assertEqual(live.evaluate("x"), Decimal(10))
+        context.pop_subcontext()
+        self.assertEqual(live.evaluate("x"), Decimal(2))
+
+    def test_errors(self):
+        """Expressions raising should be evaluated again, and errors should be reported."""
+        context = Context(x=Decimal(0))
+        live = LiveEvaluator(context, {"div": Div(Number(1), X)})
+        errors: dict = {}
+        self.assertEqual(live.evaluate_all(errors), {})
+        self.assertIsInstance(errors["div"], ExpressionEvaluationError)
+        context.set("x", Decimal(2))
+        self.assertEqual(live.evaluate_all(), {"div": Decimal("0.5")})
+
+    def test_unknown_expressions_are_always_evaluated(self):
+        """Expressions defined outside the library, and their parents, should not keep values."""
+        context = Context(x=Decimal(10))
+        flag = ExternalFlag()
+        live = LiveEvaluator(context, {"and": And(GreaterThan(X, Number(5)), flag)})
+        self.assertFalse(live.evaluate("and"))
+        flag.value = True
+        self.assertTrue(live.evaluate("and"))
+
+    def test_close(self):
+        """Closed evaluators should stop listening to the context."""
+        context = Context(x=Decimal(1))
+        live = LiveEvaluator(context, {"x": X_SCORE})
+        self.assertEqual(live.evaluate("x"), Decimal(2))
+        live.close()
+        context.set("x", Decimal(2))
+        self.assertEqual(live.evaluate("x"), Decimal(2))
+        self.assertEqual(len(live), 1)
@@ -0,0 +1,133 @@
+from decimal import Decimal
+from unittest import TestCase
+from unittest.mock import patch
+
+from expressions import (
+    Add,
+    And,
+    Context,
+    Div,
+    Equal,
+    GreaterThan,
+    Mul,
+    Number,
+    String,
+    Variable,
+)
+from expressions.exceptions import ExpressionEvaluationError, VariableTypeError
+from expressions.memoization import (
+    Memoized,
+    ResultCache,
+    memoize,
+    unmemoized,
+    variable_names,
+)
+from expressions.numeric import INT
+from tests.unit.compiler.test_python_compiler import FailingExpression
+from tests.unit.variables import numeric_variable, string_variable
+
+X = numeric_variable("x")
+Y = numeric_variable("y")
+Z = numeric_variable("z")
+SCORE = Add(Mul(X, X, Number(3)), Mul(Y, Number(2)))
+
+
+class TestResultCache(TestCase):
+    """Test case for result caches."""
+
+    def test_least_recently_used_is_removed(self):
+        """Full caches should remove the least recently used result."""
+        cache = ResultCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNot(cache.get("b"), 2)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+
+
+class TestMemoized(TestCase):
+    """Test case for memoized expressions."""
+
+    def test_results_are_cached_by_variable_values(self):
+        """Memoized expressions should evaluate their sub-expression once per variable values.
+
+        Given a memoized expression,
+        When it's evaluated in contexts that only differ in variables it doesn't read,
+        Then its sub-expression should be evaluated only once.
+        """
+        memoized = Memoized(SCORE)
+        self.assertEqual(memoized.names, ("x", "y"))
+        with patch.object(Add, "evaluate", autospec=True, side_effect=Add.evaluate) as evaluate:
+            for i in range(5):
+                context = Context(x=Decimal(2), y=Decimal(1), z=Decimal(i))
+                self.assertEqual(memoized.evaluate(context), Decimal(14))
+            self.assertEqual(memoized.evaluate(Context(x=Decimal(1), y=Decimal(1))), Decimal(5))
+        self.assertEqual(evaluate.call_count, 2)
+        self.assertEqual((memoized.cache.hits, memoized.cache.misses), (4, 2))
+
+    def test_errors_are_not_cached(self):
+        """Evaluations raising exceptions should not be cached, and raise again."""
+        memoized = Memoized(Div(Number(1), X))
+        for _ in range(2):
+            with self.assertRaises(ExpressionEvaluationError):
+                memoized.evaluate(Context(x=Decimal(0)))
+        self.assertEqual(len(memoized.cache), 0)
+
+    def test_values_of_different_types_are_not_mixed(self):
+        """Equal values of different types should have different cache entries."""
+        memoized = Memoized(Add(X, Number(1)))
+        self.assertEqual(memoized.evaluate(Context(x=Decimal(1))), Decimal(2))
+        with self.assertRaises(VariableTypeError):
+            memoized.evaluate(Context(x=1))
+
+    def test_numeric_backends_are_not_mixed(self):
+        """Evaluations with different numeric backends should have different cache entries."""
+        memoized = Memoized(Div(X, Number(2)))
+        self.assertEqual(memoized.evaluate(Context(x=Decimal(7))), Decimal("3.5"))
+        context = Context(x=Decimal(7))
+        context.numeric_backend = INT
+        self.assertEqual(memoized.evaluate(context), 3)
+        self.assertEqual(len(memoized.cache), 2)
+
+    def test_unhashable_values_are_not_cached(self):
+        """Evaluations with unhashable values should not be cached."""
+        memoized = Memoized(Equal(Variable("items", list), Variable("items", list)))
+        self.assertTrue(memoized.evaluate(Context(items=[1])))
+        self.assertEqual(len(memoized.cache), 0)
+
+
+class TestMemoize(TestCase):
+    """Test case for memoize()."""
+
+    def test_largest_subtrees_with_few_variables_are_memoized(self):
+        """memoize() should wrap the largest subtrees reading at most max_variables variables."""
+        is_high = GreaterThan(SCORE, Number(10))
+        is_a = Equal(string_variable("name"), String("a"))
+        is_positive = GreaterThan(Z, Number(0))
+        expr = And(And(is_high, is_a), is_positive)
+        cache = ResultCache()
+        memoized = memoize(expr, cache, max_variables=2)
+        self.assertEqual(
+            memoized,
+            And(And(Memoized(is_high), Memoized(is_a)), Memoized(is_positive)),
+        )
+        self.assertEqual(unmemoized(memoized), expr)
+        self.assertEqual(variable_names(expr), {"x", "y", "z", "name"})
+
+        context = Context(x=Decimal(2), y=Decimal(1), z=Decimal(1), name="a")
+        self.assertTrue(memoized.evaluate(context))
+        self.assertTrue(memoized.evaluate(context))
+        self.assertEqual((cache.hits, cache.misses), (3, 3))
+
+    def test_expressions_with_side_effects_are_not_memoized(self):
+        """Subtrees with expressions defined outside the library should not be memoized."""
+        failing = FailingExpression()
+        expr = And(failing, GreaterThan(X, Number(0)))
+        self.assertEqual(memoize(expr), And(failing, Memoized(GreaterThan(X, Number(0)))))
+        self.assertIs(memoize(X), X)
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import pytz  # type: ignore
+
+from expressions import (
+    Add,
+    And,
+    Boolean,
+    Datetime,
+    Equal,
+    GreaterThan,
+    Not,
+    Null,
+    Number,
+    String,
+    Timedelta,
+)
+from expressions.memory import memory_usage
+from tests.unit.variables import numeric_variable, string_variable
+
+AMOUNT = numeric_variable("amount")
+
+
+class TestMemoryUsage(TestCase):
+    """Test case for memory_usage()."""
+
+    def test_nodes_have_no_dict(self):
+        """Expression nodes should store their attributes in slots."""
+        expressions = [
+            Null(),
+            Boolean(True),
+            Number(1),
+            String("a"),
+            Datetime(datetime(2024, 1, 1, tzinfo=pytz.utc)),
+            Timedelta(timedelta(1)),
+            AMOUNT,
+            Add(AMOUNT, Number(1)),
+            Equal(AMOUNT, Number(1)),
+            Not(Boolean(True)),
+        ]
+        for expr in expressions:
+            with self.subTest(expr):
+                self.assertFalse(hasattr(expr, "__dict__"))
+
+    def test_memory_usage(self):
+        """memory_usage() should return deep size and number of nodes.
+
+        Given an expression,
+        When its memory usage is requested,
+        Then it should return the number of nodes and a size growing with the expression.
+        """
+        is_big = GreaterThan(AMOUNT, Number(100))
+        usage = memory_usage(is_big)
+        self.assertEqual(usage.nodes, 3)
+        self.assertGreater(usage.size, 0)
+
+        bigger_usage = memory_usage(And(is_big, Equal(string_variable("name"), String("abc"))))
+        self.assertEqual(bigger_usage.nodes, 7)
+        self.assertGreater(bigger_usage.size, usage.size)
+
+    def test_shared_sub_expressions_are_counted_once(self):
+        """Sub-expressions shared in the expression should be counted once."""
+        is_big = GreaterThan(AMOUNT, Number(100))
+        usage = memory_usage(is_big)
+        shared_usage = memory_usage(And(is_big, is_big))
+        self.assertEqual(shared_usage.nodes, 4)
+        self.assertLess(shared_usage.size, 2 * usage.size)
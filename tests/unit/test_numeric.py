@@ -0,0 +1,109 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from expressions import (
+    Add,
+    Context,
+    Div,
+    GreaterThan,
+    Mod,
+    Mul,
+    Number,
+    Sub,
+)
+from expressions.compiler import assemble, compile_expression
+from expressions.exceptions import ExpressionEvaluationError, VariableTypeError
+from expressions.numeric import DECIMAL, FLOAT, INT, NUMERIC_BACKENDS
+from expressions.rules import IndexedRuleSet, RuleSet
+from tests.unit.variables import numeric_variable
+
+X = numeric_variable("x")
+Y = numeric_variable("y")
+
+
+class TestNumericBackends(TestCase):
+    """Test case for numeric backends."""
+
+    cases = [
+        (Add(X, Number(1)), {"x": 2}, {DECIMAL: Decimal(3), FLOAT: 3.0, INT: 3}),
+        (Sub(X, Y), {"x": 5, "y": 2}, {DECIMAL: Decimal(3), FLOAT: 3.0, INT: 3}),
+        (Mul(X, Number(2), Y), {"x": 3, "y": 2}, {DECIMAL: Decimal(12), FLOAT: 12.0, INT: 12}),
+        (Div(X, Number(2)), {"x": 5}, {DECIMAL: Decimal("2.5"), FLOAT: 2.5, INT: 2}),
+        (Mod(X, Number(3)), {"x": 5}, {DECIMAL: Decimal(2), FLOAT: 2.0, INT: 2}),
+        (GreaterThan(X, Number(1)), {"x": 2}, {DECIMAL: True, FLOAT: True, INT: True}),
+    ]
+
+    def test_backends(self):
+        """Numbers should be evaluated with the numeric backend of the context.
+
+        Given an expression with numbers,
+        When it's evaluated, or compiled, with a numeric backend,
+        Then the result should be a number of the backend.
+        """
+        for expr, values, results in self.cases:
+            for backend, expected in results.items():
+                with self.subTest(expr=expr, backend=backend):
+                    context = Context(**{name: Decimal(value) for name, value in values.items()})
+                    context.numeric_backend = backend
+                    result = expr.evaluate(context)
+                    self.assertEqual(result, expected)
+                    self.assertIs(type(result), type(expected))
+
+                    compiled_result = compile_expression(expr, backend)(context)
+                    self.assertEqual(compiled_result, expected)
+                    self.assertIs(type(compiled_result), type(expected))
+
+    def test_decimal_is_the_default(self):
+        """Contexts should evaluate numbers as decimals by default."""
+        self.assertIs(Context().numeric_backend, DECIMAL)
+        self.assertIs(NUMERIC_BACKENDS["float"], FLOAT)
+        with self.assertRaises(VariableTypeError):
+            X.evaluate(Context(x=1.5))
+
+    def test_variable_types(self):
+        """Numeric variables should accept numbers convertible by the backend."""
+        for backend in (FLOAT, INT):
+            context = Context(x=1.0, y=2, flag=True)
+            context.numeric_backend = backend
+            with self.subTest(backend=backend):
+                self.assertEqual(Add(X, Y).evaluate(context), 3)
+                self.assertEqual(compile_expression(Add(X, Y), backend)(context), 3)
+                with self.assertRaises(VariableTypeError):
+                    numeric_variable("flag").evaluate(context)
+
+    def test_int_backend_requires_integers(self):
+        """The int backend should raise for numbers that are not integers."""
+        context = Context(x=Decimal("1.5"))
+        context.numeric_backend = INT
+        with self.assertRaises(ExpressionEvaluationError):
+            X.evaluate(context)
+        with self.assertRaises(ExpressionEvaluationError):
+            Number("0.5").evaluate(context)
+
+    def test_backend_of_the_context_is_used_everywhere(self):
+        """Programs, compiled expressions and rule sets should use the backend of the context.
+
+        Given an expression adding a variable and a number literal
+        When it's evaluated by every evaluator in contexts with decimal and float backends
+        Then it should evaluate as the interpreted expression.
+        """
+        expr = GreaterThan(Div(Add(X, Number("0.1")), Number(2)), Mul(Number("0.5"), Number(2)))
+        cases = [(DECIMAL, Decimal(2)), (FLOAT, 2.0), (FLOAT, Decimal(2)), (FLOAT, 2)]
+        for backend, x in cases:
+            context = Context(x=x)
+            context.numeric_backend = backend
+            with self.subTest(backend=backend, x=x):
+                expected = expr.evaluate(context)
+                self.assertEqual(assemble(expr).evaluate(context), expected)
+                self.assertEqual(compile_expression(expr, backend)(context), expected)
+                self.assertEqual(RuleSet({"rule": expr}).match(context), ["rule"])
+                self.assertEqual(IndexedRuleSet({"rule": expr}).match(context), ["rule"])
+                result = assemble(Mul(X, Number("0.1"))).evaluate(context)
+                self.assertIs(type(result), backend.number_type)
+
+    def test_compiled_expressions_reject_other_backends(self):
+        """Compiled expressions should raise when evaluated in a context with another backend."""
+        context = Context(x=2.0)
+        context.numeric_backend = FLOAT
+        with self.assertRaises(ExpressionEvaluationError):
+            compile_expression(GreaterThan(Add(X, Number("0.1")), Number(1)))(context)
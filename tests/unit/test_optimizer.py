@@ -0,0 +1,128 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from expressions import (
+    Add,
+    And,
+    Boolean,
+    Context,
+    Div,
+    Equal,
+    Expression,
+    GreaterThan,
+    LessThan,
+    Mod,
+    Mul,
+    Not,
+    Number,
+    Or,
+    String,
+    Sub,
+)
+from expressions.exceptions import ExpressionEvaluationError
+from expressions.numeric import FLOAT, INT
+from expressions.optimizer import optimize
+from tests.unit.compiler.test_python_compiler import FailingExpression
+from tests.unit.variables import boolean_variable, numeric_variable, string_variable
+
+X = numeric_variable("x")
+Y = numeric_variable("y")
+A = GreaterThan(numeric_variable("x"), Number(1))
+B = Equal(string_variable("name"), String("foo"))
+C = boolean_variable("flag")
+
+
+class TestOptimizer(TestCase):
+    """Test case for the expression optimizer."""
+
+    context = Context(x=Decimal(3), y=Decimal("1.5"), name="foo", flag=False)
+    cases: list[tuple[Expression, Expression]] = [
+        # (expression, optimized expression)
+        # folding
+        (Add(Number(1), Number(2)), Number(3)),
+        (Mul(Number(2), Sub(Number(5), Number(1))), Number(8)),
+        (LessThan(Number(1), Number(2)), Boolean(True)),
+        (Equal(String("a"), String("b")), Boolean(False)),
+        (Add(X, Mul(Number(2), Number(3))), Add(X, Number(6))),
+        # flattening
+        (And(And(A, B), C), And(A, B, C)),
+        (Or(A, Or(B, C)), Or(A, B, C)),
+        (Add(Add(X, Y), X), Add(X, Y, X)),
+        (Mul(Mul(X, Y), X), Mul(X, Y, X)),
+        (Add(X, Add(Y, X)), Add(X, Add(Y, X))),
+        # identity elements
+        (And(A, Boolean(True), B), And(A, B)),
+        (Or(Boolean(False), A), A),
+        (Add(X, Number(0), Y), Add(X, Y)),
+        (Mul(Number(1), X), X),
+        (Sub(X, Number(0)), X),
+        (Div(X, Number(1)), X),
+        (And(Boolean(True), Boolean(True)), Boolean(True)),
+        # absorbing elements
+        (And(A, Boolean(False), B), And(A, Boolean(False))),
+        (And(Boolean(False), A), Boolean(False)),
+        (Or(A, Boolean(True), B), Or(A, Boolean(True))),
+        # double negation
+        (Not(Not(A)), A),
+        (Not(Not(Not(A))), Not(A)),
+        # nothing to optimize
+        (Mod(X, Y), Mod(X, Y)),
+    ]
+
+    def test_expressions_are_optimized(self):
+        """Optimized expressions should be simplified.
+
+        Given an expression,
+        When it is optimized,
+        Then the optimized expression should be the expected simplified expression.
+        """
+        for expr, optimized in self.cases:
+            with self.subTest(expr):
+                self.assertEqual(optimize(expr), optimized)
+
+    def test_optimized_expressions_evaluate_as_expression(self):
+        """Optimized expressions should evaluate to the same value than the original expression."""
+        for expr, _ in self.cases:
+            with self.subTest(expr):
+                self.assertEqual(optimize(expr).evaluate(self.context), expr.evaluate(self.context))
+
+    def test_division_by_literal_zero_is_not_folded(self):
+        """Division by literal zero should not be folded, so it keeps raising."""
+        expr = Add(Number(1), Div(Number(1), Number(0)))
+        optimized = optimize(expr)
+        self.assertEqual(optimized, expr)
+        with self.assertRaises(ExpressionEvaluationError):
+            optimized.evaluate(self.context)
+
+    def test_numeric_backends(self):
+        """Literals should be folded with the numeric backend of the optimizer.
+
+        Given expressions with numeric literals
+        When they are optimized for the decimal, float and int numeric backends
+        Then they should evaluate to the same values than the original expressions in contexts
+        with the same backends.
+        """
+        expressions = [
+            Add(X, Div(Number(7), Number(2))),
+            Mod(Number(7), Number("2.5")),
+            Add(Number("0.1"), Number("0.2")),
+            Mul(Div(Number(1), Number(3)), Number(3)),
+        ]
+        for backend in [FLOAT, INT]:
+            context = Context(x=Decimal(3))
+            context.numeric_backend = backend
+            for expr in expressions:
+                with self.subTest(backend=backend, expr=expr):
+                    optimized = optimize(expr, backend)
+                    try:
+                        expected = expr.evaluate(context)
+                    except ExpressionEvaluationError:
+                        self.assertRaises(ExpressionEvaluationError, optimized.evaluate, context)
+                    else:
+                        self.assertEqual(optimized.evaluate(context), expected)
+        self.assertEqual(optimize(Div(Number(7), Number(2)), INT), Number(3))
+
+    def test_unknown_expressions_are_not_changed(self):
+        """Expressions unknown to the optimizer should be kept unchanged."""
+        failing = FailingExpression()
+        self.assertEqual(optimize(And(A, failing)), And(A, failing))
@@ -0,0 +1,107 @@
+import pickle
+from decimal import Decimal
+from unittest import TestCase
+
+from expressions import (
+    Add,
+    And,
+    Context,
+    Div,
+    Equal,
+    GreaterThan,
+    Not,
+    Null,
+    Number,
+    Or,
+    String,
+)
+from expressions.exceptions import (
+    ExpressionEvaluationError,
+    ExpressionValidationError,
+    VariableNotFoundError,
+)
+from expressions.numeric import FLOAT, INT
+from expressions.parallel import EvaluationResult, evaluate_many
+from tests.unit.variables import numeric_variable, string_variable
+
+AMOUNT = numeric_variable("amount")
+IS_BIG = GreaterThan(AMOUNT, Number(100))
+
+
+class TestPickling(TestCase):
+    """Test case for pickling of expressions and errors."""
+
+    def test_expressions_are_pickled_compactly(self):
+        """Expressions should be pickled from their constructor arguments."""
+        expr = And(
+            Or(IS_BIG, Equal(string_variable("name", "x"), String("a"))),
+            Not(Equal(Null(), Null())),
+        )
+        data = pickle.dumps(expr)
+        self.assertEqual(pickle.loads(data), expr)  # noqa: S301
+        self.assertNotIn(b"_sub_expressions", data)
+
+    def test_errors_are_pickled(self):
+        """Expression errors should keep their type and arguments when pickled."""
+        for error in [
+            VariableNotFoundError("variable x not found"),
+            ExpressionValidationError("expression validation error", [{"value": 1}]),
+        ]:
+            with self.subTest(error):
+                unpickled = pickle.loads(pickle.dumps(error))  # noqa: S301
+                self.assertIs(type(unpickled), type(error))
+                self.assertEqual(unpickled.__dict__, error.__dict__)
+
+
+class TestEvaluateMany(TestCase):
+    """Test case for evaluate_many()."""
+
+    def test_results_are_in_order(self):
+        """evaluate_many() should return results in the order of the contexts.
+
+        Given an expression and many contexts,
+        When the expression is evaluated in the contexts with a pool of processes,
+        Then the results should be the values of the expression, in the order of the contexts.
+        """
+        contexts = [Context(amount=Decimal(i)) for i in range(0, 300, 3)]
+        results = list(evaluate_many(IS_BIG, contexts, workers=2, chunksize=7))
+        self.assertEqual(results, [EvaluationResult(i * 3 > 100, None) for i in range(100)])
+
+    def test_errors_are_captured(self):
+        """Errors should be captured for every context and expression."""
+        expressions = {"big": IS_BIG, "inverse": Div(Number(1), AMOUNT)}
+        contexts = [{"amount": Decimal(0)}, {}, {"amount": Decimal(200)}]
+        results = list(evaluate_many(expressions, contexts, workers=2, chunksize=1))
+
+        self.assertEqual(results[0]["big"], EvaluationResult(False, None))
+        self.assertIsInstance(results[0]["inverse"].error, ExpressionEvaluationError)
+        self.assertIsInstance(results[1]["big"].error, VariableNotFoundError)
+        self.assertEqual(results[2]["inverse"], EvaluationResult(Decimal("0.005"), None))
+
+    def test_numeric_backend_of_contexts(self):
+        """Contexts should keep their numeric backend in the workers."""
+        context = Context(amount=150.0)
+        context.numeric_backend = FLOAT
+        self.assertEqual(
+            list(evaluate_many(Div(AMOUNT, Number(2)), [context], workers=1)),
+            [EvaluationResult(75.0, None)],
+        )
+
+    def test_expressions_that_cannot_be_compiled(self):
+        """Expressions that can't be compiled should be evaluated, without failing the others."""
+        context = Context(amount=150)
+        context.numeric_backend = INT
+        expressions = {"fraction": Add(AMOUNT, Number("0.5")), "half": Div(AMOUNT, Number(2))}
+        (result,) = evaluate_many(expressions, [context], workers=1)
+        self.assertIsInstance(result["fraction"].error, ExpressionEvaluationError)
+        self.assertEqual(result["half"], EvaluationResult(75, None))
+
+    def test_providers_of_contexts(self):
+        """Values of providers should be sent to the workers, and their errors reported."""
+        provided = Context()
+        provided.add_provider("amount", lambda: Decimal(200))
+        failing = Context()
+        failing.add_provider("amount", lambda: 1 / 0)
+        results = list(evaluate_many(IS_BIG, [provided, failing], workers=1))
+        self.assertEqual(results[0], EvaluationResult(True, None))
+        self.assertIsInstance(results[1].error, ZeroDivisionError)
@@ -0,0 +1,91 @@
+from decimal import Decimal
+from unittest import TestCase
+from unittest.mock import patch
+
+from expressions import Add, Context, Div, GreaterThan, Number
+from expressions.memory import memory_usage
+from expressions.numeric import INT
+from expressions.parser import CacheStats, JsonParser, ParseCache
+from tests.unit.variables import numeric_variable
+
+PARSER = JsonParser()
+RULES = [
+    PARSER.serialise(GreaterThan(numeric_variable("amount"), Add(Number(i), Number(1))))
+    for i in range(5)
+]
+
+
+class TestParseCache(TestCase):
+    """Test case for ParseCache."""
+
+    def test_expressions_are_parsed_once(self):
+        """Serialised expressions should be parsed only the first time they are seen.
+
+        Given a parse cache
+        When the same serialised expressions are parsed many times
+        Then they should be parsed once, and the cached expressions returned afterwards.
+        """
+        cache = ParseCache()
+        with patch.object(
+            JsonParser,
+            "parse",
+            autospec=True,
+            side_effect=JsonParser.parse,
+        ) as parse:
+            first = [cache.parse(rule) for rule in RULES]
+            second = [cache.parse(rule) for rule in RULES]
+        self.assertEqual(parse.call_count, len(RULES))
+        self.assertEqual(first, [PARSER.parse(rule) for rule in RULES])
+        self.assertTrue(all(a is b for a, b in zip(first, second, strict=True)))
+        self.assertEqual(cache.stats(), CacheStats(5, 5, 0, 5, cache.size))
+        self.assertEqual(cache.size, sum(memory_usage(expr).size for expr in first))
+
+    def test_optimized_and_compiled_expressions(self):
+        """Optimized expressions and compiled functions should be cached too."""
+        cache = ParseCache(optimize=True)
+        self.assertEqual(
+            cache.parse(RULES[0]),
+            GreaterThan(numeric_variable("amount"), Number(1)),
+        )
+        size = cache.size
+        function = cache.compile(RULES[0])
+        self.assertIs(cache.compile(RULES[0]), function)
+        self.assertGreater(cache.size, size)
+        self.assertTrue(function(Context(amount=Decimal(2))))
+
+    def test_numeric_backend(self):
+        """Expressions should be optimized and compiled with the numeric backend of the cache."""
+        data = PARSER.serialise(Add(numeric_variable("x"), Div(Number(7), Number(2))))
+        cache = ParseCache(optimize=True, numeric_backend=INT)
+        context = Context(x=Decimal(1))
+        context.numeric_backend = INT
+        self.assertEqual(cache.parse(data).evaluate(context), 4)
+        self.assertEqual(cache.compile(data)(context), 4)
+
+    def test_size_aware_eviction(self):
+        """Least recently used entries should be evicted to keep the cache within its budget.
+
+        Given a parse cache with a budget for three expressions
+        When more expressions are parsed
+        Then the least recently used ones should be evicted.
+        """
+        size = memory_usage(PARSER.parse(RULES[0])).size
+        cache = ParseCache(max_bytes=3 * size + size // 2)
+        for rule in RULES[:3]:
+            cache.parse(rule)
+        cache.parse(RULES[0])
+        cache.parse(RULES[3])
+        cache.parse(RULES[4])
+        self.assertEqual((cache.evictions, len(cache)), (2, 3))
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+        cache.parse(RULES[0])
+        self.assertEqual((cache.hits, cache.misses), (2, 5))
+        cache.parse(RULES[1])
+        self.assertEqual(cache.misses, 6)
+
+    def test_expressions_bigger_than_budget_are_not_cached(self):
+        """Expressions bigger than the budget should be parsed, but not cached."""
+        cache = ParseCache(max_bytes=10)
+        self.assertEqual(cache.parse(RULES[0]), PARSER.parse(RULES[0]))
+        self.assertEqual((len(cache), cache.size, cache.evictions), (0, 0, 0))
@@ -4,6 +4,7 @@ from decimal import Decimal
 from unittest import TestCase
 
 import pytz
+from zope.component import provideUtility  # type: ignore
 
 from expressions import (
     Add,
@@ -29,8 +30,16 @@ from expressions import (
     Timedelta,
     Variable,
 )
-from expressions.parser import JsonParser, Parser, PrimitiveParser
-from expressions.serialiser.dict_serialiser import PrimitiveType
+from expressions.exceptions import ParseError, SerialiserLookupError
+from expressions.parser import BinaryParser, JsonParser, Parser, PrimitiveParser
+from expressions.serialiser import dict_serialiser
+from expressions.serialiser.dict_serialiser import (
+    HomogeneousListDictDeserialiser,
+    HomogeneousListDictSerialiser,
+    PrimitiveType,
+    SerialiserRegistry,
+)
+from expressions.serialiser.dict_serialiser import registry as default_registry
 
 
 class TestPaserMixin:
@@ -206,5 +215,157 @@ class TestJsonPaser(TestPaserMixin, TestCase):
             Variable("x", int, 3),
             f'{{"var": {{"name": "x", "return_type": {obj_to_json(int)}, "default": 3}}}}',
         ),
+        (
+            Variable("x", Decimal),
+            f'{{"var": {{"name": "x", "return_type": {obj_to_json(Decimal)}}}}}',
+        ),
     ]
     parser: Parser = JsonParser()
+
+
+class TestJsonSinglePassParsing(TestCase):
+    """Test case for the single pass parsing of JSON strings."""
+
+    def test_single_pass_is_identical_to_primitives_parsing(self):
+        """parse() should build the same expressions than parsing python primitives first.
+
+        Given serialised expressions
+        When they are parsed in a single pass and through python primitives
+        Then both expressions should be identical.
+        """
+        parser = JsonParser()
+        for expr, data in [
+            *TestJsonPaser.expr_dct,
+            (Not(And(GreaterThan(Number("1.5"), Number(1)), Or(Boolean(True)))), None),
+            (Variable("x", Decimal, Decimal("1.25")), None),
+        ]:
+            data = data or parser.serialise(expr)
+            with self.subTest(data):
+                single_pass = parser.parse(data)
+                two_pass = parser.parse_primitives(data)
+                self.assertEqual(single_pass, two_pass)
+                self.assertEqual(repr(single_pass), repr(two_pass))
+
+    def test_parameters_named_like_expressions(self):
+        """parse() should keep parameters of expressions named like expressions as they are.
+
+        Given a variable whose default value is a dictionary with a single key named like an
+        expression
+        When it's parsed in a single pass
+        Then the default value should be kept as a dictionary, like when parsing primitives first.
+        """
+        parser = JsonParser()
+        default = {"var": {"name": "y"}}
+        data = (
+            f'{{"var": {{"name": "x", "return_type": {obj_to_json(dict)}, '
+            '"default": {"var": {"name": "y"}}}}'
+        )
+        expr = parser.parse(data)
+        self.assertEqual(expr, parser.parse_primitives(data))
+        self.assertEqual(expr.default, default)  # type: ignore
+
+    def test_invalid_data(self):
+        """parse() should raise ParseError when data isn't a valid expression."""
+        parser = JsonParser()
+        for data in ['{"and": [{"a": 1, "b": 2}]}', '{"add": 3}', "[1, 2]"]:
+            with self.subTest(data), self.assertRaises(ParseError):
+                parser.parse(data)
+
+
+class Double(Add):
+    """Expression extending the parsers, adding its operand to itself."""
+
+    __slots__ = ()
+
+    def __init__(self, sub_expression):
+        """Constructor."""
+        super().__init__(sub_expression, sub_expression)
+
+
+class TestSerialiserRegistry(TestCase):
+    """Test case for the registry of serialisers and deserialisers."""
+
+    def test_new_expression_types(self):
+        """Expression types registered in the registry should be serialised and parsed.
+
+        Given a new expression type, registered in the registry, or as zope utilities
+        When expressions of the type are serialised and parsed
+        Then the same expressions should be returned.
+        """
+
+        class DoubleDeserialiser(HomogeneousListDictDeserialiser):
+            def deserialise(self, data):
+                (sub_expression,) = super().deserialise(data).sub_expressions()[:1]
+                return Double(sub_expression)
+
+        expr = And(GreaterThan(Double(Number(2)), Number(3)))
+        data = {"and": [{"greater-than": [{"double": [Decimal(2), Decimal(2)]}, Decimal(3)]}]}
+        default_registry.add_serialiser(Double, HomogeneousListDictSerialiser("double"))
+        default_registry.add_deserialiser("double", DoubleDeserialiser(Add))
+        try:
+            for parser in [PrimitiveParser(), JsonParser(), BinaryParser()]:
+                with self.subTest(parser=parser):
+                    self.assertEqual(parser.parse(parser.serialise(expr)), expr)
+            self.assertEqual(PrimitiveParser().serialise(expr), data)
+        finally:
+            # pylint: disable=protected-access
+            default_registry._serialisers.pop(Double, None)
+            default_registry._deserialisers.pop("double", None)
+
+    def test_deserialisers_registered_after_the_parsers(self):
+        """Deserialisers registered after the parsers are created should be used by them.
+
+        Given parsers that have already parsed expressions
+        When a new deserialiser is registered for an expression name
+        Then the parsers should parse the expressions with the new deserialiser.
+        """
+
+        class SubDeserialiser(HomogeneousListDictDeserialiser):
+            def deserialise(self, data):
+                return Sub(*super().deserialise(data).sub_expressions())
+
+        expr = Add(Number(2), Number(3))
+        parsers = [JsonParser(), BinaryParser()]
+        serialised = [parser.serialise(expr) for parser in parsers]
+        for parser, data in zip(parsers, serialised, strict=True):
+            self.assertEqual(parser.parse(data), expr)  # type: ignore
+        deserialiser = default_registry.deserialiser("add")
+        default_registry.add_deserialiser("add", SubDeserialiser(Add))
+        try:
+            for parser, data in zip(parsers, serialised, strict=True):
+                with self.subTest(parser=parser):
+                    self.assertEqual(parser.parse(data), Sub(Number(2), Number(3)))  # type: ignore
+        finally:
+            default_registry.add_deserialiser("add", deserialiser)
+        for parser, data in zip(parsers, serialised, strict=True):
+            self.assertEqual(parser.parse(data), expr)  # type: ignore
+
+    def test_zope_utilities_are_found(self):
+        """Serialisers registered only as zope utilities should still be found.
+
+        Given the zope interfaces of the serialisers, requested so they're created
+        When serialisers are looked up in a new registry, and registered as zope utilities
+        Then the built-in serialisers, registered as utilities, and the new ones should be found.
+        """
+        serialiser_interface = dict_serialiser.IPrimitiveSerialiser
+        registry = SerialiserRegistry()
+        self.assertIs(registry.serialiser(Add), default_registry.serialiser(Add))
+        self.assertIs(registry.deserialiser("add"), default_registry.deserialiser("add"))
+
+        class Triple(Add):
+            __slots__ = ()
+
+        serialiser = HomogeneousListDictSerialiser("triple")
+        provideUtility(serialiser, serialiser_interface, "Triple")
+        self.assertIs(registry.serialiser(Triple), serialiser)
+
+    def test_missing_serialisers(self):
+        """Looking up missing serialisers should raise SerialiserLookupError."""
+
+        class Unknown(Add):
+            __slots__ = ()
+
+        with self.assertRaises(SerialiserLookupError):
+            PrimitiveParser().serialise(Unknown(Number(1), Number(2)))
+        with self.assertRaises(LookupError):
+            PrimitiveParser().parse({"unknown": []})
@@ -0,0 +1,77 @@
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import TestCase
+
+from expressions import And, Equal, GreaterThan, Number, String, Timedelta
+from expressions.exceptions import ParseError
+from expressions.expr.interning import ExpressionInterner
+from expressions.parser import (
+    BINARY,
+    LENGTH_PREFIXED,
+    NDJSON,
+    JsonParser,
+    dump_many,
+    load_many,
+)
+from tests.unit.variables import numeric_variable, string_variable, timedelta_variable
+
+EXPRESSIONS = [
+    And(
+        GreaterThan(numeric_variable("amount"), Number(i)),
+        Equal(string_variable("country"), String("uk" if i % 2 else "es")),
+    )
+    for i in range(25)
+] + [GreaterThan(timedelta_variable("elapsed"), Timedelta(timedelta(hours=1)))]
+
+
+class TestLoadAndDumpMany(TestCase):
+    """Test case for load_many() and dump_many()."""
+
+    def test_round_trip(self):
+        """Expressions dumped into a file should be loaded back in order.
+
+        Given a collection of expressions
+        When they are dumped into a file in any format, and loaded, in this process or in workers
+        Then the loaded expressions should be equal to the dumped ones.
+        """
+        for file_class, file_format in [
+            (StringIO, NDJSON),
+            (BytesIO, LENGTH_PREFIXED),
+            (BytesIO, BINARY),
+        ]:
+            file = file_class()
+            self.assertEqual(dump_many(iter(EXPRESSIONS), file, file_format), len(EXPRESSIONS))
+            for workers in [0, 2]:
+                with self.subTest(file_format=file_format, workers=workers):
+                    file.seek(0)
+                    loaded = load_many(file, file_format, workers=workers, chunksize=4)
+                    self.assertEqual(list(loaded), EXPRESSIONS)
+
+    def test_expressions_are_loaded_lazily(self):
+        """Expressions should be read from the file as they are consumed."""
+        file = StringIO()
+        dump_many(EXPRESSIONS, file)
+        file.seek(0)
+        loaded = load_many(file)
+        self.assertEqual(next(loaded), EXPRESSIONS[0])
+        self.assertEqual(file.readline(), JsonParser().serialise(EXPRESSIONS[1]) + "\n")
+
+    def test_interning(self):
+        """Loaded expressions should be interned with the given interner."""
+        file = BytesIO()
+        dump_many(EXPRESSIONS, file, LENGTH_PREFIXED)
+        interner = ExpressionInterner()
+        for workers in [0, 2]:
+            with self.subTest(workers=workers):
+                file.seek(0)
+                first, second, *_ = load_many(file, LENGTH_PREFIXED, interner, workers=workers)
+                amount = first.sub_expressions()[0].sub_expressions()[0]
+                self.assertIs(second.sub_expressions()[0].sub_expressions()[0], amount)
+
+    def test_truncated_file(self):
+        """Truncated length-prefixed files should raise ParseError."""
+        file = BytesIO()
+        dump_many(EXPRESSIONS[:2], file, LENGTH_PREFIXED)
+        for size in [len(file.getvalue()) - 1, len(file.getvalue()) // 2 + 2]:
+            with self.subTest(size=size), self.assertRaises(ParseError):
+                list(load_many(BytesIO(file.getvalue()[:size]), LENGTH_PREFIXED))
@@ -0,0 +1,89 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from expressions import Add, And, Context, Div, Equal, GreaterThan, Number, String
+from expressions.exceptions import ExpressionEvaluationError, VariableNotFoundError
+from expressions.streaming import filter_records, project
+from tests.unit.variables import numeric_variable, string_variable
+
+AMOUNT = numeric_variable("amount")
+COUNTRY = string_variable("country")
+IS_BIG_IN_UK = And(GreaterThan(AMOUNT, Number(100)), Equal(COUNTRY, String("uk")))
+RECORDS = [{"amount": Decimal(i * 50), "country": "uk" if i % 2 else "es"} for i in range(1, 8)]
+
+
+class TestFilterRecords(TestCase):
+    """Test case for filter_records()."""
+
+    def test_filter_records(self):
+        """filter_records() should lazily yield the records matching the expression.
+
+        Given records, and an expression matching some of them,
+        When they are filtered with chunks of any size,
+        Then the matching records should be yielded unchanged and in order.
+        """
+        expected = [record for record in RECORDS if IS_BIG_IN_UK.evaluate(Context(**record))]
+        self.assertEqual(len(expected), 3)
+        for chunksize in [1, 3, 100]:
+            with self.subTest(chunksize=chunksize):
+                matched = filter_records(IS_BIG_IN_UK, iter(RECORDS), chunksize=chunksize)
+                self.assertEqual(list(matched), expected)
+                self.assertIs(
+                    next(filter_records(IS_BIG_IN_UK, RECORDS, chunksize=chunksize)),
+                    expected[0],
+                )
+
+    def test_filter_rows(self):
+        """filter_records() should evaluate rows of values bound to slots."""
+        rows = [(record["country"], record["amount"]) for record in RECORDS]
+        matched = filter_records(IS_BIG_IN_UK, rows, slots=["country", "amount"], chunksize=2)
+        self.assertEqual(
+            list(matched),
+            [("uk", Decimal(150)), ("uk", Decimal(250)), ("uk", Decimal(350))],
+        )
+
+    def test_errors(self):
+        """Records that can't be evaluated should raise, or be skipped if errors are collected."""
+        records = [{"amount": Decimal(200), "country": "uk"}, {"amount": Decimal(200)}]
+        with self.assertRaises(VariableNotFoundError):
+            list(filter_records(IS_BIG_IN_UK, records))
+
+        errors: list = []
+        self.assertEqual(list(filter_records(IS_BIG_IN_UK, records, errors=errors)), records[:1])
+        self.assertEqual(
+            [(index, type(exc)) for index, exc in errors],
+            [(1, VariableNotFoundError)],
+        )
+
+
+class TestProject(TestCase):
+    """Test case for project()."""
+
+    def test_project(self):
+        """project() should lazily yield the values of the expressions for every record.
+
+        Given records, and a mapping of expressions,
+        When they are projected,
+        Then a dictionary with the value of every expression should be yielded for every record.
+        """
+        double = Add(AMOUNT, AMOUNT)
+        values = project({"double": double, "big": IS_BIG_IN_UK}, RECORDS, chunksize=2)
+        self.assertEqual(
+            list(values),
+            [
+                {"double": record["amount"] * 2, "big": IS_BIG_IN_UK.evaluate(Context(**record))}
+                for record in RECORDS
+            ],
+        )
+        self.assertEqual(list(project(double, RECORDS[:2])), [Decimal(100), Decimal(200)])
+
+    def test_errors(self):
+        """Records raising evaluation errors should be skipped if errors are collected."""
+        ratio = Div(Number(100), numeric_variable("amount"))
+        records = [{"amount": Decimal(50)}, {"amount": Decimal(0)}, {"amount": Decimal(25)}]
+        errors: list = []
+        rows = [[record["amount"]] for record in records]
+        self.assertEqual(list(project(ratio, rows, slots=["amount"], errors=errors)), [2, 4])
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0][0], 1)
+        self.assertIsInstance(errors[0][1], ExpressionEvaluationError)
@@ -0,0 +1,40 @@
+"""Variables typed as the expressions they are sub-expressions of, for type checkers."""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, cast
+
+from expressions import Variable
+from expressions.context import NoDefault
+from expressions.expr.expr_types import (
+    BooleanExpression,
+    DatetimeExpression,
+    NumericExpression,
+    StringExpression,
+    TimedeltaExpression,
+)
+
+
+def numeric_variable(name: str, default: Any = NoDefault) -> NumericExpression:
+    """Return variable with a decimal value."""
+    return cast(NumericExpression, Variable(name, Decimal, default))
+
+
+def boolean_variable(name: str, default: Any = NoDefault) -> BooleanExpression:
+    """Return variable with a boolean value."""
+    return cast(BooleanExpression, Variable(name, bool, default))
+
+
+def string_variable(name: str, default: Any = NoDefault) -> StringExpression:
+    """Return variable with a string value."""
+    return cast(StringExpression, Variable(name, str, default))
+
+
+def datetime_variable(name: str, default: Any = NoDefault) -> DatetimeExpression:
+    """Return variable with a datetime value."""
+    return cast(DatetimeExpression, Variable(name, datetime, default))
+
+
+def timedelta_variable(name: str, default: Any = NoDefault) -> TimedeltaExpression:
+    """Return variable with a timedelta value."""
+    return cast(TimedeltaExpression, Variable(name, timedelta, default))